@@ -5,18 +5,261 @@ AXON IPC 드라이버 클래스 (C 코드와 동일한 패킷 구조)
 """
 
 import os
+import math
 import time
 import select
-import ctypes
-import ctypes.util
+import itertools
+import threading
+from collections import deque
 from typing import Optional
-from packet_utils import make_packet, parse_multiple_packets
+from packet_utils import make_packet, parse_multiple_packets, IpcRxRing
+from timing import CLOCK_NAME, LatencyHistogram, now_ns, elapsed_ns, calibration
+from capture import CAPTURE_TX, CAPTURE_RX, CAPTURE_FLAG_CHUNK, capture_device_id
+from ipc_ioctl import (AxonIpcCtrlParam, AxonIpcPingInfo, IPC_MODE_0_MBOX, ipc_set_mode, ipc_set_param,
+                       ipc_get_param, ipc_flush, ipc_is_ready, ipc_ping_test)
+
+# writev 한 번에 넘길 수 있는 최대 버퍼 수
+try:
+    IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (ValueError, OSError):
+    IOV_MAX = 1024
+
+# IpcTxQueue 가 가득 찼을 때의 정책
+TX_POLICY_BLOCK = 'block'              # 자리가 날 때까지 (timeout 까지) 대기, 그래도 없으면 새 프레임 드롭
+TX_POLICY_DROP_OLDEST = 'drop_oldest'  # 지금 쓸 수 있는 만큼 보내고도 가득 차 있으면 가장 오래된 프레임을 버림 (대기 없음)
+
+
+class IpcTxQueue:
+    """
+    AxonIPCDriver 송신 큐 (깊이 제한 + EAGAIN 백프레셔)
+
+    non-blocking fd 에 바로 write 하면 메일박스가 가득 찼을 때(EAGAIN) 프레임이 그대로 사라진다.
+    이 큐는 프레임을 먼저 넣고 쓸 수 있는 만큼 writev 로 내보내며, EAGAIN 이면 POLLOUT 을
+    기다려 다시 시도한다. 버린 프레임은 원인별로 세어 호스트 쪽 손실과 라우터 쪽 손실을 구분할 수 있다.
+    """
+
+    def __init__(self, driver: 'AxonIPCDriver', depth: int = 256, policy: str = TX_POLICY_BLOCK,
+                 timeout: float = 0.1):
+        """
+        초기화
+
+        Args:
+            driver: 열려 있는 AxonIPCDriver
+            depth: 큐에 보관하는 최대 프레임 수
+            policy: 큐가 가득 찼을 때 정책 (TX_POLICY_BLOCK / TX_POLICY_DROP_OLDEST)
+            timeout: TX_POLICY_BLOCK 에서 자리가 나기를 기다리는 최대 시간 (초)
+        """
+        if policy not in (TX_POLICY_BLOCK, TX_POLICY_DROP_OLDEST):
+            raise ValueError(f"알 수 없는 송신 큐 정책: {policy}")
+        self.driver = driver
+        self.depth = depth
+        self.policy = policy
+        self.timeout = timeout
+        self._queue = deque()    # [남은 데이터, 큐에 넣은 시각(ns), 일부만 써졌으면 원래 프레임 (아니면 None)]
+        self._poller = None
+        self._poller_fd = None
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """카운터 초기화"""
+        self.enqueued = 0
+        self.sent = 0
+        self.write_syscalls = 0
+        self.retries = 0
+        self.partial_writes = 0
+        self.dropped_oldest = 0
+        self.dropped_newest = 0
+        self.dropped_timeout = 0
+        self.dropped_error = 0
+        self.high_watermark = len(self._queue)
+        self.queue_delay_total_ns = 0
+        self.queue_delay_max_ns = 0
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def put(self, data: bytes, timeout: Optional[float] = None) -> bool:
+        """
+        프레임 하나를 큐에 넣고 쓸 수 있는 만큼 송신
+
+        Args:
+            data: 송신할 프레임
+            timeout: 큐가 가득 찼을 때 대기 시간 (초, None 이면 생성 시 timeout)
+
+        Returns:
+            bool: 큐에 들어갔으면 True (가득 차서 버렸으면 False)
+        """
+        return self.put_many((data,), timeout) == 1
+
+    def put_many(self, frames, timeout: Optional[float] = None) -> int:
+        """
+        같은 tick 에 보낼 프레임들을 큐에 넣고 쓸 수 있는 만큼 송신 (writev)
+
+        TX_POLICY_BLOCK 의 대기 시간은 호출 전체에서 timeout 하나를 나누어 쓴다.
+        한 프레임이 timeout 으로 버려지면 나머지 프레임도 기다리지 않고 dropped_timeout 으로 버린다.
+        TX_POLICY_DROP_OLDEST 는 큐가 가득 차면 대기 없이 쓸 수 있는 만큼 먼저 내보내고, 그래도 가득 차 있을 때만
+        프레임을 버린다 (큐에 일부만 나간 프레임 하나뿐이면 새 프레임을 dropped_newest 로 버림).
+
+        Args:
+            frames: 송신할 프레임 목록
+            timeout: 큐가 가득 찼을 때 대기 시간 (초, 호출 전체 기준, None 이면 생성 시 timeout)
+
+        Returns:
+            int: 큐에 들어간 프레임 수
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        accepted = 0
+        timed_out = False
+        with self.driver._tx_lock:
+            deadline = time.monotonic() + timeout
+            for data in frames:
+                if timed_out:
+                    self.dropped_timeout += 1
+                    continue
+                if len(self._queue) >= self.depth and self.policy == TX_POLICY_DROP_OLDEST:
+                    # 메일박스에 자리가 있으면 버리기 전에 먼저 내보냄 (EAGAIN 이면 바로 리턴)
+                    self._flush_locked(0.0, until_len=self.depth - 1)
+                if len(self._queue) >= self.depth:
+                    if self.policy == TX_POLICY_DROP_OLDEST and self._queue[0][2] is None:
+                        self._queue.popleft()
+                        self.dropped_oldest += 1
+                    elif self.policy == TX_POLICY_DROP_OLDEST and len(self._queue) > 1:
+                        # 맨 앞 프레임은 이미 일부가 나갔으므로 (패킷 경계 유지) 그 다음 프레임을 버림
+                        del self._queue[1]
+                        self.dropped_oldest += 1
+                    elif self.policy == TX_POLICY_DROP_OLDEST:
+                        # 일부만 나간 프레임 하나뿐: 기다리지 않고 새 프레임을 버림
+                        self.dropped_newest += 1
+                        continue
+                    elif not self._flush_locked(max(0.0, deadline - time.monotonic()), until_len=self.depth - 1):
+                        self.dropped_timeout += 1
+                        timed_out = True
+                        continue
+
+                self._queue.append([data, time.monotonic_ns(), None])
+                self.enqueued += 1
+                accepted += 1
+                if len(self._queue) > self.high_watermark:
+                    self.high_watermark = len(self._queue)
+
+            self._flush_locked(0.0)
+        return accepted
+
+    def flush(self, timeout: float = 0.0) -> bool:
+        """
+        큐에 남은 프레임 송신
+
+        Args:
+            timeout: EAGAIN 일 때 기다리는 최대 시간 (초, 0 이면 지금 쓸 수 있는 만큼만)
+
+        Returns:
+            bool: 큐를 모두 비웠으면 True
+        """
+        with self.driver._tx_lock:
+            return self._flush_locked(timeout)
+
+    def _wait_writable(self, timeout: float) -> bool:
+        fd = self.driver.fd
+        if self._poller is None or self._poller_fd != fd:
+            self._poller = select.poll()
+            self._poller.register(fd, select.POLLOUT)
+            self._poller_fd = fd
+        return bool(self._poller.poll(max(0, math.ceil(timeout * 1000))))
+
+    def _flush_locked(self, timeout: float, until_len: int = 0) -> bool:
+        """
+        큐 길이가 until_len 이하가 될 때까지 송신 (driver._tx_lock 을 잡은 상태에서 호출)
+
+        Returns:
+            bool: until_len 이하가 되었으면 True (timeout 이 지났으면 False)
+        """
+        queue = self._queue
+        deadline = None
+        while len(queue) > until_len:
+            fd = self.driver.fd
+            if not self.driver.is_open or fd is None:
+                print("디바이스가 열려있지 않습니다")
+                return False
+
+            chunk = [entry[0] for entry in itertools.islice(queue, IOV_MAX)]
+            driver = self.driver
+            start = now_ns()
+            try:
+                written = os.writev(fd, chunk)
+            except BlockingIOError:
+                self.retries += 1
+                driver.tx_eagain += 1
+                if deadline is None:
+                    deadline = time.monotonic() + timeout
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self._wait_writable(remaining):
+                    return False
+                continue
+            except OSError as e:
+                print(f"데이터 쓰기 실패: {e} (송신 큐 {len(queue)}개 프레임 버림)")
+                driver.tx_errors += 1
+                self.dropped_error += len(queue)
+                queue.clear()
+                return True
+            driver.write_latency.record(elapsed_ns(start))
+            driver.tx_syscalls += 1
+            driver.tx_bytes += written
+            self.write_syscalls += 1
+
+            # 쓴 바이트 수만큼 앞 프레임부터 완료 처리
+            done_ns = time.monotonic_ns()
+            capture = driver.capture
+            capture_ns = now_ns() if capture is not None else 0
+            while written and queue:
+                entry = queue[0]
+                size = len(entry[0])
+                if written < size:
+                    if entry[2] is None:
+                        entry[2] = entry[0]
+                    entry[0] = memoryview(entry[0])[written:]
+                    self.partial_writes += 1
+                    break
+                written -= size
+                queue.popleft()
+                self.sent += 1
+                driver.tx_frames += 1
+                if capture is not None:
+                    capture.record(CAPTURE_TX, driver.capture_device_id,
+                                   entry[0] if entry[2] is None else entry[2], capture_ns)
+                delay_ns = done_ns - entry[1]
+                self.queue_delay_total_ns += delay_ns
+                if delay_ns > self.queue_delay_max_ns:
+                    self.queue_delay_max_ns = delay_ns
+        return True
+
+    def stats(self) -> dict:
+        """송신 큐 카운터 (dropped_* 가 0 이 아니면 호스트 쪽에서 버린 프레임)"""
+        return {
+            'depth': self.depth,
+            'policy': self.policy,
+            'queued': len(self._queue),
+            'high_watermark': self.high_watermark,
+            'enqueued': self.enqueued,
+            'sent': self.sent,
+            'write_syscalls': self.write_syscalls,
+            'retries': self.retries,
+            'partial_writes': self.partial_writes,
+            'dropped_oldest': self.dropped_oldest,
+            'dropped_newest': self.dropped_newest,
+            'dropped_timeout': self.dropped_timeout,
+            'dropped_error': self.dropped_error,
+            'queue_delay_avg_us': self.queue_delay_total_ns / self.sent / 1000 if self.sent else 0.0,
+            'queue_delay_max_us': self.queue_delay_max_ns / 1000,
+        }
 
 
 class AxonIPCDriver:
     """AXON IPC 드라이버 클래스"""
     
-    def __init__(self, device_path: str, can_id: int = 0x185, is_extended: bool = False):
+    def __init__(self, device_path: str, can_id: int = 0x185, is_extended: bool = False,
+                 full_duplex: bool = True):
         """
         초기화
         
@@ -24,12 +267,52 @@ class AxonIPCDriver:
             device_path: IPC 디바이스 경로
             can_id: CAN ID (기본값: 0x185)
             is_extended: Extended ID 여부 (기본값: False = Standard ID)
+            full_duplex: True 면 송신/수신 경로가 각자의 락을 사용하여 송신 스레드 1개와 수신 스레드 1개가
+                         서로 막지 않고 동시에 동작 (False 면 하나의 락으로 송수신을 직렬화)
         """
         self.device_path = device_path
         self.fd = None
         self.is_open = False
         self.can_id = can_id
         self.is_extended = is_extended
+        self.full_duplex = full_duplex
+        self._poller = None
+        self.rx_ring = None
+        self.tx_queue = None
+        self.capture = None
+        self.capture_device_id = capture_device_id(device_path)
+        
+        # 송신(write_*) / 수신(read_data, recv*) 경로 락
+        self._tx_lock = threading.Lock()
+        self._rx_lock = threading.Lock() if full_duplex else self._tx_lock
+        
+        # write_many 카운터
+        self.write_syscalls = 0
+        self.frames_written = 0
+        self.syscalls_saved = 0
+        self.partial_writes = 0
+        self.write_data_eagain = 0
+        
+        # 드라이버 카운터 (stats() 로 조회, 모든 송수신 경로에서 항상 갱신)
+        self.write_latency = LatencyHistogram()
+        self.read_latency = LatencyHistogram()
+        self.reopens = 0
+        self._reset_counters()
+        
+    def _reset_counters(self) -> None:
+        self.tx_bytes = 0
+        self.tx_frames = 0
+        self.tx_syscalls = 0
+        self.tx_eagain = 0
+        self.tx_errors = 0
+        self.rx_bytes = 0
+        self.rx_frames = 0
+        self.rx_syscalls = 0
+        self.rx_eagain = 0
+        self.rx_empty_polls = 0
+        self.rx_errors = 0
+        self.write_latency.reset()
+        self.read_latency.reset()
         
     def check_device_exists(self) -> bool:
         """디바이스 파일이 존재하는지 확인"""
@@ -54,6 +337,9 @@ class AxonIPCDriver:
             self.fd = os.open(self.device_path, os.O_RDWR | os.O_NONBLOCK)
             print(f"파일 디스크립터 획득 (non-blocking): {self.fd}")
             
+            # 송수신 경로의 elapsed_ns 가 첫 호출에서 시계 보정을 하지 않도록 미리 측정
+            calibration()
+            
             self.is_open = True
             print(f"IPC 디바이스 열기 성공 (non-blocking): {self.device_path}, fd: {self.fd}")
             return True
@@ -74,6 +360,7 @@ class AxonIPCDriver:
             if self.fd is not None:
                 os.close(self.fd)
                 self.fd = None
+                self._poller = None
                 self.is_open = False
                 print(f"IPC 디바이스 닫기 성공: {self.device_path}")
                 return True
@@ -98,6 +385,7 @@ class AxonIPCDriver:
             bool: 성공 여부
         """
         print("디바이스 재연결을 시도합니다...")
+        self.reopens += 1
         self.close_device()
         time.sleep(1.0) # 재시도 간 대기 시간 추가
         return self.open_device()
@@ -117,13 +405,275 @@ class AxonIPCDriver:
                 print("디바이스가 열려있지 않습니다")
                 return -1
             
-            bytes_written = os.write(self.fd, data)
-            return bytes_written
+            with self._tx_lock:
+                return self._write_locked(data)
             
+        except BlockingIOError:
+            # 메일박스가 가득 참: 프레임을 잃지 않으려면 send() (송신 큐) 사용 (tx_eagain 은 _write_locked 에서 집계)
+            self.write_data_eagain += 1
+            print("데이터 쓰기 실패: 송신 버퍼 가득 참 (EAGAIN)")
+            return -1
         except Exception as e:
             print(f"데이터 쓰기 실패: {e}")
             return -1
     
+    def write_many(self, frames, coalesce: bool = True, timeout: float = 0.1) -> list:
+        """
+        같은 시점에 보낼 여러 프레임을 한 번에 쓰기
+        
+        coalesce=True 이면 os.writev 로 최대 IOV_MAX 개 프레임을 시스템 콜 1회에 쓴다.
+        디바이스가 write 1회 = 패킷 1개 경계를 요구하면 coalesce=False 로 프레임마다 os.write 한다
+        (이 경우 시스템 콜 수는 같고 호출자의 락/호출 오버헤드만 줄어든다).
+        프레임 중간에서 끊기면 스트림에 잘린 패킷이 남지 않도록 POLLOUT 을 기다리며 (timeout 까지)
+        그 프레임의 나머지를 마저 쓰고 계속한다. 프레임 경계에서 EAGAIN 이면 그 뒤 프레임은 쓰지 않고
+        결과에 0 으로 표시한다.
+        
+        Args:
+            frames: 쓸 프레임 목록 (bytes-like)
+            coalesce: writev 로 묶어서 쓸지 여부
+            timeout: 일부만 써진 프레임의 나머지를 쓰기 위해 기다리는 최대 시간 (초)
+            
+        Returns:
+            list: 프레임별 쓴 바이트 수 (프레임 길이보다 작으면 일부만/못 씀, -1 은 오류)
+        """
+        results = [0] * len(frames)
+        if not self.is_open or self.fd is None:
+            print("디바이스가 열려있지 않습니다")
+            return [-1] * len(frames)
+        
+        with self._tx_lock:
+            return self._write_many_locked(frames, coalesce, timeout, results)
+    
+    def _write_many_locked(self, frames, coalesce: bool, timeout: float, results: list) -> list:
+        """write_many 본체 (_tx_lock 을 잡은 상태에서 호출)"""
+        index = 0
+        try:
+            while index < len(frames):
+                start = now_ns()
+                if coalesce:
+                    chunk = frames[index:index + IOV_MAX]
+                    written = os.writev(self.fd, chunk)
+                else:
+                    chunk = frames[index:index + 1]
+                    written = os.write(self.fd, chunk[0])
+                self.write_latency.record(elapsed_ns(start))
+                self.write_syscalls += 1
+                self.tx_syscalls += 1
+                self.tx_bytes += written
+                if not written:
+                    return results
+                
+                # 쓴 바이트 수를 앞 프레임부터 나누어 기록 (프레임 경계에서 멈췄으면 다음 시스템 콜에서 이어서 씀)
+                first = index
+                complete = True
+                capture = self.capture
+                capture_ns = now_ns() if capture is not None else 0
+                for frame in chunk:
+                    if not written and len(frame):
+                        break
+                    frame_written = min(len(frame), written)
+                    written -= frame_written
+                    if 0 < frame_written < len(frame):
+                        # 패킷 경계 유지: 일부만 써진 프레임의 나머지를 마저 씀
+                        self.partial_writes += 1
+                        frame_written += self._write_rest_locked(memoryview(frame)[frame_written:], timeout)
+                        if frame_written < len(frame):
+                            print(f"데이터 쓰기 실패: 프레임 {index} 의 나머지 {len(frame) - frame_written}바이트를 "
+                                  f"{timeout}초 안에 쓰지 못함 (패킷 경계 깨짐)")
+                    results[index] = frame_written
+                    if capture is not None and frame_written:
+                        capture.record(CAPTURE_TX, self.capture_device_id,
+                                       frame if frame_written == len(frame) else memoryview(frame)[:frame_written],
+                                       capture_ns)
+                    if frame_written < len(frame):
+                        complete = False
+                        index += 1
+                        break
+                    index += 1
+                    self.frames_written += 1
+                    self.tx_frames += 1
+                
+                # 이번 시스템 콜이 건드린 프레임 수 - 1 만큼 절약
+                self.syscalls_saved += max(0, index - first - 1)
+                if not complete:
+                    return results
+        except BlockingIOError:
+            # 디바이스 버퍼가 가득 참: 남은 프레임은 0 바이트
+            self.tx_eagain += 1
+        except Exception as e:
+            self.tx_errors += 1
+            print(f"데이터 쓰기 실패: {e}")
+            for rest in range(index, len(frames)):
+                results[rest] = -1
+        
+        return results
+    
+    def _write_rest_locked(self, rest: memoryview, timeout: float) -> int:
+        """
+        일부만 써진 프레임의 나머지를 POLLOUT 을 기다리며 쓰기 (_tx_lock 을 잡은 상태에서 호출)
+        
+        Returns:
+            int: 쓴 바이트 수 (len(rest) 보다 작으면 timeout 안에 다 쓰지 못함)
+        """
+        total = 0
+        deadline = time.monotonic() + timeout
+        poller = None
+        while total < len(rest):
+            start = now_ns()
+            try:
+                written = os.write(self.fd, rest[total:])
+            except BlockingIOError:
+                self.tx_eagain += 1
+                if poller is None:
+                    poller = select.poll()
+                    poller.register(self.fd, select.POLLOUT)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not poller.poll(max(0, math.ceil(remaining * 1000))):
+                    break
+                continue
+            self.write_latency.record(elapsed_ns(start))
+            self.write_syscalls += 1
+            self.tx_syscalls += 1
+            self.tx_bytes += written
+            total += written
+        return total
+    
+    def write_stats(self) -> dict:
+        """write_many 카운터"""
+        return {
+            'write_syscalls': self.write_syscalls,
+            'frames_written': self.frames_written,
+            'syscalls_saved': self.syscalls_saved,
+            'partial_writes': self.partial_writes,
+        }
+    
+    def configure_tx_queue(self, depth: int = 256, policy: str = TX_POLICY_BLOCK,
+                           timeout: float = 0.1) -> IpcTxQueue:
+        """
+        송신 큐 설정 (이미 있으면 남은 프레임을 보낸 뒤 교체)
+        
+        Args:
+            depth: 큐에 보관하는 최대 프레임 수
+            policy: 큐가 가득 찼을 때 정책 (TX_POLICY_BLOCK / TX_POLICY_DROP_OLDEST)
+            timeout: TX_POLICY_BLOCK 에서 자리가 나기를 기다리는 최대 시간 (초)
+            
+        Returns:
+            IpcTxQueue: 새 송신 큐
+        """
+        if self.tx_queue is not None and self.is_open:
+            self.tx_queue.flush(timeout)
+        self.tx_queue = IpcTxQueue(self, depth, policy, timeout)
+        return self.tx_queue
+    
+    def send(self, data: bytes, timeout: Optional[float] = None) -> bool:
+        """
+        송신 큐를 통해 프레임 송신 (EAGAIN 이면 POLLOUT 대기 후 재시도)
+        
+        Args:
+            data: 송신할 프레임
+            timeout: 큐가 가득 찼을 때 대기 시간 (초, None 이면 큐 설정값)
+            
+        Returns:
+            bool: 큐에 들어갔으면 True (정책에 따라 버려졌으면 False)
+        """
+        if self.tx_queue is None:
+            self.configure_tx_queue()
+        return self.tx_queue.put(data, timeout)
+    
+    def send_many(self, frames, timeout: Optional[float] = None) -> int:
+        """
+        같은 tick 에 보낼 프레임들을 송신 큐를 통해 송신 (writev 로 묶어서 씀)
+        
+        Args:
+            frames: 송신할 프레임 목록
+            timeout: 큐가 가득 찼을 때 대기 시간 (초, None 이면 큐 설정값)
+            
+        Returns:
+            int: 큐에 들어간 프레임 수
+        """
+        if self.tx_queue is None:
+            self.configure_tx_queue()
+        return self.tx_queue.put_many(frames, timeout)
+    
+    def flush_tx(self, timeout: float = 1.0) -> bool:
+        """
+        송신 큐에 남은 프레임을 모두 보낼 때까지 대기
+        
+        Args:
+            timeout: 최대 대기 시간 (초)
+            
+        Returns:
+            bool: 모두 보냈으면 True
+        """
+        if self.tx_queue is None:
+            return True
+        return self.tx_queue.flush(timeout)
+    
+    def tx_stats(self) -> dict:
+        """송신 큐 카운터 (송신 큐를 쓰지 않았으면 write_data 의 EAGAIN 횟수만)"""
+        stats = self.tx_queue.stats() if self.tx_queue is not None else {}
+        stats['write_data_eagain'] = self.write_data_eagain
+        return stats
+    
+    def stats(self) -> dict:
+        """
+        드라이버 카운터 스냅샷 (대시보드/테스트 리포트용)
+        
+        tx_*/rx_* 는 write_data/write_many/송신 큐/write_nonblocking, read_data/recv/recv_packets/read_nonblocking
+        (IPCReactor, ipc_async 스트림 포함) 모든 경로의 합계이고
+        write_latency/read_latency 는 시스템 콜 소요 시간 로그 버킷 히스토그램이다
+        (recv_packets 는 EAGAIN 까지 읽는 drain 한 번을 한 샘플로 기록).
+        rx_frames 는 recv_packets 가 검증한 패킷 수 (read_data/recv 는 패킷을 나누지 않으므로 바이트만 집계),
+        rx_empty_polls 는 wait_readable 이 데이터 없이 타임아웃된 횟수.
+        
+        Returns:
+            dict: 카운터 (송신 큐/수신 링을 쓰고 있으면 'tx_queue'/'rx_ring' 에 각자의 카운터 포함)
+        """
+        stats = {
+            'device_path': self.device_path,
+            'is_open': self.is_open,
+            'full_duplex': self.full_duplex,
+            'reopens': self.reopens,
+            'tx_bytes': self.tx_bytes,
+            'tx_frames': self.tx_frames,
+            'tx_syscalls': self.tx_syscalls,
+            'tx_eagain': self.tx_eagain,
+            'tx_errors': self.tx_errors,
+            'rx_bytes': self.rx_bytes,
+            'rx_frames': self.rx_frames,
+            'rx_syscalls': self.rx_syscalls,
+            'rx_eagain': self.rx_eagain,
+            'rx_empty_polls': self.rx_empty_polls,
+            'rx_errors': self.rx_errors,
+            'write_latency': self.write_latency.to_dict(),
+            'read_latency': self.read_latency.to_dict(),
+        }
+        if self.tx_queue is not None:
+            stats['tx_queue'] = self.tx_queue.stats()
+        if self.rx_ring is not None:
+            stats['rx_ring'] = self.rx_ring.stats()
+        return stats
+    
+    def reset_stats(self) -> None:
+        """stats() 카운터와 히스토그램 초기화 (reopens, write_stats, 송신 큐/수신 링 카운터는 유지)"""
+        self._reset_counters()
+    
+    def attach_capture(self, capture, device_id: Optional[int] = None) -> None:
+        """
+        송수신 데이터를 캡처 파일에 기록 (capture.CaptureWriter)
+        
+        송신은 write_data/write_many/송신 큐가 실제로 쓴 프레임마다, 수신은 recv_packets 가 분리한 패킷마다
+        레코드 하나를 남긴다. read_data/recv 는 패킷 경계를 모르므로 read 한 번에 받은 바이트를
+        CAPTURE_FLAG_CHUNK 레코드로 남긴다.
+        
+        Args:
+            capture: CaptureWriter (None 이면 기록 중지)
+            device_id: 레코드의 디바이스 ID (None 이면 device_path 로 정함)
+        """
+        if device_id is not None:
+            self.capture_device_id = device_id
+        self.capture = capture
+    
     def read_data(self, buffer_size: int = 512) -> Optional[bytes]:
         """
         IPC를 통해 데이터 읽기 (기본)
@@ -139,7 +689,8 @@ class AxonIPCDriver:
                 print("디바이스가 열려있지 않습니다")
                 return None
             
-            data = os.read(self.fd, buffer_size)
+            with self._rx_lock:
+                data = self._read_locked(buffer_size)
             if data:
                 print(f"데이터 읽기 성공: {len(data)} 바이트")
                 return data
@@ -154,6 +705,230 @@ class AxonIPCDriver:
             print(f"데이터 읽기 실패: {e}")
             return None
     
+    def _read_locked(self, buffer_size: int) -> bytes:
+        """os.read 1회 + 수신 카운터 갱신 (_rx_lock 을 잡은 상태에서 호출, 예외는 그대로 전달)"""
+        start = now_ns()
+        try:
+            data = os.read(self.fd, buffer_size)
+        except BlockingIOError:
+            self.rx_eagain += 1
+            raise
+        except OSError:
+            self.rx_errors += 1
+            raise
+        self.read_latency.record(elapsed_ns(start))
+        self.rx_syscalls += 1
+        self.rx_bytes += len(data)
+        capture = self.capture
+        if capture is not None and data:
+            capture.record(CAPTURE_RX, self.capture_device_id, data, flags=CAPTURE_FLAG_CHUNK)
+        return data
+    
+    def _write_locked(self, data) -> int:
+        """os.write 1회 + 송신 카운터/캡처 갱신 (_tx_lock 을 잡은 상태에서 호출, 예외는 그대로 전달)"""
+        start = now_ns()
+        try:
+            written = os.write(self.fd, data)
+        except BlockingIOError:
+            self.tx_eagain += 1
+            raise
+        except OSError:
+            self.tx_errors += 1
+            raise
+        self.write_latency.record(elapsed_ns(start))
+        self.tx_syscalls += 1
+        self.tx_bytes += written
+        if written == len(data):
+            self.tx_frames += 1
+        capture = self.capture
+        if capture is not None and written > 0:
+            capture.record(CAPTURE_TX, self.capture_device_id,
+                           data if written == len(data) else memoryview(data)[:written])
+        return written
+    
+    def read_nonblocking(self, buffer_size: int = 512) -> bytes:
+        """
+        read 1회 (이벤트 루프용, 대기/출력 없이 수신 카운터와 캡처만 갱신)
+        
+        Args:
+            buffer_size: 읽을 버퍼 크기
+            
+        Returns:
+            bytes: 읽은 데이터 (b'' 이면 EOF)
+            
+        Raises:
+            BlockingIOError: 읽을 데이터가 없음
+            OSError: 읽기 실패
+        """
+        with self._rx_lock:
+            return self._read_locked(buffer_size)
+    
+    def write_nonblocking(self, data) -> int:
+        """
+        write 1회 (이벤트 루프용, 대기/출력 없이 송신 카운터와 캡처만 갱신)
+        
+        일부만 써진 경우 나머지는 호출자가 다음 호출로 이어서 쓴다 (tx_frames 는 프레임 끝까지 쓴 호출에서 집계).
+        
+        Args:
+            data: 쓸 데이터 (bytes-like)
+            
+        Returns:
+            int: 쓴 바이트 수
+            
+        Raises:
+            BlockingIOError: 송신 버퍼가 가득 참
+            OSError: 쓰기 실패
+        """
+        with self._tx_lock:
+            return self._write_locked(data)
+    
+    def wait_readable(self, timeout: Optional[float] = None) -> bool:
+        """
+        읽을 데이터가 생길 때까지 커널에서 대기 (select.poll)
+
+        sleep 루프와 달리 데이터가 들어오는 즉시 깨어나고 대기 중 CPU 를 쓰지 않는다.
+        
+        Args:
+            timeout: 최대 대기 시간 (초, None 이면 무한 대기, 0 이면 즉시 확인)
+            
+        Returns:
+            bool: 읽을 수 있으면 True (타임아웃이면 False)
+        """
+        if not self.is_open or self.fd is None:
+            print("디바이스가 열려있지 않습니다")
+            return False
+        
+        if self._poller is None:
+            self._poller = select.poll()
+            self._poller.register(self.fd, select.POLLIN | select.POLLPRI)
+        
+        # poll 은 ms 단위: 1ms 미만 대기가 0(즉시 리턴)으로 잘려 busy loop 가 되지 않도록 올림
+        timeout_ms = None if timeout is None else max(0, math.ceil(timeout * 1000))
+        if self._poller.poll(timeout_ms):
+            return True
+        self.rx_empty_polls += 1
+        return False
+    
+    def recv(self, timeout: Optional[float] = None, buffer_size: int = 512) -> Optional[bytes]:
+        """
+        데이터가 들어올 때까지 대기 후 읽기 (수신 루프용, 출력 없음)
+        
+        Args:
+            timeout: 최대 대기 시간 (초, None 이면 무한 대기)
+            buffer_size: 읽을 버퍼 크기
+            
+        Returns:
+            Optional[bytes]: 읽은 데이터 또는 None (타임아웃/오류)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not self.wait_readable(remaining):
+                return None
+            
+            try:
+                with self._rx_lock:
+                    data = self._read_locked(buffer_size)
+                return data or None
+            except BlockingIOError:
+                # poll 이후 다른 스레드가 먼저 읽은 경우: 남은 시간 동안 다시 대기
+                if remaining == 0.0:
+                    return None
+            except Exception as e:
+                print(f"데이터 읽기 실패: {e}")
+                return None
+    
+    def recv_packets(self, timeout: Optional[float] = None) -> list:
+        """
+        수신 링(IpcRxRing)으로 읽을 수 있는 만큼 읽고 완성된 패킷 리턴 (할당/출력 최소화 수신 경로)
+        
+        read_data 와 달리 read 마다 bytes 를 만들지 않고 미리 할당한 버퍼에 직접 읽으며,
+        EAGAIN 이 날 때까지 한 번에 비운다.
+        
+        Args:
+            timeout: 데이터가 없을 때 최대 대기 시간 (초, None 이면 무한 대기, 0 이면 대기 없음)
+            
+        Returns:
+            list: 패킷 memoryview 리스트 (다음 recv_packets 호출 전까지 유효, 타임아웃이면 빈 리스트)
+        """
+        if self.rx_ring is None:
+            self.rx_ring = IpcRxRing()
+        
+        if not self.wait_readable(timeout):
+            return []
+        
+        ring = self.rx_ring
+        try:
+            with self._rx_lock:
+                reads_before = ring.reads
+                bytes_before = ring.rx_bytes
+                start = now_ns()
+                packets = ring.drain(self.fd)
+                self.read_latency.record(elapsed_ns(start))
+                self.rx_syscalls += ring.reads - reads_before
+                self.rx_bytes += ring.rx_bytes - bytes_before
+                self.rx_frames += len(packets)
+                capture = self.capture
+                if capture is not None and packets:
+                    capture_ns = now_ns()
+                    for packet in packets:
+                        capture.record(CAPTURE_RX, self.capture_device_id, packet, capture_ns)
+                return packets
+        except Exception as e:
+            self.rx_errors += 1
+            print(f"데이터 읽기 실패: {e}")
+            return []
+    
+    def _check_open(self) -> bool:
+        if not self.is_open or self.fd is None:
+            print("디바이스가 열려있지 않습니다")
+            return False
+        return True
+    
+    def set_mode(self, mode: int = IPC_MODE_0_MBOX) -> bool:
+        """IPC 모드 설정 (IOCTL_IPC_SET_MODE, C 코드의 ipc_openN 과 동일)"""
+        return self._check_open() and ipc_set_mode(self.fd, mode)
+    
+    def set_param(self, v_min: int, v_time: int) -> bool:
+        """
+        드라이버 read 블록 조건 설정 (IOCTL_IPC_SET_PARAM)
+        
+        Args:
+            v_min: read 가 리턴하기 위한 최소 바이트 수 (여러 패킷을 한 번에 읽도록 묶을 때 사용)
+            v_time: read 대기 시간 (100ms 단위)
+            
+        Returns:
+            bool: 성공 여부
+        """
+        return self._check_open() and ipc_set_param(self.fd, v_min, v_time)
+    
+    def get_param(self) -> Optional[AxonIpcCtrlParam]:
+        """현재 vMin/vTime 읽기 (IOCTL_IPC_GET_PARAM, 실패 시 None)"""
+        if not self._check_open():
+            return None
+        return ipc_get_param(self.fd)
+    
+    def flush(self) -> bool:
+        """메일박스에 남은 데이터 비우기 (IOCTL_IPC_FLUSH, 측정 시작 전 이전 데이터 제거용)"""
+        if not self._check_open():
+            return False
+        if self.rx_ring is not None:
+            self.rx_ring.reset()
+        return ipc_flush(self.fd)
+    
+    def is_ready(self) -> bool:
+        """상대 코어 IPC 준비 여부 (IOCTL_IPC_ISREADY)"""
+        if not self._check_open():
+            return False
+        return bool(ipc_is_ready(self.fd))
+    
+    def ping_test(self) -> Optional[AxonIpcPingInfo]:
+        """커널 메일박스 ping 테스트 (IOCTL_IPC_PING_TEST, 실패 시 None)"""
+        if not self._check_open():
+            return None
+        return ipc_ping_test(self.fd)
+    
     def make_packet(self, seq_num: int, cmd1: int, cmd2: int, data_length: int) -> bytes:
         """C 코드와 동일한 패킷 생성"""
         return make_packet(seq_num, cmd1, cmd2, data_length)
@@ -176,7 +951,7 @@ class AxonIPCDriver:
     def read_data_linux_high_resolution(self, timeout_seconds: float = 5.0, buffer_size: int = 1024,
                                        measurement_rounds: int = 5) -> tuple[Optional[bytes], dict]:
         """
-        리눅스 네이티브 CLOCK_MONOTONIC_RAW를 사용한 고해상도 시간 측정
+        리눅스 네이티브 CLOCK_MONOTONIC_RAW를 사용한 고해상도 시간 측정 (timing 모듈)
         
         Args:
             timeout_seconds: 타임아웃 시간 (초)
@@ -186,22 +961,7 @@ class AxonIPCDriver:
         Returns:
             tuple: (데이터, 측정 통계)
         """
-        # 리눅스 시스템 콜을 위한 라이브러리 로드
-        libc = ctypes.CDLL(ctypes.util.find_library('c'))
-        
-        # CLOCK_MONOTONIC_RAW 정의
-        CLOCK_MONOTONIC_RAW = 4
-        
-        # timespec 구조체 정의
-        class timespec(ctypes.Structure):
-            _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
-        
-        # clock_gettime 함수 정의
-        clock_gettime = libc.clock_gettime
-        clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
-        clock_gettime.restype = ctypes.c_int
-        
-        print(f"\n=== 리눅스 고해상도 타이밍 측정 (CLOCK_MONOTONIC_RAW) ===")
+        print(f"\n=== 리눅스 고해상도 타이밍 측정 ({CLOCK_NAME}) ===")
         print(f"타임아웃: {timeout_seconds}초, 버퍼 크기: {buffer_size}, 측정 라운드: {measurement_rounds}")
         
         try:
@@ -216,59 +976,52 @@ class AxonIPCDriver:
                 print(f"\n--- 측정 라운드 {round_num + 1}/{measurement_rounds} ---")
                 
                 # 측정 시작 시간
-                start_ts = timespec()
-                clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(start_ts))
-                start_ns = start_ts.tv_sec * 1_000_000_000 + start_ts.tv_nsec
+                start_ns = now_ns()
                 
                 # 데이터 읽기 시도
                 data = None
-                read_start_ts = None
-                read_end_ts = None
+                read_start_ns = None
+                read_end_ns = None
                 
                 end_time = time.time() + timeout_seconds
                 
                 while time.time() < end_time:
                     try:
                         # 읽기 시작 시간
-                        read_start_ts = timespec()
-                        clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(read_start_ts))
+                        read_start_ns = now_ns()
                         
-                        # 데이터 읽기
-                        data = os.read(self.fd, buffer_size)
+                        # 데이터 읽기 (수신 카운터/캡처 포함)
+                        with self._rx_lock:
+                            data = self._read_locked(buffer_size)
                         
                         # 읽기 종료 시간
-                        read_end_ts = timespec()
-                        clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(read_end_ts))
+                        read_end_ns = now_ns()
                         
                         if data:
                             final_data = data
                             break
                             
                     except BlockingIOError:
-                        time.sleep(0.001)
+                        self.wait_readable(max(0.0, end_time - time.time()))
                         continue
                     except Exception as e:
                         print(f"읽기 오류: {e}")
                         break
                 
                 # 측정 종료 시간
-                end_ts = timespec()
-                clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(end_ts))
-                end_ns = end_ts.tv_sec * 1_000_000_000 + end_ts.tv_nsec
+                end_ns = now_ns()
                 
                 # 라운드 통계
                 round_stats = {
                     'round': round_num + 1,
-                    'total_time_ns': end_ns - start_ns,
-                    'total_time_ms': (end_ns - start_ns) / 1_000_000,
+                    'total_time_ns': elapsed_ns(start_ns, end_ns),
+                    'total_time_ms': elapsed_ns(start_ns, end_ns) / 1_000_000,
                     'success': data is not None
                 }
                 
-                if read_start_ts and read_end_ts:
-                    read_start_ns = read_start_ts.tv_sec * 1_000_000_000 + read_start_ts.tv_nsec
-                    read_end_ns = read_end_ts.tv_sec * 1_000_000_000 + read_end_ts.tv_nsec
-                    round_stats['read_time_ns'] = read_end_ns - read_start_ns
-                    round_stats['read_time_ms'] = (read_end_ns - read_start_ns) / 1_000_000
+                if read_start_ns is not None and read_end_ns is not None:
+                    round_stats['read_time_ns'] = elapsed_ns(read_start_ns, read_end_ns)
+                    round_stats['read_time_ms'] = round_stats['read_time_ns'] / 1_000_000
                 
                 measurements.append(round_stats)
                 print(f"라운드 {round_num + 1} 완료: {round_stats['total_time_ms']:.3f}ms")
@@ -0,0 +1,1362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+성능 측정(마이크로 벤치마크) 함수들
+"""
+
+import os
+import json
+import time
+import asyncio
+import argparse
+import struct
+import tempfile
+import threading
+import contextlib
+import sys
+import ctypes
+import ctypes.util
+import tracemalloc
+
+try:
+    import numpy as np
+except ImportError:  # bench_batch_encoding 에서만 필요
+    np = None
+from crc_utils import calc_crc16, calc_crc16_bytewise, calc_crc16_batch
+from constants import TCC_IPC_CMD_AP_TEST
+from packet_utils import (make_lpa_packet_with_can_header, make_lpa_packet_with_can_header_into,
+                          make_lpa_packets_with_can_header_batch, lpa_template_cache, tx_buffer_pool,
+                          make_lpa_packet_into, parse_lpa_packet_with_can_header, parse_can_header,
+                          parse_can_headers, build_CANHeader_py, build_CANHeader_py_bitwise,
+                          make_lpa_packet, make_packet, make_packet_into, IpcFramer, IpcRxRing,
+                          IPC_OVERHEAD)
+from test_plan import load_csv_test_plan, compile_test_plan
+from axon_ipc_driver import AxonIPCDriver, TX_POLICY_BLOCK, TX_POLICY_DROP_OLDEST
+from ipc_async import open_ipc_connection
+from ipc_ioctl import PING_RESULT_STATUS
+from constants import AXON_IPC_DEVICE_FILES
+from timing import CLOCK_ID, CLOCK_NAME, now_ns, elapsed_ns, calibrate, calibration
+from log_utils import AsyncLogger, LOG_SUMMARY, LOG_FRAME
+from can_sender_app import _format_rx_packet
+from capture import CaptureWriter, CaptureReader, CAPTURE_TX
+from replay import IpcReplayer
+
+# 15k 행 규모의 기본 CSV 테스트 계획
+DEFAULT_PLAN_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                'csv-file', 'backup', 'CanAppDirectTest 4.csv')
+
+
+def _measure_ns(func, repeat: int) -> float:
+    """func 를 repeat 번 호출하여 1회 평균 소요 시간(ns)을 리턴"""
+    start_ns = time.perf_counter_ns()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter_ns() - start_ns) / repeat
+
+
+def bench_crc16(repeat: int = 20000) -> dict:
+    """
+    CRC16 프레임당 계산 시간 비교 (바이트 단위 참조 구현 vs calc_crc16)
+
+    송신/수신 각각 프레임마다 CRC 를 한 번씩 계산하므로
+    프레임당 이득은 아래 값의 2배가 된다.
+
+    Args:
+        repeat: 크기별 반복 횟수
+
+    Returns:
+        dict: 크기별 측정 결과 (ns/frame)
+    """
+    print("\n=== CRC16 마이크로 벤치마크 ===")
+
+    # IPC 헤더(9) + CAN 헤더(5) + payload (CRC 2바이트 제외)
+    sizes = {
+        'CAN 8B': 9 + 5 + 8,
+        'CAN FD 64B': 9 + 5 + 64,
+        'RX 15B hdr + 8B': 9 + 15 + 8,
+        'read 512B': 512,
+    }
+
+    results = {}
+    for name, size in sizes.items():
+        data = os.urandom(size)
+        if calc_crc16(data, 0) != calc_crc16_bytewise(data, 0):
+            raise AssertionError(f"CRC 불일치: {name}")
+
+        ref_ns = _measure_ns(lambda: calc_crc16_bytewise(data, 0), repeat)
+        new_ns = _measure_ns(lambda: calc_crc16(data, 0), repeat)
+        results[name] = {
+            'size': size,
+            'bytewise_ns': ref_ns,
+            'calc_crc16_ns': new_ns,
+            'speedup': ref_ns / new_ns if new_ns else 0.0,
+        }
+        print(f"{name:>16s} ({size:3d}B): 참조 {ref_ns / 1000:8.3f}us | "
+              f"calc_crc16 {new_ns / 1000:8.3f}us | x{results[name]['speedup']:.1f}")
+
+    return results
+
+
+def bench_can_header(repeat: int = 50000) -> dict:
+    """
+    CAN 헤더 생성 시간 비교 (C 매크로 비트 연산 vs 헤더 테이블 조회)
+
+    Args:
+        repeat: 케이스별 반복 횟수
+
+    Returns:
+        dict: 케이스별 측정 결과 (ns/header)
+    """
+    print("\n=== CAN 헤더 생성 벤치마크 ===")
+
+    # (timestamp, can_id, fdf, brs)
+    cases = {
+        'Standard classic': (0, 0x185, 0, 0),
+        'Standard FD+BRS': (1, 0x7DF, 1, 1),
+        'Extended classic': (0, 0x18FF1234, 0, 0),
+        'Extended FD+BRS': (1, 0x18DAF110, 1, 1),
+    }
+
+    results = {}
+    for name, (timestamp, can_id, fdf, brs) in cases.items():
+        if build_CANHeader_py(timestamp, can_id, fdf, 0, brs) != build_CANHeader_py_bitwise(timestamp, can_id, fdf, 0, brs):
+            raise AssertionError(f"CAN 헤더 불일치: {name}")
+
+        ref_ns = _measure_ns(lambda: build_CANHeader_py_bitwise(timestamp, can_id, fdf, 0, brs), repeat)
+        new_ns = _measure_ns(lambda: build_CANHeader_py(timestamp, can_id, fdf, 0, brs), repeat)
+        results[name] = {
+            'bitwise_ns': ref_ns,
+            'lookup_ns': new_ns,
+            'speedup': ref_ns / new_ns if new_ns else 0.0,
+        }
+        print(f"{name:>16s}: 비트 연산 {ref_ns:7.1f}ns | 테이블 {new_ns:7.1f}ns | x{results[name]['speedup']:.1f}")
+
+    return results
+
+
+def bench_lpa_template_cache(csv_path: str = DEFAULT_PLAN_CSV, cycles: int = 3) -> dict:
+    """
+    CSV 테스트 계획 전체를 cycles 번 인코딩하여 LPA 템플릿 캐시 효율 확인
+
+    Args:
+        csv_path: CSV 테스트 계획 경로
+        cycles: 계획 반복 횟수 (실제 송신처럼 주기마다 재전송)
+
+    Returns:
+        dict: 캐시 카운터 + 프레임당 인코딩 시간
+    """
+    print("\n=== LPA 템플릿 캐시 벤치마크 ===")
+    print(f"대상 파일: {os.path.basename(csv_path)}")
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        plan = load_csv_test_plan(csv_path)
+    if not plan:
+        print("유효한 CSV 데이터가 없습니다.")
+        return {}
+
+    lpa_template_cache.clear()
+    start_ns = time.perf_counter_ns()
+    for _ in range(cycles):
+        for item in plan:
+            make_lpa_packet_with_can_header(item['data'], item['can_id'], False,
+                                            TCC_IPC_CMD_AP_TEST, item['port_n'])
+    elapsed_ns = time.perf_counter_ns() - start_ns
+
+    frames = len(plan) * cycles
+    stats = lpa_template_cache.stats()
+    stats['frames'] = frames
+    stats['encode_ns_per_frame'] = elapsed_ns / frames
+
+    print(f"행 수: {len(plan)}, 반복: {cycles}, 프레임: {frames}")
+    print(f"hit: {stats['hits']}, miss: {stats['misses']}, eviction: {stats['evictions']}, "
+          f"크기: {stats['size']}/{stats['maxsize']}, hit ratio: {stats['hit_ratio'] * 100:.2f}%")
+    print(f"프레임당 인코딩: {stats['encode_ns_per_frame'] / 1000:.3f}us")
+    return stats
+
+
+def bench_packet_builders(repeat: int = 20000) -> dict:
+    """
+    새 bytes 를 리턴하는 빌더 vs *_into (재사용 버퍼) 비교
+
+    시간과 함께 tracemalloc 으로 빌드 1회 동안 할당된 최대 바이트(peak - 시작 시점)를 측정한다.
+    호출 뒤 해제되는 임시 객체도 peak 에 잡히므로 프레임당 할당 여부를 직접 확인할 수 있다.
+
+    Args:
+        repeat: 반복 횟수
+
+    Returns:
+        dict: 빌더별 ns/frame, 빌드 1회 최대 할당 바이트
+    """
+    print("\n=== 패킷 빌더 벤치마크 (할당 비교) ===")
+
+    data = bytes(range(8))
+    can_id = 0x185
+    port = 6
+
+    def alloc_bytes(func, samples: int = 200) -> int:
+        func()  # 캐시 채우기
+        tracemalloc.start()
+        try:
+            peak = 0
+            for _ in range(samples):
+                tracemalloc.reset_peak()
+                current = tracemalloc.get_traced_memory()[0]
+                func()
+                peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+        finally:
+            tracemalloc.stop()
+        return peak
+
+    def build_lpa_bytes():
+        make_lpa_packet_with_can_header(data, can_id, False, TCC_IPC_CMD_AP_TEST, port)
+
+    def build_packet_bytes():
+        make_packet(3, TCC_IPC_CMD_AP_TEST, 0, 64)
+
+    results = {}
+    with tx_buffer_pool.borrow() as tx_buf:
+        def build_lpa_into():
+            make_lpa_packet_with_can_header_into(tx_buf, 0, data, can_id, False, TCC_IPC_CMD_AP_TEST, port)
+
+        def build_packet_into():
+            make_packet_into(tx_buf, 0, 3, TCC_IPC_CMD_AP_TEST, 0, 64)
+
+        for name, build_bytes, build_into in (('lpa', build_lpa_bytes, build_lpa_into),
+                                              ('packet', build_packet_bytes, build_packet_into)):
+            results[name] = {
+                'bytes_ns': _measure_ns(build_bytes, repeat),
+                'into_ns': _measure_ns(build_into, repeat),
+                'bytes_alloc_peak': alloc_bytes(build_bytes),
+                'into_alloc_peak': alloc_bytes(build_into),
+            }
+
+    labels = {'lpa': 'make_lpa_packet_with_can_header', 'packet': 'make_packet'}
+    for name, result in results.items():
+        label = labels[name]
+        print(f"{label + ' ':<37}: {result['bytes_ns'] / 1000:.3f}us/frame, "
+              f"빌드 1회 최대 할당 {result['bytes_alloc_peak']}B")
+        print(f"{label + '_into ':<37}: {result['into_ns'] / 1000:.3f}us/frame, "
+              f"빌드 1회 최대 할당 {result['into_alloc_peak']}B "
+              f"(시간 비 x{result['into_ns'] / result['bytes_ns']:.2f})")
+    return results
+
+
+def bench_compile_test_plan(csv_path: str = DEFAULT_PLAN_CSV) -> dict:
+    """
+    CSV 테스트 계획 전체 사전 인코딩 시간 및 메모리 측정
+
+    Args:
+        csv_path: CSV 테스트 계획 경로
+
+    Returns:
+        dict: CompiledTestPlan.stats()
+    """
+    print("\n=== 테스트 계획 사전 인코딩 벤치마크 ===")
+    print(f"대상 파일: {os.path.basename(csv_path)}")
+
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        plan = load_csv_test_plan(csv_path)
+    if not plan:
+        print("유효한 CSV 데이터가 없습니다.")
+        return {}
+
+    lpa_template_cache.clear()
+    compiled = compile_test_plan(plan)
+    stats = compiled.stats()
+
+    print(f"프레임: {stats['frames']}, 컴파일: {stats['compile_ms']:.3f}ms, "
+          f"프레임 버퍼: {stats['frame_bytes'] / 1024:.1f}KB, 전체 메모리: {stats['nbytes'] / 1024:.1f}KB")
+    return stats
+
+
+def bench_batch_encoding(n_frames: int = 15000, data_length: int = 8) -> dict:
+    """
+    NumPy 배치 CRC/프레임 인코딩 vs 프레임별 스칼라 인코딩 비교 (결과 일치 검증 포함)
+
+    Args:
+        n_frames: 프레임 수
+        data_length: payload 길이
+
+    Returns:
+        dict: 스칼라/배치 소요 시간(ms)
+    """
+    print("\n=== NumPy 배치 인코딩 벤치마크 ===")
+    if np is None:
+        print("numpy 가 설치되어 있지 않아 건너뜁니다.")
+        return {}
+
+    rng = np.random.default_rng(0)
+    payloads = rng.integers(0, 256, (n_frames, data_length), dtype=np.uint8)
+    can_ids = rng.integers(0, 0x800, n_frames)
+    ports = rng.integers(1, 17, n_frames)
+
+    start_ns = time.perf_counter_ns()
+    packets = make_lpa_packets_with_can_header_batch(payloads, can_ids, ports, TCC_IPC_CMD_AP_TEST)
+    batch_ns = time.perf_counter_ns() - start_ns
+
+    start_ns = time.perf_counter_ns()
+    crcs = calc_crc16_batch(packets[:, :-2])
+    batch_crc_ns = time.perf_counter_ns() - start_ns
+
+    start_ns = time.perf_counter_ns()
+    scalar = [make_lpa_packet_with_can_header(payloads[i].tobytes(), int(can_ids[i]), False,
+                                              TCC_IPC_CMD_AP_TEST, int(ports[i]))
+              for i in range(n_frames)]
+    scalar_ns = time.perf_counter_ns() - start_ns
+
+    start_ns = time.perf_counter_ns()
+    scalar_crcs = [calc_crc16(packet[:-2], 0) for packet in scalar]
+    scalar_crc_ns = time.perf_counter_ns() - start_ns
+
+    for i in range(n_frames):
+        if packets[i].tobytes() != scalar[i] or int(crcs[i]) != scalar_crcs[i]:
+            raise AssertionError(f"배치 결과 불일치: frame {i}")
+
+    results = {
+        'frames': n_frames,
+        'scalar_encode_ms': scalar_ns / 1_000_000,
+        'batch_encode_ms': batch_ns / 1_000_000,
+        'scalar_crc_ms': scalar_crc_ns / 1_000_000,
+        'batch_crc_ms': batch_crc_ns / 1_000_000,
+    }
+    print(f"{n_frames}개 프레임 ({data_length}B payload), 스칼라 결과와 일치 확인")
+    print(f"인코딩: 스칼라 {results['scalar_encode_ms']:.3f}ms | 배치 {results['batch_encode_ms']:.3f}ms")
+    print(f"CRC   : 스칼라 {results['scalar_crc_ms']:.3f}ms | 배치 {results['batch_crc_ms']:.3f}ms")
+    return results
+
+
+def bench_rx_decode(repeat: int = 50000) -> dict:
+    """
+    수신 스레드의 프레임당 디코딩 비용 측정 (LPA 파싱 + 15바이트 수신 헤더 파싱)
+
+    Args:
+        repeat: 반복 횟수
+
+    Returns:
+        dict: 단계별 ns/frame 및 결과 객체 크기
+    """
+    print("\n=== 수신 프레임 디코딩 벤치마크 ===")
+
+    rx_header = bytes.fromhex('0d0a2c1e000000000000000185000000')[:15]
+    payload = bytes(range(8))
+    body = rx_header + payload
+    packet = bytearray(IPC_OVERHEAD + len(body))
+    make_lpa_packet_into(packet, 0, body, 0x0101, 6, len(body))
+    packet = bytes(packet)
+
+    parsed = parse_lpa_packet_with_can_header(packet)
+    frame = parse_can_header(parsed.can_header)
+
+    lpa_ns = _measure_ns(lambda: parse_lpa_packet_with_can_header(packet), repeat)
+    hdr_ns = _measure_ns(lambda: parse_can_header(rx_header), repeat)
+
+    results = {
+        'parse_lpa_ns': lpa_ns,
+        'parse_can_header_ns': hdr_ns,
+        'lpa_packet_bytes': sys.getsizeof(parsed),
+        'rx_frame_bytes': sys.getsizeof(frame),
+        'rx_frame_dict_bytes': sys.getsizeof(frame.to_dict()),
+    }
+    print(f"parse_lpa_packet_with_can_header: {lpa_ns / 1000:.3f}us/frame")
+    print(f"parse_can_header               : {hdr_ns / 1000:.3f}us/frame")
+    print(f"객체 크기: LpaPacket {results['lpa_packet_bytes']}B, RxFrame {results['rx_frame_bytes']}B "
+          f"(기존 dict {results['rx_frame_dict_bytes']}B)")
+    return results
+
+
+def bench_bulk_rx_decode(n_frames: int = 1_000_000, verify: int = 20000) -> dict:
+    """
+    NumPy 일괄 수신 헤더 디코딩(parse_can_headers) 속도 측정 및 스칼라 결과와 필드별 비교
+
+    Args:
+        n_frames: 디코딩할 헤더 수
+        verify: parse_can_header 와 비교할 앞쪽 헤더 수
+
+    Returns:
+        dict: 일괄 디코딩 시간, 헤더당 ns
+    """
+    print("\n=== 수신 헤더 일괄 디코딩 벤치마크 ===")
+    if np is None:
+        print("numpy 가 설치되어 있지 않아 건너뜁니다.")
+        return {}
+
+    raw = os.urandom(15 * n_frames)
+
+    start_ns = time.perf_counter_ns()
+    frames = parse_can_headers(raw)
+    bulk_ns = time.perf_counter_ns() - start_ns
+
+    for i in range(min(verify, n_frames)):
+        scalar = parse_can_header(raw[15 * i:15 * i + 15])
+        for name in frames.dtype.names:
+            if int(frames[name][i]) != getattr(scalar, name):
+                raise AssertionError(f"필드 불일치: frame {i}, {name}")
+
+    results = {
+        'frames': n_frames,
+        'bulk_ms': bulk_ns / 1_000_000,
+        'bulk_ns_per_frame': bulk_ns / n_frames,
+    }
+    print(f"{n_frames}개 헤더: {results['bulk_ms']:.3f}ms ({results['bulk_ns_per_frame']:.1f}ns/header), "
+          f"앞 {min(verify, n_frames)}개 스칼라 결과와 일치 확인")
+    return results
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    """정렬된 리스트의 백분위 값 (nearest-rank)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def bench_rx_wait(frames: int = 500, interval_s: float = 0.002) -> dict:
+    """
+    수신 대기 방식별 RX 지연/CPU 비교 (1ms sleep 루프 vs AxonIPCDriver.recv)
+
+    실제 디바이스 대신 FIFO 를 AxonIPCDriver 로 열고, 송신 스레드가 interval_s 간격으로
+    송신 시각(perf_counter_ns)을 기록하면 수신 스레드가 읽은 시각과의 차이를 지연으로 본다.
+
+    Args:
+        frames: 방식별 송신 프레임 수
+        interval_s: 송신 간격 (초)
+
+    Returns:
+        dict: 방식별 지연 분포(us) 및 수신 스레드 CPU 사용 시간(ms)
+    """
+    print("\n=== 수신 대기 방식 벤치마크 (sleep 루프 vs poll) ===")
+    print(f"프레임: {frames}, 송신 간격: {interval_s * 1000:.1f}ms")
+
+    stamp = struct.Struct('<Q')
+
+    def sleep_loop(ipc):
+        try:
+            data = os.read(ipc.fd, 512)
+        except BlockingIOError:
+            data = None
+        if not data:
+            time.sleep(0.001)
+        return data
+
+    def poll_loop(ipc):
+        return ipc.recv(timeout=0.1)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fifo_path = os.path.join(tmp_dir, 'axon_ipc_bench')
+        os.mkfifo(fifo_path)
+
+        for name, receive in (('sleep 1ms', sleep_loop), ('poll', poll_loop)):
+            ipc = AxonIPCDriver(fifo_path)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                ipc.open_device()
+            writer_fd = os.open(fifo_path, os.O_WRONLY)
+
+            stop = threading.Event()
+            latencies_ns = []
+            cpu_ns = [0]
+
+            def receiver():
+                cpu_start = time.thread_time_ns()
+                pending = b''
+                while not stop.is_set() and len(latencies_ns) < frames:
+                    data = receive(ipc)
+                    if not data:
+                        continue
+                    recv_ns = time.perf_counter_ns()
+                    pending += data
+                    usable = len(pending) - len(pending) % stamp.size
+                    for (send_ns,) in stamp.iter_unpack(pending[:usable]):
+                        latencies_ns.append(recv_ns - send_ns)
+                    pending = pending[usable:]
+                cpu_ns[0] = time.thread_time_ns() - cpu_start
+
+            thread = threading.Thread(target=receiver)
+            thread.start()
+            time.sleep(0.05)
+
+            wall_start = time.perf_counter()
+            for _ in range(frames):
+                os.write(writer_fd, stamp.pack(time.perf_counter_ns()))
+                time.sleep(interval_s)
+            thread.join(timeout=5.0)
+            stop.set()
+            thread.join()
+            wall_s = time.perf_counter() - wall_start
+
+            os.close(writer_fd)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                ipc.close_device()
+
+            values = sorted(ns / 1000 for ns in latencies_ns)
+            results[name] = {
+                'frames': len(values),
+                'p50_us': _percentile(values, 0.50),
+                'p99_us': _percentile(values, 0.99),
+                'max_us': values[-1] if values else 0.0,
+                'mean_us': sum(values) / len(values) if values else 0.0,
+                'cpu_ms': cpu_ns[0] / 1_000_000,
+                'cpu_percent': cpu_ns[0] / 1e9 / wall_s * 100 if wall_s else 0.0,
+            }
+            r = results[name]
+            print(f"{name:>10s}: p50 {r['p50_us']:8.1f}us | p99 {r['p99_us']:8.1f}us | max {r['max_us']:8.1f}us | "
+                  f"수신 스레드 CPU {r['cpu_ms']:.1f}ms ({r['cpu_percent']:.1f}%)")
+
+    return results
+
+
+def bench_async_ipc(frames: int = 1500, paced_frames: int = 500, interval_s: float = 0.0005) -> dict:
+    """
+    asyncio 경로(open_ipc_connection) vs 스레드 경로(송신/수신 스레드, full-duplex 드라이버) 비교
+
+    FIFO 를 O_RDWR 로 열면 쓴 데이터가 같은 fd 로 다시 읽히므로 루프백 디바이스로 사용한다.
+    payload 에 프레임 번호를 넣고 송신 시각과 수신(파싱 완료) 시각의 차이를 지연으로 본다.
+    - 처리량: frames 개를 간격 없이 송신했을 때 마지막 패킷 수신까지의 frames/s
+    - 지연: paced_frames 개를 interval_s 간격으로 송신했을 때의 분포
+
+    Args:
+        frames: 처리량 측정 프레임 수 (FIFO 버퍼 64KB 안에 들어가는 크기)
+        paced_frames: 지연 측정 프레임 수
+        interval_s: 지연 측정 송신 간격 (초)
+
+    Returns:
+        dict: 경로별 처리량과 지연 분포(us)
+    """
+    print("\n=== asyncio vs 스레드 송수신 벤치마크 ===")
+
+    index_struct = struct.Struct('<Q')
+    rx_header = bytes(15)
+
+    def build_packet(index: int) -> bytes:
+        body = rx_header + index_struct.pack(index)
+        return make_lpa_packet(body, 0x0101, 6, len(body))
+
+    def summarize(send_ns: list, recv_ns: dict, wall_ns: int) -> dict:
+        values = sorted((recv_ns[i] - send_ns[i]) / 1000 for i in recv_ns)
+        return {
+            'frames': len(values),
+            'frames_per_s': len(values) / (wall_ns / 1e9) if wall_ns else 0.0,
+            'p50_us': _percentile(values, 0.50),
+            'p99_us': _percentile(values, 0.99),
+            'max_us': values[-1] if values else 0.0,
+        }
+
+    def run_threaded(path: str, count: int, interval: float) -> dict:
+        ipc = AxonIPCDriver(path)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            ipc.open_device()
+        packets = [build_packet(i) for i in range(count)]
+        send_ns = [0] * count
+        recv_ns = {}
+        framer = IpcFramer()
+
+        def receiver():
+            deadline = time.monotonic() + 5.0
+            while len(recv_ns) < count and time.monotonic() < deadline:
+                data = ipc.recv(timeout=0.1)
+                if not data:
+                    continue
+                for packet in framer.feed(data):
+                    parsed = parse_lpa_packet_with_can_header(packet)
+                    recv_ns[index_struct.unpack(parsed.payload)[0]] = time.perf_counter_ns()
+
+        thread = threading.Thread(target=receiver)
+        thread.start()
+        start_ns = time.perf_counter_ns()
+        for i, packet in enumerate(packets):
+            send_ns[i] = time.perf_counter_ns()
+            ipc.write_data(packet)
+            if interval:
+                time.sleep(interval)
+        thread.join()
+        wall_ns = time.perf_counter_ns() - start_ns
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            ipc.close_device()
+        return summarize(send_ns, recv_ns, wall_ns)
+
+    async def run_async(path: str, count: int, interval: float) -> dict:
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            reader, writer = await open_ipc_connection(path)
+        packets = [build_packet(i) for i in range(count)]
+        send_ns = [0] * count
+        recv_ns = {}
+
+        async def receiver():
+            async for parsed in reader:
+                recv_ns[index_struct.unpack(parsed.payload)[0]] = time.perf_counter_ns()
+                if len(recv_ns) >= count:
+                    break
+
+        async def sender():
+            for i, packet in enumerate(packets):
+                send_ns[i] = time.perf_counter_ns()
+                writer.write(packet)
+                await writer.drain()
+                if interval:
+                    await asyncio.sleep(interval)
+
+        start_ns = time.perf_counter_ns()
+        await asyncio.wait_for(asyncio.gather(receiver(), sender()), timeout=5.0)
+        wall_ns = time.perf_counter_ns() - start_ns
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            writer.close()
+        return summarize(send_ns, recv_ns, wall_ns)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fifo_path = os.path.join(tmp_dir, 'axon_ipc_bench')
+        os.mkfifo(fifo_path)
+
+        for mode, count, interval in (('처리량', frames, 0.0), ('지연', paced_frames, interval_s)):
+            for name in ('thread', 'asyncio'):
+                if name == 'thread':
+                    result = run_threaded(fifo_path, count, interval)
+                else:
+                    result = asyncio.run(run_async(fifo_path, count, interval))
+                results[f'{name}_{"throughput" if interval == 0.0 else "latency"}'] = result
+                print(f"[{mode}] {name:>7s}: {result['frames']}/{count} 프레임 | "
+                      f"{result['frames_per_s']:10.0f} frames/s | p50 {result['p50_us']:8.1f}us | "
+                      f"p99 {result['p99_us']:8.1f}us | max {result['max_us']:8.1f}us")
+
+    return results
+
+
+def bench_write_many(bursts: int = 2000, burst_sizes: tuple = (1, 4, 16, 64)) -> dict:
+    """
+    같은 tick 에 보낼 프레임 묶음의 송신 비용 비교 (프레임별 write vs write_many)
+
+    FIFO 를 디바이스 대신 열고 묶음마다 읽어서 비우므로 EAGAIN 없이 송신 경로만 측정한다.
+
+    Args:
+        bursts: 묶음 크기별 반복 횟수
+        burst_sizes: 측정할 묶음 크기 (프레임 수)
+
+    Returns:
+        dict: 묶음 크기별 ns/frame 및 시스템 콜 수
+    """
+    print("\n=== 묶음 송신(writev) 벤치마크 ===")
+
+    frame = make_lpa_packet_with_can_header(bytes(range(8)), 0x185, False, TCC_IPC_CMD_AP_TEST, 6)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fifo_path = os.path.join(tmp_dir, 'axon_ipc_bench')
+        os.mkfifo(fifo_path)
+        ipc = AxonIPCDriver(fifo_path)
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            ipc.open_device()
+
+        for size in burst_sizes:
+            frames = [frame] * size
+            drain_size = len(frame) * size
+
+            loop_ns = 0
+            for _ in range(bursts):
+                start_ns = time.perf_counter_ns()
+                for packet in frames:
+                    ipc.write_data(packet)
+                loop_ns += time.perf_counter_ns() - start_ns
+                os.read(ipc.fd, drain_size)
+
+            before = ipc.write_stats()
+            many_ns = 0
+            for _ in range(bursts):
+                start_ns = time.perf_counter_ns()
+                ipc.write_many(frames)
+                many_ns += time.perf_counter_ns() - start_ns
+                os.read(ipc.fd, drain_size)
+            after = ipc.write_stats()
+
+            total_frames = bursts * size
+            results[size] = {
+                'loop_ns_per_frame': loop_ns / total_frames,
+                'write_many_ns_per_frame': many_ns / total_frames,
+                'loop_syscalls': total_frames,
+                'write_many_syscalls': after['write_syscalls'] - before['write_syscalls'],
+                'syscalls_saved': after['syscalls_saved'] - before['syscalls_saved'],
+            }
+            r = results[size]
+            print(f"묶음 {size:3d}개: 프레임별 write {r['loop_ns_per_frame'] / 1000:7.3f}us | "
+                  f"write_many {r['write_many_ns_per_frame'] / 1000:7.3f}us | "
+                  f"시스템 콜 {r['loop_syscalls']} -> {r['write_many_syscalls']} (절약 {r['syscalls_saved']})")
+
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            ipc.close_device()
+
+    return results
+
+
+def bench_rx_ring(rounds: int = 200, frames_per_round: int = 1000) -> dict:
+    """
+    수신 경로 비교: read_data (read 마다 bytes 생성 + 출력) + IpcFramer vs IpcRxRing
+    (recv_packets: 패킷 리스트 리턴, drain_to: 패킷마다 콜백)
+
+    FIFO 에 frames_per_round 개 패킷을 써 둔 뒤 각 방식으로 모두 읽어 분리하는 것을 반복한다.
+    메모리는 tracemalloc 으로 한 라운드 동안의 최대 추가 할당량(peak)을 본다.
+
+    Args:
+        rounds: 반복 횟수
+        frames_per_round: 라운드당 패킷 수 (FIFO 버퍼 64KB 안에 들어가는 크기)
+
+    Returns:
+        dict: 방식별 frames/s, read 횟수, 라운드당 peak 할당 바이트
+    """
+    print("\n=== 수신 경로 벤치마크 (read_data vs 수신 링) ===")
+
+    body = bytes(15) + bytes(range(8))
+    burst = make_lpa_packet(body, 0x0101, 6, len(body)) * frames_per_round
+
+    def via_read_data(ipc):
+        framer = IpcFramer()
+        count = 0
+        reads = 0
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            while True:
+                data = ipc.read_data()
+                if data is None:
+                    break
+                reads += 1
+                count += len(framer.feed(data))
+        return count, reads
+
+    def via_ring(ipc):
+        reads_before = ipc.rx_ring.reads if ipc.rx_ring else 0
+        count = len(ipc.recv_packets(timeout=0))
+        return count, ipc.rx_ring.reads - reads_before
+
+    def via_ring_handler(ipc):
+        if ipc.rx_ring is None:
+            ipc.rx_ring = IpcRxRing()
+        reads_before = ipc.rx_ring.reads
+        count = ipc.rx_ring.drain_to(ipc.fd, len)
+        return count, ipc.rx_ring.reads - reads_before
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fifo_path = os.path.join(tmp_dir, 'axon_ipc_bench')
+        os.mkfifo(fifo_path)
+
+        for name, receive in (('read_data', via_read_data), ('recv_packets', via_ring),
+                              ('drain_to', via_ring_handler)):
+            ipc = AxonIPCDriver(fifo_path)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                ipc.open_device()
+
+            elapsed_ns = 0
+            frames = 0
+            reads = 0
+            for _ in range(rounds):
+                os.write(ipc.fd, burst)
+                start_ns = time.perf_counter_ns()
+                count, round_reads = receive(ipc)
+                elapsed_ns += time.perf_counter_ns() - start_ns
+                frames += count
+                reads += round_reads
+
+            os.write(ipc.fd, burst)
+            tracemalloc.start()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            receive(ipc)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                ipc.close_device()
+
+            results[name] = {
+                'frames': frames,
+                'frames_per_s': frames / (elapsed_ns / 1e9) if elapsed_ns else 0.0,
+                'reads_per_round': reads / rounds,
+                'peak_alloc_bytes_per_round': peak - base,
+            }
+            r = results[name]
+            print(f"{name:>12s}: {r['frames_per_s']:10.0f} frames/s | read {r['reads_per_round']:6.1f}회/라운드 | "
+                  f"라운드당 최대 추가 할당 {r['peak_alloc_bytes_per_round'] / 1024:7.1f}KB")
+
+    return results
+
+
+def bench_duplex_jitter(frames: int = 2000, interval_s: float = 0.001) -> dict:
+    """
+    송신 지터 비교: 송수신 단일 락(full_duplex=False) vs 송신/수신 별도 락(full_duplex=True)
+
+    FIFO 루프백에서 수신 스레드가 read_data 를 쉬지 않고 호출(spin)하는 동안
+    송신 스레드가 interval_s 간격의 절대 시각에 맞춰 write_data 를 호출한다.
+    - write 시간: write_data 호출 시간 (락 대기 포함)
+    - 송신 간격 지터: 실제 송신 간격과 interval_s 의 차이
+
+    Args:
+        frames: 송신 프레임 수
+        interval_s: 송신 간격 (초)
+
+    Returns:
+        dict: 모드별 write 시간/지터 분포(us)
+    """
+    print("\n=== 송신 지터 벤치마크 (단일 락 vs full-duplex) ===")
+    print(f"프레임: {frames}, 송신 간격: {interval_s * 1000:.1f}ms, 수신 스레드: read_data spin")
+
+    frame = make_lpa_packet_with_can_header(bytes(range(8)), 0x185, False, TCC_IPC_CMD_AP_TEST, 6)
+    interval_ns = int(interval_s * 1e9)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fifo_path = os.path.join(tmp_dir, 'axon_ipc_bench')
+        os.mkfifo(fifo_path)
+
+        for name, full_duplex in (('단일 락', False), ('full-duplex', True)):
+            ipc = AxonIPCDriver(fifo_path, full_duplex=full_duplex)
+            stop = threading.Event()
+            write_us = []
+            send_ns = []
+
+            def receiver():
+                while not stop.is_set():
+                    ipc.read_data()
+
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                ipc.open_device()
+                thread = threading.Thread(target=receiver)
+                thread.start()
+
+                deadline_ns = time.perf_counter_ns() + interval_ns
+                for _ in range(frames):
+                    remaining_ns = deadline_ns - time.perf_counter_ns()
+                    if remaining_ns > 0:
+                        time.sleep(remaining_ns / 1e9)
+                    start_ns = time.perf_counter_ns()
+                    ipc.write_data(frame)
+                    end_ns = time.perf_counter_ns()
+                    write_us.append((end_ns - start_ns) / 1000)
+                    send_ns.append(start_ns)
+                    deadline_ns += interval_ns
+
+                stop.set()
+                thread.join()
+                ipc.close_device()
+
+            jitter_us = [abs((b - a) - interval_ns) / 1000 for a, b in zip(send_ns, send_ns[1:])]
+            results[name] = {
+                'write_us': _latency_summary_us(write_us),
+                'interval_jitter_us': _latency_summary_us(jitter_us),
+            }
+            w, j = results[name]['write_us'], results[name]['interval_jitter_us']
+            print(f"{name:>11s}: write p50 {w['p50']:7.1f}us p99 {w['p99']:8.1f}us max {w['max']:8.1f}us | "
+                  f"간격 지터 p50 {j['p50']:7.1f}us p99 {j['p99']:8.1f}us max {j['max']:8.1f}us")
+
+    return results
+
+
+def bench_tx_backpressure(frames: int = 3000, burst: int = 8, read_size: int = 4096,
+                          read_interval_s: float = 0.0005) -> dict:
+    """
+    송신 버퍼가 가득 찰 때의 손실 비교: write_data (EAGAIN 이면 버림) vs 송신 큐 (block / drop_oldest)
+
+    FIFO 를 디바이스 대신 열고, 별도 fd 로 read_interval_s 마다 read_size 바이트씩만 읽는 느린 수신 측을 둔다.
+    송신 측은 burst 개씩 쉬지 않고 보내므로 64KB FIFO 버퍼가 금방 가득 찬다.
+    수신 측이 받은 패킷 수와 송신 큐의 드롭/재시도 카운터를 비교해 손실이 호스트 쪽인지 확인한다.
+    마지막 drop_oldest(여유) 는 burst 가 큐 깊이보다 크지만 전체 프레임이 FIFO 버퍼에 들어가는 경우로,
+    메일박스에 자리가 있으므로 버리는 프레임이 없어야 한다.
+
+    Args:
+        frames: 송신 프레임 수
+        burst: 한 번에 보내는 프레임 수
+        read_size: 수신 측 read 크기 (바이트)
+        read_interval_s: 수신 측 read 간격 (초)
+
+    Returns:
+        dict: 방식별 수신 패킷 수, 호스트 쪽 드롭 수, EAGAIN 재시도 수, 소요 시간
+    """
+    print("\n=== 송신 백프레셔 벤치마크 (write_data vs 송신 큐) ===")
+
+    payload = bytes(64)
+    packets = [make_lpa_packet_with_can_header(payload, 0x185, False, TCC_IPC_CMD_AP_TEST, 6)] * frames
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fifo_path = os.path.join(tmp_dir, 'axon_ipc_bench')
+        os.mkfifo(fifo_path)
+
+        # (이름, 정책, 큐 깊이, 프레임 수, 한 번에 보내는 프레임 수, 수신 측 read 간격)
+        roomy_frames = min(frames, 32 * 1024 // len(packets[0]))  # FIFO 버퍼(64KB)의 절반 이내
+        cases = (('write_data', None, 0, frames, burst, read_interval_s),
+                 ('block', TX_POLICY_BLOCK, 256, frames, burst, read_interval_s),
+                 ('drop_oldest', TX_POLICY_DROP_OLDEST, 256, frames, burst, read_interval_s),
+                 ('drop_oldest(여유)', TX_POLICY_DROP_OLDEST, 16, roomy_frames, 64, 0.0))
+        for name, policy, depth, case_frames, case_burst, case_interval in cases:
+            ipc = AxonIPCDriver(fifo_path)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                ipc.open_device()
+            if policy is not None:
+                ipc.configure_tx_queue(depth=depth, policy=policy, timeout=0.5)
+            read_fd = os.open(fifo_path, os.O_RDONLY | os.O_NONBLOCK)
+            framer = IpcFramer()
+            stop = threading.Event()
+
+            def reader():
+                while True:
+                    try:
+                        data = os.read(read_fd, read_size)
+                    except BlockingIOError:
+                        if stop.is_set():
+                            return
+                        data = b''
+                    framer.feed(data)
+                    time.sleep(case_interval)
+
+            thread = threading.Thread(target=reader)
+            thread.start()
+            start_ns = time.perf_counter_ns()
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                for index in range(0, case_frames, case_burst):
+                    chunk = packets[index:min(index + case_burst, case_frames)]
+                    if policy is None:
+                        for packet in chunk:
+                            ipc.write_data(packet)
+                    else:
+                        ipc.send_many(chunk)
+                ipc.flush_tx(2.0)
+            elapsed_ns = time.perf_counter_ns() - start_ns
+            stop.set()
+            thread.join()
+
+            stats = ipc.tx_stats()
+            host_dropped = (stats['write_data_eagain'] + stats.get('dropped_oldest', 0) + stats.get('dropped_newest', 0) +
+                            stats.get('dropped_timeout', 0) + stats.get('dropped_error', 0))
+            results[name] = {
+                'received': framer.packets,
+                'host_dropped': host_dropped,
+                'retries': stats.get('retries', 0),
+                'queue_delay_max_us': stats.get('queue_delay_max_us', 0.0),
+                'elapsed_ms': elapsed_ns / 1e6,
+            }
+            r = results[name]
+            print(f"{name:>16s}: 수신 {r['received']:5d}/{case_frames} | 호스트 쪽 드롭 {r['host_dropped']:5d} | "
+                  f"EAGAIN 재시도 {r['retries']:5d} | 최대 큐 지연 {r['queue_delay_max_us'] / 1000:7.2f}ms | "
+                  f"{r['elapsed_ms']:7.1f}ms")
+
+            os.close(read_fd)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                ipc.close_device()
+
+    return results
+
+
+def _log2_histogram_us(values_us: list) -> list:
+    """
+    지연 값(us)을 2의 거듭제곱 상한 버킷으로 집계
+
+    Returns:
+        list: [{'le_us': 상한, 'count': 개수}, ...] (값이 있는 버킷까지만)
+    """
+    counts = {}
+    for value in values_us:
+        upper = 1
+        while upper < value:
+            upper <<= 1
+        counts[upper] = counts.get(upper, 0) + 1
+    return [{'le_us': upper, 'count': counts[upper]} for upper in sorted(counts)]
+
+
+def _latency_summary_us(values_us: list) -> dict:
+    """지연 분포 요약 (us)"""
+    values = sorted(values_us)
+    if not values:
+        return {}
+    return {
+        'min': values[0],
+        'mean': sum(values) / len(values),
+        'p50': _percentile(values, 0.50),
+        'p99': _percentile(values, 0.99),
+        'p99.9': _percentile(values, 0.999),
+        'max': values[-1],
+    }
+
+
+def bench_clock_read(repeat: int = 200000) -> dict:
+    """
+    시계 읽기 비용 비교: ctypes clock_gettime + timespec 할당 (기존 송수신 루프 방식) vs timing.now_ns
+
+    Args:
+        repeat: 반복 횟수
+
+    Returns:
+        dict: 방식별 1회 평균 ns 와 timing.calibrate() 결과
+    """
+    print("\n=== 시계 읽기 비용 벤치마크 ===")
+
+    libc = ctypes.CDLL(ctypes.util.find_library('c'))
+
+    class timespec(ctypes.Structure):
+        _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
+
+    clock_gettime = libc.clock_gettime
+    clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
+    clock_gettime.restype = ctypes.c_int
+
+    def ctypes_read() -> int:
+        ts = timespec()
+        clock_gettime(CLOCK_ID, ctypes.byref(ts))
+        return ts.tv_sec * 1_000_000_000 + ts.tv_nsec
+
+    ctypes_ns = _measure_ns(ctypes_read, repeat)
+    timing_ns = _measure_ns(now_ns, repeat)
+    clock = calibrate()
+
+    print(f"ctypes timespec : {ctypes_ns:8.1f} ns/회")
+    print(f"timing.now_ns   : {timing_ns:8.1f} ns/회  ({ctypes_ns / timing_ns:.1f}배)")
+    print(f"보정 ({CLOCK_NAME}): 읽기 비용 중앙값 {clock.overhead_ns}ns, 최소 {clock.min_ns}ns, "
+          f"해상도 {clock.resolution_ns}ns")
+    return {'ctypes_ns': ctypes_ns, 'timing_ns': timing_ns, 'calibration': clock.to_dict()}
+
+
+def bench_logging(frames: int = 5000) -> dict:
+    """
+    프레임당 로그 출력이 송수신 루프 속도에 주는 영향 (print vs AsyncLogger)
+
+    FIFO 루프백에서 write_data -> recv_packets -> 파싱 루프를 돌리며 프레임마다
+    can_sender_app 수신 스레드와 같은 검증 로그(약 25줄)를 남긴다.
+    출력은 터미널처럼 줄 단위 버퍼링되는 파이프로 보내고 별도 스레드가 읽어 버린다
+    (실제 터미널은 이보다 느리므로 print 의 비용은 더 커진다).
+
+    Args:
+        frames: 프레임 수
+
+    Returns:
+        dict: 방식별 초당 프레임 수와 프레임당 루프 시간 분포(us)
+    """
+    print("\n=== 로그 출력 벤치마크 (프레임당 print vs AsyncLogger) ===")
+
+    frame = make_lpa_packet_with_can_header(bytes(range(8)), 0x185, False, TCC_IPC_CMD_AP_TEST, 6)
+    validation_result = {
+        'valid': True, 'send_index': 1, 'delay_ms': 0.0, 'expected_port': 6, 'expected_can_id': '0x185',
+        'expected_payload': bytes(range(8)).hex(), 'expected_msg_id': '0x185', 'expected_cycle_time': 10,
+    }
+    modes = (
+        ('로그 없음', None),
+        ('print (frame)', 'print'),
+        ('async (summary)', LOG_SUMMARY),
+        ('async (frame)', LOG_FRAME),
+    )
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fifo_path = os.path.join(tmp_dir, 'axon_ipc_bench')
+        os.mkfifo(fifo_path)
+
+        for name, mode in modes:
+            read_fd, write_fd = os.pipe()
+            stream = os.fdopen(write_fd, 'w', buffering=1, encoding='utf-8')
+
+            def drain():
+                while os.read(read_fd, 65536):
+                    pass
+
+            drainer = threading.Thread(target=drain)
+            drainer.start()
+            log = AsyncLogger(mode, stream=stream).start() if isinstance(mode, int) else None
+
+            ipc = AxonIPCDriver(fifo_path)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                ipc.open_device()
+
+            loop_us = []
+            start_ns = time.perf_counter_ns()
+            for index in range(frames):
+                frame_start_ns = time.perf_counter_ns()
+                ipc.write_data(frame)
+                for packet in ipc.recv_packets(0):
+                    parsed = parse_lpa_packet_with_can_header(packet)
+                    rx_frame_info = parse_can_header(parsed.can_header)
+                    args = (index, bytes(packet), 0.0, 0.0, frame_start_ns, 0.0, parsed, rx_frame_info,
+                            validation_result)
+                    if mode == 'print':
+                        print(_format_rx_packet(*args), file=stream)
+                    elif log is not None:
+                        log.frame(_format_rx_packet, *args)
+                loop_us.append((time.perf_counter_ns() - frame_start_ns) / 1000)
+            elapsed_ns = time.perf_counter_ns() - start_ns
+
+            # 큐에 남은 로그 출력은 측정에서 제외 (writer 스레드가 루프 밖에서 처리)
+            log_stats = None
+            if log is not None:
+                log.close()
+                log_stats = log.stats()
+            stream.close()
+            drainer.join()
+            os.close(read_fd)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                ipc.close_device()
+
+            results[name] = {
+                'frames_per_s': frames / (elapsed_ns / 1e9),
+                'loop_us': _latency_summary_us(loop_us),
+                'logger': log_stats,
+            }
+            r = results[name]
+            print(f"{name:>15s}: {r['frames_per_s']:9.0f} 프레임/초 | 루프 p50 {r['loop_us']['p50']:7.1f}us "
+                  f"p99 {r['loop_us']['p99']:8.1f}us max {r['loop_us']['max']:8.1f}us"
+                  + (f" | 출력 {log_stats['emitted']}개 / write {log_stats['writes']}회" if log_stats else ""))
+
+    return results
+
+
+def bench_capture(records: int = 200000) -> dict:
+    """
+    송수신 기록 비용: 텍스트 hex 로그 vs CaptureWriter (mmap 바이너리)
+
+    - text_line: 줄 단위 버퍼링 파일에 hex 한 줄씩 (터미널 stdout 에 print 하던 방식, 줄마다 write)
+    - text_buffered: 일반 버퍼링 파일에 hex 한 줄씩
+    - capture: CaptureWriter.record (헤더 pack_into + 데이터 복사)
+
+    Args:
+        records: 기록할 프레임 수
+
+    Returns:
+        dict: 방식별 레코드당 ns, 파일 크기, CaptureReader 순회 속도
+    """
+    print("\n=== 캡처 기록 벤치마크 (텍스트 hex vs 바이너리 mmap) ===")
+
+    frame = make_lpa_packet_with_can_header(bytes(range(8)), 0x185, False, TCC_IPC_CMD_AP_TEST, 6)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, buffering in (('text_line', 1), ('text_buffered', -1)):
+            text_path = os.path.join(tmp_dir, f'{name}.txt')
+            start_ns = time.perf_counter_ns()
+            with open(text_path, 'w', buffering=buffering) as f:
+                for _ in range(records):
+                    f.write(f"{now_ns()} tx dev 1 {len(frame)} {frame.hex()}\n")
+            results[name] = {'ns_per_record': (time.perf_counter_ns() - start_ns) / records,
+                             'file_bytes': os.path.getsize(text_path)}
+
+        capture_path = os.path.join(tmp_dir, 'capture.bin')
+        writer = CaptureWriter(capture_path, capacity=records * (len(frame) + 16) + 4096)
+        record = writer.record
+        start_ns = time.perf_counter_ns()
+        for _ in range(records):
+            record(CAPTURE_TX, 1, frame)
+        capture_ns = (time.perf_counter_ns() - start_ns) / records
+        writer.close()
+        results['capture'] = {'ns_per_record': capture_ns, 'file_bytes': os.path.getsize(capture_path)}
+
+        with CaptureReader(capture_path) as reader:
+            start_ns = time.perf_counter_ns()
+            total = 0
+            for _, data in reader.frames():
+                total += len(data)
+            read_ns = (time.perf_counter_ns() - start_ns) / records
+            del data
+        results['capture']['read_ns_per_record'] = read_ns
+
+    for name, r in results.items():
+        print(f"{name:>13s}: {r['ns_per_record']:7.1f} ns/레코드, 파일 {r['file_bytes'] / 1024 / 1024:6.2f}MB")
+    print(f"CaptureReader 순회 (memoryview, 복사 없음): {read_ns:.1f} ns/레코드")
+    return results
+
+
+def bench_replay(frames: int = 500, interval_s: float = 0.001) -> dict:
+    """
+    재생 타이밍 비교: 프레임마다 sleep(간격) (상대 대기) vs IpcReplayer (절대 예정 시각)
+
+    FIFO 루프백에 interval_s 간격 스트림을 보내고 예정 시각 대비 송신 시각 오차를 비교한다.
+    상대 대기는 sleep 초과분과 송신 시간이 매 프레임 누적되어 마지막 프레임의 오차(drift)가 커진다.
+
+    Args:
+        frames: 프레임 수
+        interval_s: 프레임 간격 (초)
+
+    Returns:
+        dict: 방식별 예정 시각 대비 오차 분포(us)와 마지막 프레임 오차(ms)
+    """
+    print("\n=== 재생 타이밍 벤치마크 (상대 sleep vs 절대 예정 시각) ===")
+    print(f"프레임: {frames}, 간격: {interval_s * 1000:.1f}ms")
+
+    frame = make_lpa_packet_with_can_header(bytes(range(8)), 0x185, False, TCC_IPC_CMD_AP_TEST, 6)
+    interval_ns = int(interval_s * 1e9)
+    stream = [(index * interval_ns, frame) for index in range(frames)]
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fifo_path = os.path.join(tmp_dir, 'axon_ipc_bench')
+        os.mkfifo(fifo_path)
+
+        for name in ('상대 sleep', 'IpcReplayer'):
+            ipc = AxonIPCDriver(fifo_path)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                ipc.open_device()
+            read_fd = os.open(fifo_path, os.O_RDONLY | os.O_NONBLOCK)
+            stop = threading.Event()
+
+            def reader():
+                while not stop.is_set():
+                    try:
+                        os.read(read_fd, 65536)
+                    except BlockingIOError:
+                        time.sleep(0.001)
+
+            thread = threading.Thread(target=reader)
+            thread.start()
+
+            if name == 'IpcReplayer':
+                replayer = IpcReplayer(ipc, spin_us=200)
+                replayer.run(stream)
+                error_us = [late_ns / 1000 for late_ns in replayer.lateness_ns]
+            else:
+                start_ns = now_ns()
+                error_us = []
+                for timestamp_ns, data in stream:
+                    error_us.append((now_ns() - start_ns - timestamp_ns) / 1000)
+                    ipc.write_many([data])
+                    time.sleep(interval_s)
+
+            stop.set()
+            thread.join()
+            os.close(read_fd)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                ipc.close_device()
+
+            results[name] = {
+                'error_us': _latency_summary_us(error_us),
+                'final_drift_ms': error_us[-1] / 1000,
+            }
+            e = results[name]['error_us']
+            print(f"{name:>11s}: 예정 시각 대비 p50 {e['p50']:8.1f}us p99 {e['p99']:8.1f}us max {e['max']:8.1f}us | "
+                  f"마지막 프레임 {results[name]['final_drift_ms']:7.2f}ms")
+
+    return results
+
+
+def bench_ipc_ping(devices: tuple = tuple(AXON_IPC_DEVICE_FILES), count: int = 5000,
+                   output_path: str = None) -> dict:
+    """
+    IOCTL_IPC_PING_TEST 왕복 지연 측정 (라우터를 거치지 않는 메일박스 자체 지연)
+
+    코어(디바이스)별로 count 번 ping ioctl 을 호출하고 호출 전후를 timing.now_ns 로 측정한다 (시계 읽기 비용 제외).
+    결과는 펌웨어 빌드 간 비교를 위해 JSON 으로 저장할 수 있다.
+
+    Args:
+        devices: 측정할 디바이스 이름 ('cm0', 'cm1', 'cm2', 'cmn')
+        count: 디바이스별 ping 횟수
+        output_path: JSON 저장 경로 (None 이면 저장하지 않음, '-' 이면 표준 출력에 JSON 만 쓰고 진행 상황은 표준 에러로)
+
+    Returns:
+        dict: 디바이스별 상태 코드 집계, 지연 분포(us), 히스토그램
+    """
+    # '-' 이면 표준 출력에는 JSON 문서만 남도록 진행 상황과 드라이버 메시지는 표준 에러로
+    progress = contextlib.redirect_stdout(sys.stderr) if output_path == '-' else contextlib.nullcontext()
+    with progress:
+        print("\n=== IPC ping 지연 벤치마크 (IOCTL_IPC_PING_TEST) ===")
+
+        report = {
+            'benchmark': 'ipc_ping',
+            'clock': CLOCK_NAME,
+            'clock_overhead_ns': calibration().overhead_ns,
+            'unit': 'us',
+            'count': count,
+            'started_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'devices': {},
+        }
+
+        for name in devices:
+            device_path = AXON_IPC_DEVICE_FILES[name]
+            result = {'device_path': device_path}
+            report['devices'][name] = result
+
+            ipc = AxonIPCDriver(device_path)
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                opened = ipc.open_device()
+            if not opened:
+                result['error'] = 'open failed'
+                print(f"[{name}] 디바이스를 열 수 없습니다: {device_path}")
+                continue
+
+            status_counts = {}
+            latencies_us = []
+            success_us = []
+            response_times = []
+            try:
+                for _ in range(count):
+                    start_ns = now_ns()
+                    ping_info = ipc.ping_test()
+                    end_ns = now_ns()
+                    if ping_info is None:
+                        # ioctl 자체 실패 (ping 상태 코드가 아님): 이 디바이스 측정 중단
+                        result['error'] = 'ioctl failed'
+                        break
+
+                    latency_us = elapsed_ns(start_ns, end_ns) / 1000
+                    latencies_us.append(latency_us)
+                    status_counts[ping_info.pingResult] = status_counts.get(ping_info.pingResult, 0) + 1
+                    if ping_info.success:
+                        success_us.append(latency_us)
+                        response_times.append(ping_info.responseTime)
+            finally:
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    ipc.close_device()
+
+            result.update({
+                'samples': len(latencies_us),
+                'success': len(success_us),
+                'status': {
+                    str(code): {'count': hits, 'description': PING_RESULT_STATUS.get(code, 'unknown')}
+                    for code, hits in sorted(status_counts.items())
+                },
+                'latency_us': _latency_summary_us(latencies_us),
+                'success_latency_us': _latency_summary_us(success_us),
+                'histogram_us': _log2_histogram_us(latencies_us),
+                'driver_response_time': _latency_summary_us(response_times),
+            })
+
+            summary = result['success_latency_us']
+            if summary:
+                print(f"[{name}] 성공 {len(success_us)}/{len(latencies_us)} | p50 {summary['p50']:.1f}us | "
+                      f"p99 {summary['p99']:.1f}us | p99.9 {summary['p99.9']:.1f}us | max {summary['max']:.1f}us")
+            else:
+                print(f"[{name}] 성공한 ping 없음 (샘플 {len(latencies_us)}개, 상태: "
+                      f"{', '.join(f'{code}x{hits}' for code, hits in sorted(status_counts.items())) or '-'})")
+
+    if output_path == '-':
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    elif output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {output_path}")
+
+    return report
+
+
+def run_all() -> None:
+    """디바이스가 필요 없는 전체 마이크로 벤치마크 실행"""
+    bench_crc16()
+    bench_can_header()
+    bench_lpa_template_cache()
+    bench_packet_builders()
+    bench_compile_test_plan()
+    bench_batch_encoding()
+    bench_rx_decode()
+    bench_bulk_rx_decode()
+    bench_rx_wait()
+    bench_async_ipc()
+    bench_write_many()
+    bench_rx_ring()
+    bench_duplex_jitter()
+    bench_tx_backpressure()
+    bench_clock_read()
+    bench_logging()
+    bench_capture()
+    bench_replay()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AXON IPC 성능 측정")
+    subparsers = parser.add_subparsers(dest='command')
+
+    ping_parser = subparsers.add_parser('ping', help="IOCTL_IPC_PING_TEST 지연 측정 (JSON 출력)")
+    ping_parser.add_argument('--devices', nargs='+', choices=list(AXON_IPC_DEVICE_FILES),
+                             default=list(AXON_IPC_DEVICE_FILES), help="측정할 디바이스")
+    ping_parser.add_argument('--count', type=int, default=5000, help="디바이스별 ping 횟수")
+    ping_parser.add_argument('--output', default='-', help="JSON 저장 경로 ('-' 이면 표준 출력)")
+
+    args = parser.parse_args()
+    if args.command == 'ping':
+        bench_ipc_ping(tuple(args.devices), args.count, args.output)
+    else:
+        run_all()
@@ -5,162 +5,136 @@ CSV 데이터를 읽어서 IPC로 CAN 데이터를 전송하는 실제 응용 
 """
 
 import time
-import ctypes
-import ctypes.util
 import threading
 import os
 import glob
-import csv
-from axon_ipc_driver import AxonIPCDriver
+from typing import Optional
+from axon_ipc_driver import AxonIPCDriver, TX_POLICY_BLOCK
 from constants import AXON_IPC_CM1_FILE, TCC_IPC_CMD_AP_TEST
-from packet_utils import make_lpa_packet_with_can_header, parse_lpa_packet_with_can_header, parse_can_header
-
-def can_sender_app():
-    """CSV 데이터를 읽어서 IPC로 CAN 데이터를 전송하는 메인 함수 (멀티스레딩)"""
+from packet_utils import parse_lpa_packet_with_can_header, parse_can_header, IpcFramer
+from test_plan import load_csv_test_plan, compile_test_plan
+from timing import now_ns, elapsed_ns, format_ns, calibrate, mcu_timestamp_ns
+from log_utils import AsyncLogger, LOG_FAILURE, LOG_FRAME
+from capture import CaptureWriter
+
+
+def _format_tx_frame(frame_idx, total_frames, item, send_time_ms, relative_time_ms,
+                     accumulated_cycle_time_sec, sleep_time) -> str:
+    """송신 프레임 로그 (LOG_FRAME, writer 스레드에서 포맷)"""
+    return (f"[송신 스레드] [{frame_idx:04d}/{total_frames}] 전송 완료 | "
+            f"Port: {item['port_n']}, CAN ID: 0x{item['can_id']:X}, "
+            f"Data: {item['data'].hex()}, "
+            f"전송시간: {send_time_ms:.3f}ms, "
+            f"대기시간: {item['cycle_time']:.3f}초,"
+            f"상대시간: {relative_time_ms:.3f}ms"
+            f"누적시간: {accumulated_cycle_time_sec:.3f}ms"
+            f"대기시간: {(send_time_ms + relative_time_ms)/1000:.3f}초"
+            f"sleep_time: {sleep_time:.3f}초")
+
+
+def _format_rx_packet(current_count, packet, recv_time_ms, total_elapsed_ms, recv_end_ns, relative_time_ms,
+                      parsed, rx_frame_info, validation_result) -> str:
+    """수신 패킷 로그 (검증 성공은 LOG_FRAME, 실패는 LOG_FAILURE, writer 스레드에서 포맷)"""
+    lines = [
+        f"[수신 스레드] 패킷 {current_count:3d}: {len(packet)}바이트 | "
+        f"수신시간: {recv_time_ms:.3f}ms | "
+        f"총경과: {total_elapsed_ms:.3f}ms | "
+        f"수신타임스탬프: {format_ns(recv_end_ns)} | "
+        f"상대시간: {relative_time_ms:.3f}ms",
+        f"  ✓ LPA 패킷 파싱 성공!",
+        f"  CMD: 0x{parsed.cmd:04x}, Port: {parsed.port}",
+        f"  CRC: 0x{parsed.crc:04x} ({'유효' if parsed.crc_valid else '무효'})",
+        f"  --- 수신 프레임 정보 ---",
+        f"  프레임 타입: {rx_frame_info.frame_type}",
+        f"  소스 포트: {rx_frame_info.source_port}",
+        f"  타임스탬프 (ns): {rx_frame_info.timestamp_ns}",
+        f"  타임스탬프 (us): {rx_frame_info.timestamp_us_h:08x}{rx_frame_info.timestamp_us_l:08x}",
+        f"  MCU 타임스탬프: {format_ns(mcu_timestamp_ns(rx_frame_info))}",
+        f"  프로토콜 타입: {rx_frame_info.protocol_type}",
+    ]
+    if rx_frame_info.is_extended:
+        lines.append(f"  Extended CAN ID: 0x{rx_frame_info.ext_can_id:08X}")
+    else:
+        lines.append(f"  Standard CAN ID: 0x{rx_frame_info.can_id:03X}")
+    lines += [
+        f"  LIN ID: {rx_frame_info.lin_id}",
+        f"  CAN FD: {rx_frame_info.is_fd}, RTR: {rx_frame_info.is_remote}",
+        f"  --- 진짜 Payload ---",
+        f"  실제 CAN 데이터: {parsed.payload.hex()}",
+        f"  Payload 길이: {len(parsed.payload)}바이트",
+        f"  전체 데이터: {packet.hex()}",
+        f"  --- 데이터 검증 결과 ---",
+    ]
+
+    if validation_result['valid']:
+        lines += [
+            f"  ✅ 검증 성공!",
+            f"  송신 인덱스: {validation_result['send_index']}",
+            f"  지연 시간: {validation_result['delay_ms']:.3f}ms",
+            f"  예상 포트: {validation_result['expected_port']} ✓",
+            f"  예상 CAN ID: {validation_result['expected_can_id']} ✓",
+            f"  예상 데이터: {validation_result['expected_payload']} ✓",
+            f"  예상 메시지 ID: {validation_result['expected_msg_id']}",
+            f"  예상 주기: {validation_result['expected_cycle_time']}ms",
+        ]
+    else:
+        lines.append(f"  ❌ 검증 실패!")
+        if 'reason' in validation_result:
+            lines.append(f"  실패 이유: {validation_result['reason']}")
+        else:
+            lines += [
+                f"  포트 매칭: {'✓' if validation_result.get('port_match', False) else '✗'}",
+                f"  CAN ID 매칭: {'✓' if validation_result.get('can_id_match', False) else '✗'}",
+                f"  데이터 매칭: {'✓' if validation_result.get('data_match', False) else '✗'}",
+                f"  수신 포트: {validation_result.get('received_port', 'unknown')}",
+                f"  예상 포트: {validation_result.get('expected_port', 'unknown')}",
+                f"  수신 CAN ID: {validation_result.get('received_can_id', 'unknown')}",
+                f"  예상 CAN ID: {validation_result.get('expected_can_id', 'unknown')}",
+                f"  수신 데이터: {validation_result.get('received_payload', 'unknown')}",
+                f"  예상 데이터: {validation_result.get('expected_payload', 'unknown')}",
+            ]
+            if 'delay_ms' in validation_result:
+                lines.append(f"  지연 시간: {validation_result['delay_ms']:.3f}ms")
+    return '\n'.join(lines)
+
+
+def can_sender_app(device_path: str = AXON_IPC_CM1_FILE, csv_path: Optional[str] = None,
+                   log_level: int = LOG_FAILURE, capture_path: Optional[str] = None):
+    """
+    CSV 데이터를 읽어서 IPC로 CAN 데이터를 전송하는 메인 함수 (멀티스레딩)
+
+    송수신 스레드의 출력은 AsyncLogger 를 거치므로 터미널 I/O 가 송수신 타이밍을 막지 않는다.
+
+    Args:
+        device_path: IPC 디바이스 경로 (기본값: cm1, router_sim 의 pty 경로도 사용 가능)
+        csv_path: CSV 테스트 계획 경로 (None 이면 csv-file 디렉터리의 첫 번째 파일)
+        log_level: 송수신 중 출력 레벨 (LOG_SUMMARY: 요약만, LOG_FAILURE: + 검증 실패/오류,
+                   LOG_FRAME: + 프레임마다)
+        capture_path: 송수신 원본 바이트를 기록할 캡처 파일 경로 (None 이면 기록하지 않음)
+    """
     print("\n=== CSV 기반 CAN 데이터 전송 애플리케이션 (멀티스레딩) ===")
     
     try:
         # CSV 파일 경로 설정
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        csv_dir = os.path.join(base_dir, 'csv-file')
-        if not os.path.isdir(csv_dir):
-            print(f"CSV 디렉터리를 찾을 수 없습니다: {csv_dir}")
-            return
-
-        csv_files = sorted(glob.glob(os.path.join(csv_dir, '*.csv')))
-        if not csv_files:
-            print(f"CSV 파일이 없습니다: {csv_dir}")
-            return
-
-        target_csv = csv_files[0]
-        print(f"대상 파일: {os.path.basename(target_csv)}")
-
-        # CSV 데이터 읽기 및 파싱
-        csv_data = []
-        with open(target_csv, 'r', encoding='utf-8-sig', newline='') as f:
-            reader = csv.reader(f)
-            
-            # 1행: 헤더(사용 안함)
-            _header = next(reader, None)
-            if _header is None:
-                print("빈 CSV 파일입니다.")
+        if csv_path is None:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            csv_dir = os.path.join(base_dir, 'csv-file')
+            if not os.path.isdir(csv_dir):
+                print(f"CSV 디렉터리를 찾을 수 없습니다: {csv_dir}")
                 return
 
-            # 2행: 컬럼명 위치 파악
-            second_row = next(reader, None)
-            if second_row is None:
-                print("2번째 행(데이터)이 존재하지 않습니다.")
+            csv_files = sorted(glob.glob(os.path.join(csv_dir, '*.csv')))
+            if not csv_files:
+                print(f"CSV 파일이 없습니다: {csv_dir}")
                 return
 
-            # 2번째 줄에서 컬럼명 위치 자동 감지 (중복 등장까지 수집)
-            normalized_cells = [(c or '').strip() for c in second_row]
-
-            targets = {
-                'Channel': ['Channel'],
-                'MsgID': ['MsgID', 'Msg ID', 'MessageID', 'Message ID'],
-                'MsgValue': ['MsgValue', 'MessageValue', 'Value'],
-                'CycleTime (ms)': ['CycleTime (ms)', 'CycleTime(ms)', 'Cycle Time (ms)']
-            }
-
-            def find_indices(candidates):
-                candidate_set = set(candidates)
-                return [i for i, val in enumerate(normalized_cells) if val in candidate_set]
-
-            channel_idxs = find_indices(targets['Channel'])
-            msgid_idxs = find_indices(targets['MsgID'])
-            msgvalue_idxs = find_indices(targets['MsgValue'])
-            cycle_idxs = find_indices(targets['CycleTime (ms)'])
-
-            # 최소 2개까지 확보 (부족하면 경고)
-            if len(channel_idxs) < 2 or len(msgid_idxs) < 2 or len(msgvalue_idxs) < 2 or len(cycle_idxs) < 2:
-                print("필수 컬럼명이 2개 이상 존재하지 않습니다.")
-                print(f"Channel idxs: {channel_idxs}")
-                print(f"MsgID idxs: {msgid_idxs}")
-                print(f"MsgValue idxs: {msgvalue_idxs}")
-                print(f"CycleTime(ms) idxs: {cycle_idxs}")
-                return
+            csv_path = csv_files[0]
 
-            idx_channel_1, idx_channel_2 = channel_idxs[0], channel_idxs[1]
-            idx_msgid_1, idx_msgid_2 = msgid_idxs[0], msgid_idxs[1]
-            idx_msgvalue_1, idx_msgvalue_2 = msgvalue_idxs[0], msgvalue_idxs[1]
-            idx_cycle_1, idx_cycle_2 = cycle_idxs[0], cycle_idxs[1]
-
-            print(f"컬럼 위치 확인:")
-            print(f"첫 번째 세트 - Channel: {idx_channel_1}, MsgID: {idx_msgid_1}, MsgValue: {idx_msgvalue_1}, CycleTime: {idx_cycle_1}")
-            print(f"두 번째 세트 - Channel: {idx_channel_2}, MsgID: {idx_msgid_2}, MsgValue: {idx_msgvalue_2}, CycleTime: {idx_cycle_2}")
-
-            # 3행부터 데이터 읽기
-            for row in reader:
-                def safe_get(row, index):
-                    return row[index] if 0 <= index < len(row) else ''
-
-                # 첫 번째 세트 (송신용)
-                src_ch = safe_get(row, idx_channel_1)
-                snt_msg = safe_get(row, idx_msgvalue_1)
-                snt_msg_id = safe_get(row, idx_msgid_1)
-                snt_cycle_time = safe_get(row, idx_cycle_1)
-
-                # 두 번째 세트 (수신용 - 참고용)
-                dst_ch = safe_get(row, idx_channel_2)
-                rsv_msg = safe_get(row, idx_msgvalue_2)
-                rsv_msg_id = safe_get(row, idx_msgid_2)
-                rsv_cycle_time = safe_get(row, idx_cycle_2)
-
-                # 데이터 유효성 검사
-                if src_ch and snt_msg and snt_msg_id and snt_cycle_time:
-                    try:
-                        # src_ch 문자열을 파싱해서 포트 번호로 변환
-                        if src_ch.startswith('CANHS'):
-                            port_n = int(src_ch[5:])  # CANHS1 -> 1, CANHS8 -> 8
-                        elif src_ch.startswith('CANFD'):
-                            port_n = int(src_ch[5:]) + 8  # CANFD1 -> 9, CANFD8 -> 16
-                        elif src_ch.startswith('LIN'):
-                            port_n = int(src_ch[3:])  # CANFD1 -> 9, CANFD8 -> 16
-                        else:
-                            print(f"알 수 없는 채널 형식: {src_ch}")
-                            continue
-                        
-                        # dst_ch 문자열을 파싱해서 포트 번호로 변환
-                        if dst_ch.startswith('CANHS'):
-                            dst_port_n = int(dst_ch[5:])  # CANHS1 -> 1, CANHS8 -> 8
-                        elif dst_ch.startswith('CANFD'):
-                            dst_port_n = int(dst_ch[5:]) + 8  # CANFD1 -> 9, CANFD8 -> 16
-                        elif dst_ch.startswith('LIN'):
-                            dst_port_n = int(dst_ch[3:])  # CANFD1 -> 9, CANFD8 -> 16
-                        else:
-                            dst_port_n = 0  # 기본값
-                        
-                        can_id = int(snt_msg_id, 16) if snt_msg_id.startswith('0x') else int(snt_msg_id)
-                        cycle_time = float(snt_cycle_time) / 1000.0  # ms를 초로 변환
-                        
-                        # MsgValue를 바이트 데이터로 변환
-                        if snt_msg.startswith('0x'):
-                            # 16진수 문자열인 경우
-                            data = bytes.fromhex(snt_msg[2:])
-                        else:
-                            # 일반 문자열인 경우
-                            data = snt_msg.encode('utf-8')
-                        
-                        csv_data.append({
-                            'port_n': port_n,
-                            'can_id': can_id,
-                            'data': data,
-                            'cycle_time': cycle_time,
-                            'dst_port_n': dst_port_n,
-                            'row_data': {
-                                'src_ch': src_ch,
-                                'snt_msg': snt_msg,
-                                'snt_msg_id': snt_msg_id,
-                                'snt_cycle_time': snt_cycle_time,
-                                'dst_ch': dst_ch,
-                                'rsv_msg': rsv_msg,
-                                'rsv_msg_id': rsv_msg_id,
-                                'rsv_cycle_time': rsv_cycle_time
-                            }
-                        })
-                    except (ValueError, TypeError) as e:
-                        print(f"데이터 변환 오류 (행 {len(csv_data) + 3}): {e}")
-                        continue
+        target_csv = csv_path
+        print(f"대상 파일: {os.path.basename(target_csv)}")
+
+        # CSV 데이터 읽기 및 파싱
+        csv_data = load_csv_test_plan(target_csv)
 
         if not csv_data:
             print("유효한 CSV 데이터가 없습니다.")
@@ -168,26 +142,37 @@ def can_sender_app():
 
         print(f"\n총 {len(csv_data)}개의 유효한 데이터를 읽었습니다.")
 
+        # 송신 루프 밖에서 전체 계획을 미리 인코딩 (송신 시간 측정에 인코딩 비용이 섞이지 않도록)
+        compiled_plan = compile_test_plan(csv_data, TCC_IPC_CMD_AP_TEST)
+        plan_stats = compiled_plan.stats()
+        print(f"사전 인코딩 완료: {plan_stats['frames']}개 프레임, "
+              f"{plan_stats['compile_ms']:.3f}ms, 메모리 {plan_stats['nbytes'] / 1024:.1f}KB")
+
         # 메인 스레드에서 IPC 디바이스 열기
         print("IPC 디바이스 열기 시도...")
         try:
-            ipc_driver = AxonIPCDriver(AXON_IPC_CM1_FILE)
+            ipc_driver = AxonIPCDriver(device_path, full_duplex=True)
             if not ipc_driver.open_device():
                 print("IPC 디바이스 열기 실패")
                 return
             print("IPC 디바이스 열기 성공")
+            # 메일박스가 가득 차면(EAGAIN) 최대 100ms 까지 기다렸다가 재시도, 그래도 안 되면 드롭으로 집계
+            ipc_driver.configure_tx_queue(depth=256, policy=TX_POLICY_BLOCK, timeout=0.1)
+            if capture_path is not None:
+                ipc_driver.attach_capture(CaptureWriter(capture_path))
+                print(f"캡처 기록: {capture_path}")
         except Exception as e:
             print(f"IPC 디바이스 열기 오류: {e}")
             return
 
+        # 송수신 스레드 출력 (포맷/터미널 쓰기는 writer 스레드에서)
+        log = AsyncLogger(log_level)
+
         # 스레드 간 통신을 위한 변수들
         stop_event = threading.Event()
         received_count = 0
         received_lock = threading.Lock()
         send_completed = threading.Event()
-        
-        # IPC 디바이스 접근을 위한 락
-        ipc_lock = threading.Lock()
 
         test_start_ns = 0
         accumulated_cycle_time_sec = 0
@@ -202,8 +187,8 @@ def can_sender_app():
             """수신된 데이터를 CSV의 예상 데이터와 비교하여 검증"""
             try:
                 # 수신된 데이터에서 정보 추출
-                received_port = rx_frame_info['source_port']
-                received_can_id = rx_frame_info['can_id'] if not rx_frame_info['is_extended'] else rx_frame_info['ext_can_id']
+                received_port = rx_frame_info.source_port
+                received_can_id = rx_frame_info.can_id if not rx_frame_info.is_extended else rx_frame_info.ext_can_id
                 received_payload = received_data
                 
                 # 송신 데이터와 매칭되는 항목 찾기
@@ -279,243 +264,188 @@ def can_sender_app():
             """CAN 데이터 송신 스레드"""
             nonlocal stop_event, send_completed, test_start_ns, accumulated_cycle_time_sec, send_timestamps
             
-            print(f"[송신 스레드] 시작 - Thread ID: {threading.current_thread().ident}")
-            print("[송신 스레드] 데이터 전송을 시작합니다...")
+            log.summary("[송신 스레드] 시작 - Thread ID: %d", threading.current_thread().ident)
+            log.summary("[송신 스레드] 데이터 전송을 시작합니다...")
 
             try:
-                # 리눅스 시스템 콜을 위한 라이브러리 로드
-                libc = ctypes.CDLL(ctypes.util.find_library('c'))
-                CLOCK_MONOTONIC_RAW = 4
-
-                class timespec(ctypes.Structure):
-                    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
-
-                clock_gettime = libc.clock_gettime
-                clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
-                clock_gettime.restype = ctypes.c_int
-
                 firstflag = 0
 
                 # 데이터 전송
-                for idx, item in enumerate(csv_data, start=1):
+                total_frames = len(csv_data)
+                idx = 1
+                while idx <= total_frames:
                     if stop_event.is_set():
                         break
-                        
+
+                    burst_end = idx
                     try:
                         # 전송 시작 시간 측정
-                        send_start_ts = timespec()
-                        clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(send_start_ts))
+                        send_start_ns = now_ns()
 
                         if firstflag == 0:
                             firstflag = 1
-                            test_start_ns = send_start_ts.tv_sec * 1_000_000_000 + send_start_ts.tv_nsec
+                            test_start_ns = send_start_ns
+
+                        # 송신 예정 시각이 이미 지난 다음 프레임들은 같은 tick 으로 묶어서 한 번에 전송
+                        now_sec = (send_start_ns - test_start_ns) / 1e9
+                        due_sec = accumulated_cycle_time_sec + csv_data[idx - 1]['cycle_time']
+                        while burst_end < total_frames and due_sec <= now_sec:
+                            due_sec += csv_data[burst_end]['cycle_time']
+                            burst_end += 1
 
-                        # LPA 패킷 생성 (CAN 헤더 포함)
-                        packet = make_lpa_packet_with_can_header(
-                            item['data'], 
-                            item['can_id'], 
-                            False, 
-                            TCC_IPC_CMD_AP_TEST, 
-                            item['port_n']
-                        )
+                        # 미리 인코딩된 LPA 패킷 (CAN 헤더 포함)
+                        frames = [compiled_plan.frame(i - 1) for i in range(idx, burst_end + 1)]
 
-                        # IPC 디바이스에 안전하게 패킷 전송
-                        with ipc_lock:
-                            bytes_written = ipc_driver.write_data(packet)
+                        # 송신 큐를 통해 전송 (묶음이면 writev 1회, EAGAIN 이면 POLLOUT 대기 후 재시도)
+                        # full-duplex 드라이버라 수신 스레드의 read 와 서로 막지 않음
+                        accepted = ipc_driver.send_many(frames)
 
                         # 전송 종료 시간 측정
-                        send_end_ts = timespec()
-                        clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(send_end_ts))
+                        send_end_ns = now_ns()
 
-                        # 전송 시간 계산
-                        send_start_ns = send_start_ts.tv_sec * 1_000_000_000 + send_start_ts.tv_nsec
-                        send_end_ns = send_end_ts.tv_sec * 1_000_000_000 + send_end_ts.tv_nsec
-                        send_time_ns = send_end_ns - send_start_ns
+                        # 전송 시간 계산 (시계 읽기 비용 제외)
+                        send_time_ns = elapsed_ns(send_start_ns, send_end_ns)
                         send_time_ms = send_time_ns / 1_000_000
                         relative_time_ms = (send_start_ns - test_start_ns) / 1_000_000
-                        
-                        # 송신 시간 기록 (검증용)
-                        with send_timestamps_lock:
-                            send_timestamps[idx] = {
-                                'send_time_ns': send_end_ns,
-                                'can_id': item['can_id'],
-                                'port': item['port_n'],
-                                'data': item['data'],
-                                'expected_dst_port': item['dst_port_n'],
-                                'expected_data': item['row_data']['rsv_msg'],
-                                'expected_msg_id': item['row_data']['rsv_msg_id'],
-                                'expected_cycle_time': item['row_data']['rsv_cycle_time']
-                            }
-
-                        accumulated_cycle_time_sec += item['cycle_time']
-                        sleep_time = accumulated_cycle_time_sec - (send_time_ms + relative_time_ms)/1000.0
-
-                        print(f"[송신 스레드] [{idx:04d}/{len(csv_data)}] 전송 완료 | "
-                              f"Port: {item['port_n']}, CAN ID: 0x{item['can_id']:X}, "
-                              f"Data: {item['data'].hex()}, "
-                              f"전송시간: {send_time_ms:.3f}ms, "
-                              f"대기시간: {item['cycle_time']:.3f}초,"
-                              f"상대시간: {relative_time_ms:.3f}ms"
-                              f"누적시간: {accumulated_cycle_time_sec:.3f}ms"
-                              f"대기시간: {(send_time_ms + relative_time_ms)/1000:.3f}초"
-                            f"sleep_time: {sleep_time:.3f}초"
-                              )
-
-                        # CycleTime만큼 대기
+
+                        for frame_idx in range(idx, burst_end + 1):
+                            item = csv_data[frame_idx - 1]
+
+                            # 송신 시간 기록 (검증용)
+                            with send_timestamps_lock:
+                                send_timestamps[frame_idx] = {
+                                    'send_time_ns': send_end_ns,
+                                    'can_id': item['can_id'],
+                                    'port': item['port_n'],
+                                    'data': item['data'],
+                                    'expected_dst_port': item['dst_port_n'],
+                                    'expected_data': item['row_data']['rsv_msg'],
+                                    'expected_msg_id': item['row_data']['rsv_msg_id'],
+                                    'expected_cycle_time': item['row_data']['rsv_cycle_time']
+                                }
+
+                            accumulated_cycle_time_sec += item['cycle_time']
+                            sleep_time = accumulated_cycle_time_sec - (send_time_ms + relative_time_ms)/1000.0
+
+                            log.frame(_format_tx_frame, frame_idx, total_frames, item, send_time_ms,
+                                      relative_time_ms, accumulated_cycle_time_sec, sleep_time)
+
+                        if accepted != len(frames):
+                            log.failure("  ⚠ 송신 큐에서 버린 프레임: %d/%d개 (호스트 쪽 손실)",
+                                        len(frames) - accepted, len(frames))
+
+                        # CycleTime만큼 대기 (이미 늦었으면 대기 없이 다음 프레임)
                         # time.sleep(item['cycle_time'])
-                        time.sleep(sleep_time)
+                        if sleep_time > 0:
+                            time.sleep(sleep_time)
 
                     except Exception as e:
-                        print(f"[송신 스레드] [{idx:04d}/{len(csv_data)}] 전송 오류: {e}")
-                        continue
-
-                print(f"[송신 스레드] 전송 완료! 총 {len(csv_data)}개 패킷 전송")
+                        log.failure("[송신 스레드] [%04d/%d] 전송 오류: %s", idx, total_frames, e)
+
+                    idx = burst_end + 1
+
+                if not ipc_driver.flush_tx(1.0):
+                    log.failure("[송신 스레드] ⚠ 송신 큐를 모두 비우지 못했습니다")
+                log.summary("[송신 스레드] 전송 완료! 총 %d개 패킷 전송", len(csv_data))
+                tx_stats = ipc_driver.tx_stats()
+                if tx_stats.get('enqueued'):
+                    dropped = (tx_stats['dropped_oldest'] + tx_stats['dropped_newest'] + tx_stats['dropped_timeout'] +
+                               tx_stats['dropped_error'])
+                    log.summary(f"[송신 스레드] 송신 큐: {tx_stats['sent']}/{tx_stats['enqueued']}개 전송 "
+                                f"(writev {tx_stats['write_syscalls']}회), EAGAIN 재시도 {tx_stats['retries']}회, "
+                                f"호스트 쪽 드롭 {dropped}개, 최대 큐 {tx_stats['high_watermark']}/{tx_stats['depth']}, "
+                                f"큐 지연 평균 {tx_stats['queue_delay_avg_us']:.1f}us / "
+                                f"최대 {tx_stats['queue_delay_max_us']:.1f}us")
                 send_completed.set()
 
             except Exception as e:
-                print(f"[송신 스레드] 오류: {e}")
+                log.failure("[송신 스레드] 오류: %s", e)
 
         def receiver_thread():
             """CAN 데이터 수신 스레드"""
             nonlocal stop_event, received_count, received_lock, send_completed, test_start_ns, validation_results, send_timestamps
             
-            print(f"[수신 스레드] 시작 - Thread ID: {threading.current_thread().ident}")
-            print("[수신 스레드] 수신 대기 시작...")
+            log.summary("[수신 스레드] 시작 - Thread ID: %d", threading.current_thread().ident)
+            log.summary("[수신 스레드] 수신 대기 시작...")
 
             try:
-                # 리눅스 시스템 콜을 위한 라이브러리 로드
-                libc = ctypes.CDLL(ctypes.util.find_library('c'))
-                CLOCK_MONOTONIC_RAW = 4
-
-                class timespec(ctypes.Structure):
-                    _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
-
-                clock_gettime = libc.clock_gettime
-                clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
-                clock_gettime.restype = ctypes.c_int
-
                 # 시작 시간 측정
-                start_ts = timespec()
-                clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(start_ts))
-                start_ns = start_ts.tv_sec * 1_000_000_000 + start_ts.tv_nsec
+                start_ns = now_ns()
+
+                # 여러 read 에 걸쳐 들어오는 IPC 스트림을 패킷 단위로 재조립
+                rx_framer = IpcFramer()
 
                 while not stop_event.is_set():
+                    # 데이터가 들어올 때까지 커널에서 대기 (stop_event 확인을 위해 최대 100ms, 수신시간에서 제외)
+                    if not ipc_driver.wait_readable(0.1):
+                        continue
+
                     # 수신 시작 시간 측정
-                    recv_start_ts = timespec()
-                    clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(recv_start_ts))
+                    recv_start_ns = now_ns()
 
-                    # IPC 디바이스에서 안전하게 데이터 수신
-                    data = None
-                    with ipc_lock:
-                        data = ipc_driver.read_data()
+                    # IPC 디바이스에서 데이터 수신 (송신 경로와 별도 락, read 마다 출력하는 read_data 대신 recv)
+                    data = ipc_driver.recv(0)
 
                     # 수신 종료 시간 측정
-                    recv_end_ts = timespec()
-                    clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(recv_end_ts))
+                    recv_end_ns = now_ns()
 
                     if data:
-                        with received_lock:
-                            received_count += 1
-                            current_count = received_count
-
-                        # 수신 시간 계산
-                        recv_start_ns = recv_start_ts.tv_sec * 1_000_000_000 + recv_start_ts.tv_nsec
-                        recv_end_ns = recv_end_ts.tv_sec * 1_000_000_000 + recv_end_ts.tv_nsec
-                        recv_time_ns = recv_end_ns - recv_start_ns
-                        recv_time_ms = recv_time_ns / 1_000_000
-
-                        # 전체 경과 시간
-                        current_ns = recv_end_ts.tv_sec * 1_000_000_000 + recv_end_ts.tv_nsec
-                        total_elapsed_ns = current_ns - start_ns
-                        total_elapsed_ms = total_elapsed_ns / 1_000_000
-
-                        relative_time_ms = (recv_end_ns - test_start_ns) / 1_000_000
-
-                        # LPA 패킷 파싱 시도
-                        parsed = parse_lpa_packet_with_can_header(data)
-                        if parsed['valid']:
-                            # 수신 프레임 헤더 파싱 (15바이트)
-                            rx_frame_info = parse_can_header(parsed['can_header'])
+                        # read 경계와 무관하게 완성된 IPC 패킷 단위로 처리
+                        for packet in rx_framer.feed(data):
+                            with received_lock:
+                                received_count += 1
+                                current_count = received_count
+
+                            # 수신 시간 계산 (시계 읽기 비용 제외)
+                            recv_time_ns = elapsed_ns(recv_start_ns, recv_end_ns)
+                            recv_time_ms = recv_time_ns / 1_000_000
+
+                            # 전체 경과 시간
+                            total_elapsed_ns = recv_end_ns - start_ns
+                            total_elapsed_ms = total_elapsed_ns / 1_000_000
+
+                            relative_time_ms = (recv_end_ns - test_start_ns) / 1_000_000
+
+                            # LPA 패킷 파싱 시도
+                            parsed = parse_lpa_packet_with_can_header(packet)
+                            if parsed.valid:
+                                # 수신 프레임 헤더 파싱 (15바이트)
+                                rx_frame_info = parse_can_header(parsed.can_header)
                             
-                            # 데이터 검증 수행
-                            validation_result = validate_received_data(parsed['payload'], rx_frame_info, recv_end_ns)
+                                # 데이터 검증 수행
+                                validation_result = validate_received_data(parsed.payload, rx_frame_info, recv_end_ns)
                             
-                            # 검증 결과 저장
-                            with validation_lock:
-                                validation_results.append(validation_result)
+                                # 검증 결과 저장
+                                with validation_lock:
+                                    validation_results.append(validation_result)
                             
-                            print(f"[수신 스레드] 패킷 {current_count:3d}: {len(data)}바이트 | "
-                                  f"수신시간: {recv_time_ms:.3f}ms | "
-                                  f"총경과: {total_elapsed_ms:.3f}ms | "
-                                  f"수신타임스탬프: {recv_end_ts.tv_sec:10d}.{recv_end_ts.tv_nsec:09d} | "
-                                  f"상대시간: {relative_time_ms:.3f}ms")
-                            print(f"  ✓ LPA 패킷 파싱 성공!")
-                            print(f"  CMD: 0x{parsed['cmd']:04x}, Port: {parsed['port']}")
-                            print(f"  CRC: 0x{parsed['crc']:04x} ({'유효' if parsed['crc_valid'] else '무효'})")
-                            print(f"  --- 수신 프레임 정보 ---")
-                            print(f"  프레임 타입: {rx_frame_info['frame_type']}")
-                            print(f"  소스 포트: {rx_frame_info['source_port']}")
-                            print(f"  타임스탬프 (ns): {rx_frame_info['timestamp_ns']}")
-                            print(f"  타임스탬프 (us): {rx_frame_info['timestamp_us_h']:08x}{rx_frame_info['timestamp_us_l']:08x}")
-                            print(f"  프로토콜 타입: {rx_frame_info['protocol_type']}")
-                            if rx_frame_info['is_extended']:
-                                print(f"  Extended CAN ID: 0x{rx_frame_info['ext_can_id']:08X}")
+                                # 검증 실패는 LOG_FAILURE, 성공은 LOG_FRAME 에서만 포맷/출력
+                                log.log(LOG_FRAME if validation_result['valid'] else LOG_FAILURE,
+                                        _format_rx_packet, current_count, packet, recv_time_ms, total_elapsed_ms,
+                                        recv_end_ns, relative_time_ms, parsed, rx_frame_info, validation_result)
                             else:
-                                print(f"  Standard CAN ID: 0x{rx_frame_info['can_id']:03X}")
-                            print(f"  LIN ID: {rx_frame_info['lin_id']}")
-                            print(f"  CAN FD: {rx_frame_info['is_fd']}, RTR: {rx_frame_info['is_remote']}")
-                            print(f"  --- 진짜 Payload ---")
-                            print(f"  실제 CAN 데이터: {parsed['payload'].hex()}")
-                            print(f"  Payload 길이: {len(parsed['payload'])}바이트")
-                            print(f"  전체 데이터: {data.hex()}")
-                            
-                            # 검증 결과 출력
-                            print(f"  --- 데이터 검증 결과 ---")
-                            if validation_result['valid']:
-                                print(f"  ✅ 검증 성공!")
-                                print(f"  송신 인덱스: {validation_result['send_index']}")
-                                print(f"  지연 시간: {validation_result['delay_ms']:.3f}ms")
-                                print(f"  예상 포트: {validation_result['expected_port']} ✓")
-                                print(f"  예상 CAN ID: {validation_result['expected_can_id']} ✓")
-                                print(f"  예상 데이터: {validation_result['expected_payload']} ✓")
-                                print(f"  예상 메시지 ID: {validation_result['expected_msg_id']}")
-                                print(f"  예상 주기: {validation_result['expected_cycle_time']}ms")
-                            else:
-                                print(f"  ❌ 검증 실패!")
-                                if 'reason' in validation_result:
-                                    print(f"  실패 이유: {validation_result['reason']}")
-                                else:
-                                    print(f"  포트 매칭: {'✓' if validation_result.get('port_match', False) else '✗'}")
-                                    print(f"  CAN ID 매칭: {'✓' if validation_result.get('can_id_match', False) else '✗'}")
-                                    print(f"  데이터 매칭: {'✓' if validation_result.get('data_match', False) else '✗'}")
-                                    print(f"  수신 포트: {validation_result.get('received_port', 'unknown')}")
-                                    print(f"  예상 포트: {validation_result.get('expected_port', 'unknown')}")
-                                    print(f"  수신 CAN ID: {validation_result.get('received_can_id', 'unknown')}")
-                                    print(f"  예상 CAN ID: {validation_result.get('expected_can_id', 'unknown')}")
-                                    print(f"  수신 데이터: {validation_result.get('received_payload', 'unknown')}")
-                                    print(f"  예상 데이터: {validation_result.get('expected_payload', 'unknown')}")
-                                    if 'delay_ms' in validation_result:
-                                        print(f"  지연 시간: {validation_result['delay_ms']:.3f}ms")
-                        else:
-                            # 파싱 실패 시 기존 방식으로 출력
-                            print(f"[수신 스레드] 패킷 {current_count:3d}: {len(data)}바이트 | "
-                                  f"수신시간: {recv_time_ms:.3f}ms | "
-                                  f"총경과: {total_elapsed_ms:.3f}ms | "
-                                  f"수신타임스탬프: {recv_end_ts.tv_sec:10d}.{recv_end_ts.tv_nsec:09d} | "
-                                  f"데이터: {data.hex()} | "
-                                  f"상대시간: {relative_time_ms:.3f}ms")
-                            print(f"  ⚠ LPA 패킷 파싱 실패 - 일반 데이터로 처리")
-                    else:
-                        # 데이터가 없으면 잠시 대기
-                        time.sleep(0.001)
-
-                print(f"[수신 스레드] 수신 완료 - 총 {received_count}개 패킷 수신")
+                                # 파싱 실패 시 기존 방식으로 출력
+                                log.failure("[수신 스레드] 패킷 %3d: %d바이트 | 수신시간: %.3fms | 총경과: %.3fms | "
+                                            "수신타임스탬프: %s | 데이터: %s | 상대시간: %.3fms\n"
+                                            "  ⚠ LPA 패킷 파싱 실패 - 일반 데이터로 처리",
+                                            current_count, len(packet), recv_time_ms, total_elapsed_ms,
+                                            format_ns(recv_end_ns), bytes(packet).hex(), relative_time_ms)
+
+                log.summary("[수신 스레드] 수신 완료 - 총 %d개 패킷 수신", received_count)
+                framer_stats = rx_framer.stats()
+                log.summary("[수신 스레드] 프레이머: 재동기화 %d회, CRC 오류 %d개, 버린 바이트 %d개",
+                            framer_stats['resyncs'], framer_stats['crc_errors'], framer_stats['discarded_bytes'])
 
             except Exception as e:
-                print(f"[수신 스레드] 오류: {e}")
+                log.failure("[수신 스레드] 오류: %s", e)
+
+        # 송수신 시간에서 뺄 시계 읽기 비용 측정 (스레드 시작 전에 한 번)
+        clock = calibrate()
+        print(f"시계 보정: 읽기 비용 {clock.overhead_ns}ns, 해상도 {clock.resolution_ns}ns")
 
         # 스레드 생성 및 시작
         print("멀티스레딩 시작...")
+        log.start()
         
         # 수신 스레드 먼저 시작 (송신보다 먼저 대기)
         receiver = threading.Thread(target=receiver_thread)
@@ -526,13 +456,13 @@ def can_sender_app():
         sender = threading.Thread(target=sender_thread)
         sender.start()
         
-        print("스레드 실행 중...")
+        log.summary("스레드 실행 중...")
         
         # 송신 스레드 완료 대기
         sender.join()
         
-        print("송신 완료. 수신 스레드는 계속 실행 중...")
-        print("프로그램을 종료하려면 Ctrl+C를 누르세요.")
+        log.summary("송신 완료. 수신 스레드는 계속 실행 중...")
+        log.summary("프로그램을 종료하려면 Ctrl+C를 누르세요.")
         
         # 수신 스레드는 계속 실행 (Ctrl+C로 종료)
         try:
@@ -543,6 +473,12 @@ def can_sender_app():
             stop_event.set()
             receiver.join(timeout=2)
             
+            # 남은 송수신 로그를 모두 출력한 뒤 통계 출력
+            log.close()
+            log_stats = log.stats()
+            if log_stats['dropped']:
+                print(f"⚠ 로그 큐가 가득 차서 버린 로그: {log_stats['dropped']}개")
+            
             # 검증 통계 출력
             print(f"\n=== 데이터 검증 통계 ===")
             with validation_lock:
@@ -566,7 +502,7 @@ def can_sender_app():
                         print(f"  최대: {max_delay:.3f}ms")
                 
                 # 실패한 검증 상세 정보
-                if failed_validations > 0:
+                if failed_validations > 0 and log_level >= LOG_FAILURE:
                     print(f"\n=== 검증 실패 상세 정보 ===")
                     for i, result in enumerate(validation_results):
                         if not result['valid']:
@@ -579,7 +515,26 @@ def can_sender_app():
                                 print(f"  데이터: {result.get('received_payload', 'unknown')} vs {result.get('expected_payload', 'unknown')}")
             
             print(f"멀티스레딩 애플리케이션 완료! 전송: {len(csv_data)}개, 수신: {received_count}개")
+
+            driver_stats = ipc_driver.stats()
+            print(f"드라이버 송신: {driver_stats['tx_frames']}개 프레임 / {driver_stats['tx_bytes']}바이트, "
+                  f"write {driver_stats['tx_syscalls']}회 (p99 {driver_stats['write_latency']['p99_ns'] / 1000:.1f}us), "
+                  f"EAGAIN {driver_stats['tx_eagain']}회, 오류 {driver_stats['tx_errors']}회")
+            print(f"드라이버 수신: {driver_stats['rx_bytes']}바이트, "
+                  f"read {driver_stats['rx_syscalls']}회 (p99 {driver_stats['read_latency']['p99_ns'] / 1000:.1f}us), "
+                  f"EAGAIN {driver_stats['rx_eagain']}회, 빈 poll {driver_stats['rx_empty_polls']}회, "
+                  f"재연결 {driver_stats['reopens']}회")
         finally:
+            log.close()
+            
+            capture = ipc_driver.capture
+            if capture is not None:
+                ipc_driver.attach_capture(None)
+                capture.close()
+                capture_stats = capture.stats()
+                print(f"캡처 저장: {capture_stats['path']} ({capture_stats['records']}개 레코드, "
+                      f"{capture_stats['file_bytes']}바이트, 버림 {capture_stats['dropped']}개)")
+            
             # IPC 디바이스 정리
             try:
                 if ipc_driver and ipc_driver.is_open:
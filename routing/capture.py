@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IPC 송수신 캡처 (바이너리 기록 파일)
+
+CaptureWriter 는 미리 늘려 둔 파일을 mmap 하여 레코드 헤더 pack_into + 데이터 복사만으로 기록하고
+(텍스트 로그/hex 변환 없음), 백그라운드 스레드가 주기적으로 msync 한다.
+CaptureReader 는 파일을 읽기 전용 mmap 으로 열어 레코드 데이터를 복사 없이 memoryview 로 돌려준다.
+
+파일 구조 (little-endian):
+    파일 헤더 (32바이트): magic 'AXONCAP\\0', version, 레코드 헤더 크기, 시계 ID,
+                          시작 시각 (now_ns), 시작 시각 (time.time_ns)
+    레코드 (16바이트 헤더 + 데이터): 타임스탬프 (now_ns), 데이터 길이, 방향, 디바이스 ID, 플래그
+
+레코드는 데이터를 먼저 쓰고 헤더를 나중에 쓰므로, 프로세스가 비정상 종료되어도
+헤더가 있는 레코드까지는 읽을 수 있다 (뒤쪽은 0 으로 채워진 미사용 영역).
+"""
+
+import os
+import sys
+import mmap
+import time
+import struct
+import argparse
+import itertools
+import threading
+from typing import Optional
+from constants import AXON_IPC_DEVICE_FILES
+from timing import CLOCK_ID, now_ns, format_ns
+
+CAPTURE_MAGIC = b'AXONCAP\0'
+CAPTURE_VERSION = 1
+
+CAPTURE_FILE_HEADER = struct.Struct('<8sHHIqq')
+CAPTURE_FILE_HEADER_SIZE = CAPTURE_FILE_HEADER.size
+CAPTURE_RECORD_HEADER = struct.Struct('<qIBBH')
+CAPTURE_RECORD_HEADER_SIZE = CAPTURE_RECORD_HEADER.size
+
+# record() 에서 쓰는 전역 이름 (속성 조회 줄이기)
+_RECORD_HEADER_SIZE = CAPTURE_RECORD_HEADER_SIZE
+_pack_record_header = CAPTURE_RECORD_HEADER.pack_into
+_clock_gettime_ns = time.clock_gettime_ns
+
+# 레코드 방향
+CAPTURE_TX = 0
+CAPTURE_RX = 1
+CAPTURE_DIRECTION_NAMES = {CAPTURE_TX: 'tx', CAPTURE_RX: 'rx'}
+
+# 레코드 플래그
+CAPTURE_FLAG_CHUNK = 0x0001  # read() 한 번에 받은 바이트 그대로 (패킷 경계와 다를 수 있음)
+
+# 디바이스 ID (AXON_IPC_DEVICE_FILES 순서, 그 외 경로는 CAPTURE_DEVICE_UNKNOWN)
+CAPTURE_DEVICE_IDS = {path: index for index, path in enumerate(AXON_IPC_DEVICE_FILES.values())}
+CAPTURE_DEVICE_UNKNOWN = 0xFF
+
+
+def capture_device_id(device_path: str) -> int:
+    """디바이스 경로의 캡처 디바이스 ID (알 수 없는 경로는 CAPTURE_DEVICE_UNKNOWN)"""
+    return CAPTURE_DEVICE_IDS.get(device_path, CAPTURE_DEVICE_UNKNOWN)
+
+
+class CaptureWriter:
+    """
+    mmap 기반 캡처 기록기
+
+    record() 는 락 안에서 pack_into 와 슬라이스 복사만 한다 (송신/수신 스레드에서 동시에 호출 가능).
+    미리 늘려 둔 크기를 넘으면 grow_size 만큼 파일과 mmap 을 늘리고, 늘릴 수 없으면 dropped 로 집계한다.
+    """
+
+    def __init__(self, path: str, capacity: int = 64 * 1024 * 1024, grow_size: Optional[int] = None,
+                 flush_interval: float = 1.0):
+        """
+        초기화 (파일 생성 및 mmap)
+
+        Args:
+            path: 캡처 파일 경로 (있으면 덮어씀)
+            capacity: 처음 확보할 파일 크기 (바이트)
+            grow_size: 가득 찼을 때 늘릴 크기 (None 이면 capacity, 0 이면 늘리지 않고 버림)
+            flush_interval: 백그라운드 msync 간격 (초, 0 이면 close/flush 에서만)
+        """
+        self.path = path
+        self.grow_size = capacity if grow_size is None else grow_size
+        self.flush_interval = flush_interval
+        self.start_ns = now_ns()
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        capacity = max(capacity, CAPTURE_FILE_HEADER_SIZE + CAPTURE_RECORD_HEADER_SIZE)
+        os.ftruncate(self._fd, capacity)
+        self._map = mmap.mmap(self._fd, capacity)
+        self._capacity = capacity
+        CAPTURE_FILE_HEADER.pack_into(self._map, 0, CAPTURE_MAGIC, CAPTURE_VERSION, CAPTURE_RECORD_HEADER_SIZE,
+                                      CLOCK_ID, self.start_ns, time.time_ns())
+        self._offset = CAPTURE_FILE_HEADER_SIZE
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # msync 중 mmap 확장/닫기 방지 (record 는 확장할 때만 잡음)
+
+        self.records = 0
+        self.dropped = 0
+        self.grows = 0
+        self.flushes = 0
+
+        self._stop = threading.Event()
+        self._flusher = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(target=self._run_flusher, name='CaptureWriter', daemon=True)
+            self._flusher.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._map is None
+
+    def record(self, direction: int, device_id: int, data, timestamp_ns: Optional[int] = None,
+               flags: int = 0) -> bool:
+        """
+        레코드 하나 기록
+
+        Args:
+            direction: CAPTURE_TX / CAPTURE_RX
+            device_id: 디바이스 ID (capture_device_id)
+            data: bytes-like 원본 데이터
+            timestamp_ns: 타임스탬프 (None 이면 지금, now_ns 기준)
+            flags: 레코드 플래그 (CAPTURE_FLAG_*)
+
+        Returns:
+            bool: 기록했으면 True (닫혔거나 공간이 없어 버렸으면 False)
+        """
+        if timestamp_ns is None:
+            timestamp_ns = _clock_gettime_ns(CLOCK_ID)
+        size = len(data)
+        with self._lock:
+            offset = self._offset
+            end = offset + _RECORD_HEADER_SIZE + size
+            # 닫힌 뒤에는 _capacity 가 0 이므로 여기서 걸러짐
+            if end > self._capacity and not self._grow_locked(end):
+                self.dropped += 1
+                return False
+            buf = self._map
+            # 데이터를 먼저 쓰고 헤더를 나중에 써서, 헤더가 보이는 레코드는 항상 완전하도록
+            buf[offset + _RECORD_HEADER_SIZE:end] = data
+            _pack_record_header(buf, offset, timestamp_ns, size, direction, device_id, flags)
+            self._offset = end
+            self.records += 1
+        return True
+
+    def _grow_locked(self, needed: int) -> bool:
+        if not self.grow_size or self._map is None:
+            return False
+        capacity = self._capacity
+        while capacity < needed:
+            capacity += self.grow_size
+        try:
+            with self._flush_lock:
+                os.ftruncate(self._fd, capacity)
+                self._map.resize(capacity)
+        except (OSError, SystemError, ValueError) as e:
+            print(f"캡처 파일 확장 실패: {e}")
+            self.grow_size = 0
+            return False
+        self._capacity = capacity
+        self.grows += 1
+        return True
+
+    def flush(self) -> None:
+        """지금까지 기록한 영역을 디스크에 반영 (msync, record() 와 같은 락을 잡지 않음)"""
+        with self._flush_lock:
+            if self._map is not None:
+                self._map.flush(0, self._offset)
+                self.flushes += 1
+
+    def _run_flusher(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """백그라운드 msync 종료, 사용한 크기로 파일을 줄이고 닫기"""
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        with self._lock, self._flush_lock:
+            if self._map is None:
+                return
+            self._map.flush()
+            self._map.close()
+            self._map = None
+            self._capacity = 0
+            os.ftruncate(self._fd, self._offset)
+            os.close(self._fd)
+            self._fd = None
+
+    def stats(self) -> dict:
+        """기록 카운터 (dropped 가 0 이 아니면 공간이 없어 버린 레코드)"""
+        return {
+            'path': self.path,
+            'records': self.records,
+            'bytes': self._offset - CAPTURE_FILE_HEADER_SIZE - self.records * CAPTURE_RECORD_HEADER_SIZE,
+            'file_bytes': self._offset,
+            'capacity': self._capacity,
+            'dropped': self.dropped,
+            'grows': self.grows,
+            'flushes': self.flushes,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class CaptureRecord:
+    """캡처 레코드 하나 (data 는 CaptureReader 의 mmap 을 가리키는 memoryview)"""
+
+    __slots__ = ('timestamp_ns', 'direction', 'device_id', 'flags', 'data')
+
+    def __init__(self, timestamp_ns: int, direction: int, device_id: int, flags: int, data: memoryview):
+        self.timestamp_ns = timestamp_ns
+        self.direction = direction
+        self.device_id = device_id
+        self.flags = flags
+        self.data = data
+
+    def __repr__(self) -> str:
+        return (f"CaptureRecord(timestamp_ns={self.timestamp_ns}, "
+                f"direction={CAPTURE_DIRECTION_NAMES.get(self.direction, self.direction)}, "
+                f"device_id={self.device_id}, flags=0x{self.flags:04X}, length={len(self.data)})")
+
+
+class CaptureReader:
+    """
+    캡처 파일 읽기 (읽기 전용 mmap, 레코드 데이터는 복사 없이 memoryview)
+
+    close() 전에 레코드의 data(memoryview) 를 모두 놓아야 한다 (남아 있으면 mmap 을 닫을 수 없음).
+    """
+
+    def __init__(self, path: str):
+        """
+        초기화 (파일 열기 및 헤더 확인)
+
+        Args:
+            path: 캡처 파일 경로
+
+        Raises:
+            ValueError: 캡처 파일 형식이 아닌 경우
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < CAPTURE_FILE_HEADER_SIZE:
+                raise ValueError(f"캡처 파일이 아닙니다 (크기 {size}바이트): {path}")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        (magic, self.version, self.record_header_size, self.clock_id,
+         self.start_ns, self.start_wall_ns) = CAPTURE_FILE_HEADER.unpack_from(self._map, 0)
+        if magic != CAPTURE_MAGIC or self.record_header_size != CAPTURE_RECORD_HEADER_SIZE:
+            self.close()
+            raise ValueError(f"캡처 파일이 아닙니다: {path}")
+
+    def __iter__(self):
+        return self.records()
+
+    def records(self, direction: Optional[int] = None, device_id: Optional[int] = None):
+        """
+        레코드 순회
+
+        Args:
+            direction: CAPTURE_TX / CAPTURE_RX 만 (None 이면 모두)
+            device_id: 해당 디바이스만 (None 이면 모두)
+
+        Yields:
+            CaptureRecord: 기록 순서대로
+        """
+        buf = self._map
+        view = self._view
+        unpack_from = CAPTURE_RECORD_HEADER.unpack_from
+        size = len(buf)
+        offset = CAPTURE_FILE_HEADER_SIZE
+        while offset + CAPTURE_RECORD_HEADER_SIZE <= size:
+            timestamp_ns, length, record_direction, record_device, flags = unpack_from(buf, offset)
+            start = offset + CAPTURE_RECORD_HEADER_SIZE
+            end = start + length
+            if timestamp_ns == 0 or end > size:
+                # 미사용(0) 영역 또는 기록 도중 끊긴 레코드
+                break
+            offset = end
+            if direction is not None and record_direction != direction:
+                continue
+            if device_id is not None and record_device != device_id:
+                continue
+            yield CaptureRecord(timestamp_ns, record_direction, record_device, flags, view[start:end])
+
+    def frames(self, direction: int = CAPTURE_TX, device_id: Optional[int] = None):
+        """
+        (타임스탬프, 데이터) 순회 (replay 입력용)
+
+        Yields:
+            tuple: (timestamp_ns, memoryview)
+        """
+        for record in self.records(direction, device_id):
+            yield record.timestamp_ns, record.data
+
+    def stats(self) -> dict:
+        """방향/디바이스별 레코드 수와 바이트 수, 기록 구간"""
+        counts = {}
+        first_ns = last_ns = None
+        for record in self.records():
+            key = (CAPTURE_DIRECTION_NAMES.get(record.direction, str(record.direction)), record.device_id)
+            entry = counts.setdefault(key, [0, 0])
+            entry[0] += 1
+            entry[1] += len(record.data)
+            if first_ns is None:
+                first_ns = record.timestamp_ns
+            last_ns = record.timestamp_ns
+        return {
+            'path': self.path,
+            'records': sum(entry[0] for entry in counts.values()),
+            'bytes': sum(entry[1] for entry in counts.values()),
+            'duration_ms': (last_ns - first_ns) / 1e6 if first_ns is not None else 0.0,
+            'streams': [{'direction': direction, 'device_id': device, 'records': entry[0], 'bytes': entry[1]}
+                        for (direction, device), entry in sorted(counts.items())],
+        }
+
+    def close(self) -> None:
+        """mmap 닫기"""
+        if self._map is not None:
+            self._view.release()
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AXON IPC 캡처 파일 보기")
+    parser.add_argument('path', help="캡처 파일 경로")
+    parser.add_argument('--direction', choices=list(CAPTURE_DIRECTION_NAMES.values()), default=None,
+                        help="한 방향만 출력")
+    parser.add_argument('--limit', type=int, default=50, help="출력할 최대 레코드 수 (0 이면 요약만)")
+    args = parser.parse_args()
+
+    direction = None
+    if args.direction is not None:
+        direction = next(key for key, name in CAPTURE_DIRECTION_NAMES.items() if name == args.direction)
+
+    try:
+        reader = CaptureReader(args.path)
+    except (OSError, ValueError) as e:
+        print(f"캡처 파일 열기 실패: {e}")
+        sys.exit(1)
+
+    with reader:
+        stats = reader.stats()
+        print(f"캡처: {stats['path']} | 레코드 {stats['records']}개, {stats['bytes']}바이트, "
+              f"{stats['duration_ms']:.3f}ms")
+        for stream in stats['streams']:
+            print(f"  {stream['direction']} device {stream['device_id']}: "
+                  f"{stream['records']}개, {stream['bytes']}바이트")
+
+        for record in itertools.islice(reader.records(direction), args.limit):
+            print(f"{format_ns(record.timestamp_ns)} {CAPTURE_DIRECTION_NAMES.get(record.direction, '?')} "
+                  f"dev {record.device_id} {'chunk ' if record.flags & CAPTURE_FLAG_CHUNK else ''}"
+                  f"{len(record.data):4d}B {record.data.hex()}")
+            del record
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,17 @@ AXON_IPC_CM1_FILE = "/dev/axon_ipc_cm1"
 AXON_IPC_CM2_FILE = "/dev/axon_ipc_cm2"
 AXON_IPC_CMN_FILE = "/dev/axon_ipc_cmn"
 
+# 디바이스 이름별 경로 (IPCReactor.add_device 에서 사용)
+AXON_IPC_DEVICE_FILES = {
+    'cm0': AXON_IPC_CM0_FILE,
+    'cm1': AXON_IPC_CM1_FILE,
+    'cm2': AXON_IPC_CM2_FILE,
+    'cmn': AXON_IPC_CMN_FILE,
+}
+
 # IPC 명령어 상수 (C 코드에서 정의된 값들)
 TCC_IPC_CMD_AP_TEST = 0x01
 TCC_IPC_CMD_AP_SEND = 0x0fff
+
+# IPC 패킷 최대 크기 (C 코드의 readBuf/writeBuf 크기)
+IPC_MAX_PACKET_SIZE = 512
@@ -2,58 +2,198 @@
 # -*- coding: utf-8 -*-
 """
 CRC 계산 유틸리티 (C 코드의 IPC_CalcCrc16 함수와 동일)
+
+IPC_CalcCrc16 은 다항식 0x1021, 비반사(MSB first) CRC-16/CCITT 이며
+표준 라이브러리 binascii.crc_hqx 와 비트 단위로 동일한 결과를 낸다.
 """
 
-def calc_crc16(data: bytes, init: int) -> int:
+from binascii import crc_hqx
+
+try:
+    import numpy as np
+except ImportError:  # 배치 API(calc_crc16_batch)에서만 필요
+    np = None
+
+# C 코드의 crc16Table 과 동일 (모듈 import 시 한 번만 생성)
+CRC16_TABLE = (
+    0x0000, 0x1021, 0x2042, 0x3063, 0x4084, 0x50a5, 0x60c6, 0x70e7,
+    0x8108, 0x9129, 0xa14a, 0xb16b, 0xc18c, 0xd1ad, 0xe1ce, 0xf1ef,
+    0x1231, 0x0210, 0x3273, 0x2252, 0x52b5, 0x4294, 0x72f7, 0x62d6,
+    0x9339, 0x8318, 0xb37b, 0xa35a, 0xd3bd, 0xc39c, 0xf3ff, 0xe3de,
+    0x2462, 0x3443, 0x0420, 0x1401, 0x64e6, 0x74c7, 0x44a4, 0x5485,
+    0xa56a, 0xb54b, 0x8528, 0x9509, 0xe5ee, 0xf5cf, 0xc5ac, 0xd58d,
+    0x3653, 0x2672, 0x1611, 0x0630, 0x76d7, 0x66f6, 0x5695, 0x46b4,
+    0xb75b, 0xa77a, 0x9719, 0x8738, 0xf7df, 0xe7fe, 0xd79d, 0xc7bc,
+    0x48c4, 0x58e5, 0x6886, 0x78a7, 0x0840, 0x1861, 0x2802, 0x3823,
+    0xc9cc, 0xd9ed, 0xe98e, 0xf9af, 0x8948, 0x9969, 0xa90a, 0xb92b,
+    0x5af5, 0x4ad4, 0x7ab7, 0x6a96, 0x1a71, 0x0a50, 0x3a33, 0x2a12,
+    0xdbfd, 0xcbdc, 0xfbbf, 0xeb9e, 0x9b79, 0x8b58, 0xbb3b, 0xab1a,
+    0x6ca6, 0x7c87, 0x4ce4, 0x5cc5, 0x2c22, 0x3c03, 0x0c60, 0x1c41,
+    0xedae, 0xfd8f, 0xcdec, 0xddcd, 0xad2a, 0xbd0b, 0x8d68, 0x9d49,
+    0x7e97, 0x6eb6, 0x5ed5, 0x4ef4, 0x3e13, 0x2e32, 0x1e51, 0x0e70,
+    0xff9f, 0xefbe, 0xdfdd, 0xcffc, 0xbf1b, 0xaf3a, 0x9f59, 0x8f78,
+    0x9188, 0x81a9, 0xb1ca, 0xa1eb, 0xd10c, 0xc12d, 0xf14e, 0xe16f,
+    0x1080, 0x00a1, 0x30c2, 0x20e3, 0x5004, 0x4025, 0x7046, 0x6067,
+    0x83b9, 0x9398, 0xa3fb, 0xb3da, 0xc33d, 0xd31c, 0xe37f, 0xf35e,
+    0x02b1, 0x1290, 0x22f3, 0x32d2, 0x4235, 0x5214, 0x6277, 0x7256,
+    0xb5ea, 0xa5cb, 0x95a8, 0x8589, 0xf56e, 0xe54f, 0xd52c, 0xc50d,
+    0x34e2, 0x24c3, 0x14a0, 0x0481, 0x7466, 0x6447, 0x5424, 0x4405,
+    0xa7db, 0xb7fa, 0x8799, 0x97b8, 0xe75f, 0xf77e, 0xc71d, 0xd73c,
+    0x26d3, 0x36f2, 0x0691, 0x16b0, 0x6657, 0x7676, 0x4615, 0x5634,
+    0xd94c, 0xc96d, 0xf90e, 0xe92f, 0x99c8, 0x89e9, 0xb98a, 0xa9ab,
+    0x5844, 0x4865, 0x7806, 0x6827, 0x18c0, 0x08e1, 0x3882, 0x28a3,
+    0xcb7d, 0xdb5c, 0xeb3f, 0xfb1e, 0x8bf9, 0x9bd8, 0xabbb, 0xbb9a,
+    0x4a75, 0x5a54, 0x6a37, 0x7a16, 0x0af1, 0x1ad0, 0x2ab3, 0x3a92,
+    0xfd2e, 0xed0f, 0xdd6c, 0xcd4d, 0xbdaa, 0xad8b, 0x9de8, 0x8dc9,
+    0x7c26, 0x6c07, 0x5c64, 0x4c45, 0x3ca2, 0x2c83, 0x1ce0, 0x0cc1,
+    0xef1f, 0xff3e, 0xcf5d, 0xdf7c, 0xaf9b, 0xbfba, 0x8fd9, 0x9ff8,
+    0x6e17, 0x7e36, 0x4e55, 0x5e74, 0x2e93, 0x3eb2, 0x0ed1, 0x1ef0
+)
+
+
+def calc_crc16(data, init: int) -> int:
     """
     CRC16 계산 (C 코드의 IPC_CalcCrc16 함수와 동일)
-    
+
+    bytes, bytearray, memoryview 를 복사 없이 그대로 받는다.
+
     Args:
-        data: 데이터
+        data: 데이터 (bytes-like)
         init: 초기값
-        
+
     Returns:
         int: CRC16 값
     """
-    crc_table = [
-        0x0000, 0x1021, 0x2042, 0x3063, 0x4084, 0x50a5, 0x60c6, 0x70e7,
-        0x8108, 0x9129, 0xa14a, 0xb16b, 0xc18c, 0xd1ad, 0xe1ce, 0xf1ef,
-        0x1231, 0x0210, 0x3273, 0x2252, 0x52b5, 0x4294, 0x72f7, 0x62d6,
-        0x9339, 0x8318, 0xb37b, 0xa35a, 0xd3bd, 0xc39c, 0xf3ff, 0xe3de,
-        0x2462, 0x3443, 0x0420, 0x1401, 0x64e6, 0x74c7, 0x44a4, 0x5485,
-        0xa56a, 0xb54b, 0x8528, 0x9509, 0xe5ee, 0xf5cf, 0xc5ac, 0xd58d,
-        0x3653, 0x2672, 0x1611, 0x0630, 0x76d7, 0x66f6, 0x5695, 0x46b4,
-        0xb75b, 0xa77a, 0x9719, 0x8738, 0xf7df, 0xe7fe, 0xd79d, 0xc7bc,
-        0x48c4, 0x58e5, 0x6886, 0x78a7, 0x0840, 0x1861, 0x2802, 0x3823,
-        0xc9cc, 0xd9ed, 0xe98e, 0xf9af, 0x8948, 0x9969, 0xa90a, 0xb92b,
-        0x5af5, 0x4ad4, 0x7ab7, 0x6a96, 0x1a71, 0x0a50, 0x3a33, 0x2a12,
-        0xdbfd, 0xcbdc, 0xfbbf, 0xeb9e, 0x9b79, 0x8b58, 0xbb3b, 0xab1a,
-        0x6ca6, 0x7c87, 0x4ce4, 0x5cc5, 0x2c22, 0x3c03, 0x0c60, 0x1c41,
-        0xedae, 0xfd8f, 0xcdec, 0xddcd, 0xad2a, 0xbd0b, 0x8d68, 0x9d49,
-        0x7e97, 0x6eb6, 0x5ed5, 0x4ef4, 0x3e13, 0x2e32, 0x1e51, 0x0e70,
-        0xff9f, 0xefbe, 0xdfdd, 0xcffc, 0xbf1b, 0xaf3a, 0x9f59, 0x8f78,
-        0x9188, 0x81a9, 0xb1ca, 0xa1eb, 0xd10c, 0xc12d, 0xf14e, 0xe16f,
-        0x1080, 0x00a1, 0x30c2, 0x20e3, 0x5004, 0x4025, 0x7046, 0x6067,
-        0x83b9, 0x9398, 0xa3fb, 0xb3da, 0xc33d, 0xd31c, 0xe37f, 0xf35e,
-        0x02b1, 0x1290, 0x22f3, 0x32d2, 0x4235, 0x5214, 0x6277, 0x7256,
-        0xb5ea, 0xa5cb, 0x95a8, 0x8589, 0xf56e, 0xe54f, 0xd52c, 0xc50d,
-        0x34e2, 0x24c3, 0x14a0, 0x0481, 0x7466, 0x6447, 0x5424, 0x4405,
-        0xa7db, 0xb7fa, 0x8799, 0x97b8, 0xe75f, 0xf77e, 0xc71d, 0xd73c,
-        0x26d3, 0x36f2, 0x0691, 0x16b0, 0x6657, 0x7676, 0x4615, 0x5634,
-        0xd94c, 0xc96d, 0xf90e, 0xe92f, 0x99c8, 0x89e9, 0xb98a, 0xa9ab,
-        0x5844, 0x4865, 0x7806, 0x6827, 0x18c0, 0x08e1, 0x3882, 0x28a3,
-        0xcb7d, 0xdb5c, 0xeb3f, 0xfb1e, 0x8bf9, 0x9bd8, 0xabbb, 0xbb9a,
-        0x4a75, 0x5a54, 0x6a37, 0x7a16, 0x0af1, 0x1ad0, 0x2ab3, 0x3a92,
-        0xfd2e, 0xed0f, 0xdd6c, 0xcd4d, 0xbdaa, 0xad8b, 0x9de8, 0x8dc9,
-        0x7c26, 0x6c07, 0x5c64, 0x4c45, 0x3ca2, 0x2c83, 0x1ce0, 0x0cc1,
-        0xef1f, 0xff3e, 0xcf5d, 0xdf7c, 0xaf9b, 0xbfba, 0x8fd9, 0x9ff8,
-        0x6e17, 0x7e36, 0x4e55, 0x5e74, 0x2e93, 0x3eb2, 0x0ed1, 0x1ef0
-    ]
-    
+    return crc_hqx(data, init & 0xFFFF)
+
+
+def calc_crc16_bytewise(data, init: int) -> int:
+    """
+    CRC16 계산 (C 코드의 IPC_CalcCrc16 루프를 그대로 옮긴 참조 구현)
+
+    calc_crc16 결과 검증 및 벤치마크 비교용.
+
+    Args:
+        data: 데이터 (bytes-like)
+        init: 초기값
+
+    Returns:
+        int: CRC16 값
+    """
+    crc_table = CRC16_TABLE
     crc_code = init
-    
-    for byte in data:
+
+    for byte in memoryview(data).cast('B'):
         temp = (((crc_code & 0xFF00) >> 8) ^ byte) & 0x00FF
         crc_code = (crc_table[temp] ^ ((crc_code & 0x00FF) << 8)) & 0xFFFF
-    
+
     return crc_code
+
+
+class Crc16:
+    """
+    스트리밍 CRC16 상태 객체 (hashlib 과 유사한 update()/digest() API)
+
+    IPC 헤더, CAN 헤더, payload 를 각각 memoryview 로 나누어 넣어도
+    한 번에 calc_crc16 을 호출한 것과 동일한 값이 나온다.
+    copy() 로 헤더까지 계산된 상태를 복제하여 프레임마다 재사용할 수 있다.
+
+    Example:
+        crc = Crc16(ipc_header)
+        crc.update(can_header)
+        crc.update(payload)
+        packet_crc = crc.digest()   # 빅엔디언 2바이트 (C 코드와 동일)
+    """
+
+    __slots__ = ('crcvalue',)
+
+    name = 'crc16'
+    digest_size = 2
+    block_size = 1
+
+    def __init__(self, data=b'', init: int = 0):
+        """
+        초기화
+
+        Args:
+            data: 처음 넣을 데이터 (bytes-like)
+            init: 초기값 (C 코드의 uiInit)
+        """
+        self.crcvalue = crc_hqx(data, init & 0xFFFF)
+
+    def update(self, data) -> None:
+        """데이터 추가 (bytes, bytearray, memoryview 모두 복사 없이 처리)"""
+        self.crcvalue = crc_hqx(data, self.crcvalue)
+
+    def digest(self) -> bytes:
+        """현재 CRC 를 패킷에 기록되는 순서(상위 바이트 먼저)로 리턴"""
+        return self.crcvalue.to_bytes(2, 'big')
+
+    def hexdigest(self) -> str:
+        """현재 CRC 를 16진수 문자열로 리턴"""
+        return f"{self.crcvalue:04x}"
+
+    def copy(self) -> 'Crc16':
+        """현재 상태를 복제한 새 객체 리턴"""
+        clone = Crc16.__new__(Crc16)
+        clone.crcvalue = self.crcvalue
+        return clone
+
+
+# calc_crc16_batch 용 NumPy 테이블 (처음 사용할 때 한 번만 생성)
+_np_tables = None
+
+
+def _get_np_tables():
+    """
+    NumPy CRC 테이블 리턴 (바이트 테이블, 16비트 테이블)
+
+    16비트 테이블은 CRC 상태와 2바이트 워드를 XOR 한 값 하나로
+    2바이트 처리 후의 CRC 를 바로 찾는 slice-by-2 테이블이다.
+    """
+    global _np_tables
+    if _np_tables is None:
+        table8 = np.array(CRC16_TABLE, dtype=np.uint16)
+        state = np.arange(65536, dtype=np.uint32)
+        crc = table8[state >> 8].astype(np.uint32) ^ ((state & 0xFF) << 8)
+        crc = table8[crc >> 8].astype(np.uint32) ^ ((crc & 0xFF) << 8)
+        _np_tables = (table8, crc.astype(np.uint16))
+    return _np_tables
+
+
+def calc_crc16_batch(frames, init: int = 0):
+    """
+    같은 길이 N 개 프레임의 CRC16 을 한 번에 계산 (NumPy 필요)
+
+    프레임 축(N)은 벡터화하고 바이트 축(L)은 2바이트씩 16비트 테이블로 진행한다.
+
+    Args:
+        frames: (N, L) uint8 배열 (행마다 CRC 대상 바이트)
+        init: 초기값
+
+    Returns:
+        numpy.ndarray: (N,) uint16 CRC 배열 (calc_crc16 과 동일한 값)
+    """
+    if np is None:
+        raise ImportError("calc_crc16_batch 는 numpy 가 필요합니다")
+
+    frames = np.asarray(frames, dtype=np.uint8)
+    if frames.ndim != 2:
+        raise ValueError(f"(N, L) 배열이 필요합니다: shape={frames.shape}")
+
+    table8, table16 = _get_np_tables()
+    n_frames, length = frames.shape
+    crc = np.full(n_frames, init & 0xFFFF, dtype=np.uint16)
+
+    # 2바이트 워드 단위 처리: crc = T16[crc ^ word]
+    even = length - (length & 1)
+    if even:
+        words = (frames[:, 0:even:2].astype(np.uint16) << 8) | frames[:, 1:even:2]
+        for column in range(words.shape[1]):
+            crc = table16[crc ^ words[:, column]]
+
+    # 홀수 길이의 마지막 바이트
+    if length & 1:
+        crc = table8[(crc >> 8) ^ frames[:, -1]] ^ ((crc & 0xFF) << 8)
+
+    return crc
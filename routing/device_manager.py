@@ -6,6 +6,7 @@
 
 import os
 from constants import AXON_IPC_CM0_FILE, AXON_IPC_CM1_FILE, AXON_IPC_CM2_FILE, AXON_IPC_CMN_FILE
+from ipc_ioctl import ipc_is_ready
 
 
 def check_devices():
@@ -21,8 +22,18 @@ def check_devices():
     for name, path in devices:
         if os.path.exists(path):
             try:
-                with open(path, 'r') as f:
-                    print(f"✓ {name}: {path} (접근 가능)")
+                # 텍스트 모드 open 대신 non-blocking fd 로 열고 IOCTL_IPC_ISREADY 로 상대 코어 상태 확인
+                fd = os.open(path, os.O_RDWR | os.O_NONBLOCK)
+                try:
+                    status = ipc_is_ready(fd)
+                finally:
+                    os.close(fd)
+                if status is None:
+                    print(f"✓ {name}: {path} (접근 가능, 준비 상태 확인 실패)")
+                elif status:
+                    print(f"✓ {name}: {path} (접근 가능, 준비됨)")
+                else:
+                    print(f"✓ {name}: {path} (접근 가능, 상대 코어 준비 안 됨)")
             except PermissionError:
                 print(f"✗ {name}: {path} (권한 없음)")
             except Exception as e:
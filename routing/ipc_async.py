@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AXON IPC 디바이스용 asyncio 인터페이스 (loop.add_reader/add_writer 기반)
+"""
+
+import asyncio
+from collections import deque
+from typing import Optional
+from axon_ipc_driver import AxonIPCDriver
+from constants import IPC_MAX_PACKET_SIZE
+from packet_utils import IpcFramer, LpaPacket, parse_lpa_packet_with_can_header
+
+# add_reader 콜백 한 번에 연속으로 읽는 최대 횟수 (이벤트 루프 점유 제한)
+MAX_READS_PER_CALLBACK = 64
+
+
+class IPCStreamReader:
+    """
+    IPC 디바이스 수신 스트림 (파싱된 LpaPacket 을 async iterator 로 제공)
+
+    Example:
+        async for packet in reader:
+            print(packet.port, packet.payload.hex())
+    """
+
+    def __init__(self, driver: AxonIPCDriver, loop: asyncio.AbstractEventLoop, limit: int = 1024):
+        """
+        초기화
+
+        Args:
+            driver: 열려 있는 AxonIPCDriver (non-blocking fd)
+            loop: 사용할 이벤트 루프
+            limit: 소비되지 않은 패킷 최대 개수 (초과 시 소비될 때까지 읽기 일시 중지)
+        """
+        self._driver = driver
+        self._loop = loop
+        self._limit = limit
+        self._framer = IpcFramer()
+        self._packets = deque()
+        self._waiter = None
+        self._paused = False
+        self._eof = False
+        self.rx_bytes = 0
+        self.rx_packets = 0
+        self.pauses = 0
+        self._loop.add_reader(driver.fd, self._on_readable)
+
+    def _on_readable(self) -> None:
+        """fd 가 읽기 가능할 때 이벤트 루프에서 호출"""
+        driver = self._driver
+        for _ in range(MAX_READS_PER_CALLBACK):
+            try:
+                data = driver.read_nonblocking(IPC_MAX_PACKET_SIZE)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                print(f"IPC 비동기 읽기 실패: {e}")
+                self.feed_eof()
+                return
+            if not data:
+                # EOF: 등록을 유지하면 읽기 가능 상태가 계속되어 루프가 깨어나고 read_packet 이 끝나지 않음
+                self.feed_eof()
+                return
+
+            self.rx_bytes += len(data)
+            for packet in self._framer.feed(data):
+                self._packets.append(parse_lpa_packet_with_can_header(packet))
+                self.rx_packets += 1
+
+        if self._packets:
+            self._wakeup()
+            if len(self._packets) >= self._limit and not self._paused:
+                # 소비자가 따라오지 못하면 커널 버퍼에 남겨 두고 읽기 중지
+                self._loop.remove_reader(driver.fd)
+                self._paused = True
+                self.pauses += 1
+
+    def _wakeup(self) -> None:
+        waiter = self._waiter
+        if waiter is not None:
+            self._waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def feed_eof(self) -> None:
+        """스트림 종료 (대기 중인 read_packet 은 남은 패킷을 모두 돌려준 뒤 None 리턴)"""
+        if not self._eof:
+            self._eof = True
+            if not self._paused and self._driver.fd is not None:
+                self._loop.remove_reader(self._driver.fd)
+            self._paused = True
+        self._wakeup()
+
+    def at_eof(self) -> bool:
+        """보관 중인 패킷이 없고 스트림이 종료되었는지 여부"""
+        return self._eof and not self._packets
+
+    async def read_packet(self) -> Optional[LpaPacket]:
+        """
+        다음 패킷 읽기
+
+        Returns:
+            Optional[LpaPacket]: 파싱된 패킷 (스트림 종료 시 None)
+        """
+        while not self._packets:
+            if self._eof:
+                return None
+            self._waiter = self._loop.create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+        packet = self._packets.popleft()
+        if self._paused and not self._eof and len(self._packets) < self._limit // 2:
+            self._loop.add_reader(self._driver.fd, self._on_readable)
+            self._paused = False
+        return packet
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> LpaPacket:
+        packet = await self.read_packet()
+        if packet is None:
+            raise StopAsyncIteration
+        return packet
+
+    def stats(self) -> dict:
+        """수신 카운터"""
+        stats = {
+            'rx_bytes': self.rx_bytes,
+            'rx_packets': self.rx_packets,
+            'queued': len(self._packets),
+            'pauses': self.pauses,
+        }
+        stats.update({f'framer_{key}': value for key, value in self._framer.stats().items()})
+        return stats
+
+
+class IPCStreamWriter:
+    """
+    IPC 디바이스 송신 스트림
+
+    write() 는 가능하면 즉시 write 하고, EAGAIN 이나 일부만 써진 경우에만
+    버퍼에 남겨 add_writer 로 나머지를 보낸다. 보낼 데이터가 쌓였으면 drain() 으로 대기.
+    """
+
+    def __init__(self, driver: AxonIPCDriver, loop: asyncio.AbstractEventLoop, reader: IPCStreamReader,
+                 high_water: int = 64):
+        """
+        초기화
+
+        Args:
+            driver: 열려 있는 AxonIPCDriver (non-blocking fd)
+            loop: 사용할 이벤트 루프
+            reader: 같은 fd 를 쓰는 수신 스트림 (close 시 함께 종료)
+            high_water: drain() 이 대기하기 시작하는 버퍼 패킷 수
+        """
+        self._driver = driver
+        self._loop = loop
+        self._reader = reader
+        self._high_water = high_water
+        self._buffer = deque()
+        self._writing = False
+        self._drain_waiter = None
+        self._closed = False
+        self.tx_bytes = 0
+        self.tx_packets = 0
+        self.eagain = 0
+
+    def write(self, data: bytes) -> None:
+        """
+        패킷 송신 (블록하지 않음)
+
+        Args:
+            data: 송신할 패킷
+        """
+        if self._closed:
+            raise ConnectionError("IPC 스트림이 닫혔습니다")
+
+        if not self._buffer:
+            try:
+                written = self._driver.write_nonblocking(data)
+            except BlockingIOError:
+                written = 0
+                self.eagain += 1
+            self.tx_bytes += written
+            if written == len(data):
+                self.tx_packets += 1
+                return
+            data = memoryview(data)[written:]
+
+        self._buffer.append(data)
+        if not self._writing:
+            self._loop.add_writer(self._driver.fd, self._on_writable)
+            self._writing = True
+
+    def _on_writable(self) -> None:
+        """fd 가 쓰기 가능할 때 이벤트 루프에서 호출"""
+        buffer = self._buffer
+        while buffer:
+            data = buffer[0]
+            try:
+                written = self._driver.write_nonblocking(data)
+            except BlockingIOError:
+                self.eagain += 1
+                return
+            except OSError as e:
+                print(f"IPC 비동기 쓰기 실패: {e}")
+                buffer.clear()
+                break
+
+            self.tx_bytes += written
+            if written < len(data):
+                buffer[0] = memoryview(data)[written:]
+                continue
+            buffer.popleft()
+            self.tx_packets += 1
+
+        self._loop.remove_writer(self._driver.fd)
+        self._writing = False
+        waiter = self._drain_waiter
+        if waiter is not None:
+            self._drain_waiter = None
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def drain(self) -> None:
+        """버퍼가 high_water 이상이면 모두 써질 때까지 대기"""
+        if len(self._buffer) < self._high_water or not self._writing:
+            return
+        self._drain_waiter = self._loop.create_future()
+        await self._drain_waiter
+
+    def is_closing(self) -> bool:
+        return self._closed
+
+    def close(self) -> None:
+        """송신/수신 스트림 종료 및 디바이스 닫기 (버퍼에 남은 데이터는 버림)"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._writing:
+            self._loop.remove_writer(self._driver.fd)
+            self._writing = False
+        self._reader.feed_eof()
+        self._driver.close_device()
+
+    async def wait_closed(self) -> None:
+        """asyncio.StreamWriter 와 같은 사용을 위한 호환 메서드"""
+        await asyncio.sleep(0)
+
+    def stats(self) -> dict:
+        """송신 카운터"""
+        return {
+            'tx_bytes': self.tx_bytes,
+            'tx_packets': self.tx_packets,
+            'eagain': self.eagain,
+            'buffered': len(self._buffer),
+        }
+
+
+async def open_ipc_connection(device_path: str, limit: int = 1024, high_water: int = 64) -> tuple:
+    """
+    IPC 디바이스를 non-blocking 으로 열고 (reader, writer) 리턴
+
+    asyncio.open_connection 과 같은 형태로 사용한다.
+
+    Args:
+        device_path: IPC 디바이스 경로
+        limit: 수신 스트림에 보관하는 최대 패킷 수
+        high_water: 송신 스트림 drain() 기준 패킷 수
+
+    Returns:
+        tuple: (IPCStreamReader, IPCStreamWriter)
+    """
+    loop = asyncio.get_running_loop()
+    driver = AxonIPCDriver(device_path)
+    if not driver.open_device():
+        raise ConnectionError(f"IPC 디바이스 열기 실패: {device_path}")
+
+    reader = IPCStreamReader(driver, loop, limit)
+    writer = IPCStreamWriter(driver, loop, reader, high_water)
+    return reader, writer
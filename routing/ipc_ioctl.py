@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AXON IPC 디바이스 ioctl 바인딩 (C 코드의 axon_ipc.h 와 동일한 구조체/명령어)
+
+axon_ipc.h 는 이 저장소에 없으므로 ioctl 번호는 같은 계열 드라이버(tcc_ipc.h)의
+_IO('I', n) 정의를 따른다. 커널 헤더와 다르면 아래 IOCTL_IPC_* 값만 맞추면 된다.
+"""
+
+import ctypes
+import fcntl
+from typing import Optional
+
+# ---------------------------------------------------------------------------
+# ioctl 번호 (linux/ioctl.h 의 _IOC 인코딩)
+# ---------------------------------------------------------------------------
+_IOC_NRBITS = 8
+_IOC_TYPEBITS = 8
+_IOC_SIZEBITS = 14
+
+_IOC_NRSHIFT = 0
+_IOC_TYPESHIFT = _IOC_NRSHIFT + _IOC_NRBITS
+_IOC_SIZESHIFT = _IOC_TYPESHIFT + _IOC_TYPEBITS
+_IOC_DIRSHIFT = _IOC_SIZESHIFT + _IOC_SIZEBITS
+
+_IOC_NONE = 0
+_IOC_WRITE = 1
+_IOC_READ = 2
+
+
+def _IOC(direction: int, ioc_type: str, nr: int, size: int) -> int:
+    return (direction << _IOC_DIRSHIFT) | (ord(ioc_type) << _IOC_TYPESHIFT) | \
+           (nr << _IOC_NRSHIFT) | (size << _IOC_SIZESHIFT)
+
+
+def _IO(ioc_type: str, nr: int) -> int:             return _IOC(_IOC_NONE, ioc_type, nr, 0)
+def _IOR(ioc_type: str, nr: int, size: int) -> int:  return _IOC(_IOC_READ, ioc_type, nr, size)
+def _IOW(ioc_type: str, nr: int, size: int) -> int:  return _IOC(_IOC_WRITE, ioc_type, nr, size)
+
+
+IPC_IOCTL_MAGIC = 'I'
+
+IOCTL_IPC_SET_PARAM = _IO(IPC_IOCTL_MAGIC, 1)
+IOCTL_IPC_GET_PARAM = _IO(IPC_IOCTL_MAGIC, 2)
+IOCTL_IPC_PING_TEST = _IO(IPC_IOCTL_MAGIC, 3)
+IOCTL_IPC_FLUSH = _IO(IPC_IOCTL_MAGIC, 4)
+IOCTL_IPC_ISREADY = _IO(IPC_IOCTL_MAGIC, 5)
+IOCTL_IPC_SET_MODE = _IO(IPC_IOCTL_MAGIC, 6)
+
+# IOCTL_IPC_SET_MODE 값 (C 코드의 ipc_openN 에서 사용)
+IPC_MODE_0_MBOX = 0
+
+
+# ---------------------------------------------------------------------------
+# 구조체
+# ---------------------------------------------------------------------------
+class AxonIpcCtrlParam(ctypes.Structure):
+    """C 코드의 axon_ipc_ctrl_param (read 블록 조건: vMin 바이트 또는 vTime x 100ms)"""
+    _fields_ = [
+        ("vMin", ctypes.c_uint32),
+        ("vTime", ctypes.c_uint32),
+    ]
+
+
+class AxonIpcPingInfo(ctypes.Structure):
+    """C 코드의 axon_ipc_ping_info"""
+    _fields_ = [
+        ("pingResult", ctypes.c_uint32),
+        ("sendByte", ctypes.c_uint32),
+        ("compareResult", ctypes.c_uint32),
+        ("responseTime", ctypes.c_uint32),
+    ]
+
+    @property
+    def status(self) -> str:
+        """pingResult 설명 문자열"""
+        return PING_RESULT_STATUS.get(self.pingResult, f"알 수 없는 상태 ({self.pingResult})")
+
+    @property
+    def success(self) -> bool:
+        return self.pingResult == IPC_PING_SUCCESS
+
+    def to_dict(self) -> dict:
+        return {
+            'ping_result': self.pingResult,
+            'status': self.status,
+            'send_byte': self.sendByte,
+            'compare_result': self.compareResult,
+            'response_time': self.responseTime,
+        }
+
+
+# pingResult 상태 코드 (C 코드의 ipc_ping_testN 출력과 동일)
+IPC_PING_SUCCESS = 0
+PING_RESULT_STATUS = {
+    0: "Ping success",
+    1: "[sender] ipc initialize failed",
+    2: "Other IPC not open",
+    3: "[sender] mbox is not set or error",
+    4: "[Receiver] mbox is not set or error",
+    5: "Can not send data. Maybe receiver mbox interrupt is busy",
+    6: "[Receiver] does not send respond data",
+    7: "[Receiver] does not send respond data",
+}
+
+
+# ---------------------------------------------------------------------------
+# fd 단위 함수 (C 코드의 ipc_setparamN / ipc_flushN / ipc_statusN 등과 동일)
+# ---------------------------------------------------------------------------
+def ipc_set_mode(fd: int, mode: int = IPC_MODE_0_MBOX) -> bool:
+    """
+    IPC 모드 설정 (IOCTL_IPC_SET_MODE)
+
+    Args:
+        fd: IPC 디바이스 파일 디스크립터
+        mode: 모드 (기본값: IPC_MODE_0_MBOX)
+
+    Returns:
+        bool: 성공 여부
+    """
+    try:
+        fcntl.ioctl(fd, IOCTL_IPC_SET_MODE, ctypes.c_uint32(mode))
+        return True
+    except OSError as e:
+        print(f"IOCTL_IPC_SET_MODE 실패: {e}")
+        return False
+
+
+def ipc_set_param(fd: int, v_min: int, v_time: int) -> bool:
+    """
+    read 블록 조건 설정 (IOCTL_IPC_SET_PARAM)
+
+    Args:
+        fd: IPC 디바이스 파일 디스크립터
+        v_min: read 가 리턴하기 위한 최소 바이트 수
+        v_time: read 대기 시간 (100ms 단위, 예: 50 -> 5초)
+
+    Returns:
+        bool: 성공 여부
+    """
+    try:
+        fcntl.ioctl(fd, IOCTL_IPC_SET_PARAM, AxonIpcCtrlParam(v_min, v_time))
+        return True
+    except OSError as e:
+        print(f"IOCTL_IPC_SET_PARAM 실패: {e}")
+        return False
+
+
+def ipc_get_param(fd: int) -> Optional[AxonIpcCtrlParam]:
+    """
+    현재 read 블록 조건 읽기 (IOCTL_IPC_GET_PARAM)
+
+    Args:
+        fd: IPC 디바이스 파일 디스크립터
+
+    Returns:
+        Optional[AxonIpcCtrlParam]: 설정값 (실패 시 None)
+    """
+    param = AxonIpcCtrlParam()
+    try:
+        fcntl.ioctl(fd, IOCTL_IPC_GET_PARAM, param, True)
+        return param
+    except OSError as e:
+        print(f"IOCTL_IPC_GET_PARAM 실패: {e}")
+        return None
+
+
+def ipc_flush(fd: int) -> bool:
+    """
+    메일박스에 남은 데이터 비우기 (IOCTL_IPC_FLUSH)
+
+    Args:
+        fd: IPC 디바이스 파일 디스크립터
+
+    Returns:
+        bool: 성공 여부
+    """
+    try:
+        fcntl.ioctl(fd, IOCTL_IPC_FLUSH, 0)
+        return True
+    except OSError as e:
+        print(f"IOCTL_IPC_FLUSH 실패: {e}")
+        return False
+
+
+def ipc_is_ready(fd: int) -> Optional[int]:
+    """
+    상대 코어 IPC 준비 상태 읽기 (IOCTL_IPC_ISREADY)
+
+    Args:
+        fd: IPC 디바이스 파일 디스크립터
+
+    Returns:
+        Optional[int]: 상태값 (0 이 아니면 준비됨, ioctl 실패 시 None)
+    """
+    status = ctypes.c_uint32(0)
+    try:
+        fcntl.ioctl(fd, IOCTL_IPC_ISREADY, status, True)
+        return status.value
+    except OSError as e:
+        print(f"IOCTL_IPC_ISREADY 실패: {e}")
+        return None
+
+
+def ipc_ping_test(fd: int) -> Optional[AxonIpcPingInfo]:
+    """
+    커널 메일박스 ping 테스트 (IOCTL_IPC_PING_TEST)
+
+    C 코드는 구조체 포인터의 주소(&pingInfo)를 넘기지만 여기서는 구조체 자체를 넘긴다.
+
+    Args:
+        fd: IPC 디바이스 파일 디스크립터
+
+    Returns:
+        Optional[AxonIpcPingInfo]: ping 결과 (ioctl 실패 시 None)
+    """
+    ping_info = AxonIpcPingInfo()
+    try:
+        fcntl.ioctl(fd, IOCTL_IPC_PING_TEST, ping_info, True)
+        return ping_info
+    except OSError as e:
+        print(f"IOCTL_IPC_PING_TEST 실패: {e}")
+        return None
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+여러 AXON IPC 디바이스(cm0/cm1/cm2/cmn)를 하나의 epoll 루프로 다루는 리액터
+"""
+
+import time
+import select
+import threading
+from collections import deque
+from typing import Callable, Optional
+from axon_ipc_driver import AxonIPCDriver
+from constants import AXON_IPC_DEVICE_FILES, IPC_MAX_PACKET_SIZE
+from packet_utils import IpcFramer
+
+# 디바이스 하나당 이벤트 한 번에 연속으로 읽는 최대 횟수 (다른 디바이스 기아 방지)
+MAX_READS_PER_EVENT = 64
+
+
+class IPCChannel:
+    """IPCReactor 에 등록된 디바이스 하나의 상태 (드라이버, 프레이머, 송신 큐, 카운터)"""
+
+    __slots__ = ('name', 'driver', 'framer', 'on_packet', 'write_queue', 'max_queue',
+                 'rx_bytes', 'rx_packets', 'tx_bytes', 'tx_packets', 'tx_dropped', 'want_write')
+
+    def __init__(self, name: str, driver: AxonIPCDriver, on_packet: Optional[Callable],
+                 max_queue: int):
+        self.name = name
+        self.driver = driver
+        self.framer = IpcFramer()
+        self.on_packet = on_packet
+        self.write_queue = deque()
+        self.max_queue = max_queue
+        self.rx_bytes = 0
+        self.rx_packets = 0
+        self.tx_bytes = 0
+        self.tx_packets = 0
+        self.tx_dropped = 0
+        self.want_write = False
+
+    @property
+    def fd(self) -> int:
+        return self.driver.fd
+
+    def stats(self) -> dict:
+        """디바이스별 카운터"""
+        stats = {
+            'device_path': self.driver.device_path,
+            'rx_bytes': self.rx_bytes,
+            'rx_packets': self.rx_packets,
+            'tx_bytes': self.tx_bytes,
+            'tx_packets': self.tx_packets,
+            'tx_dropped': self.tx_dropped,
+            'tx_queued': len(self.write_queue),
+        }
+        stats.update({f'framer_{key}': value for key, value in self.framer.stats().items()})
+        return stats
+
+
+class IPCReactor:
+    """
+    여러 IPC 디바이스를 스레드 없이 하나의 epoll 루프로 송수신
+
+    - add_device() 로 cm0/cm1/cm2/cmn 중 원하는 디바이스만 열고 디바이스별 콜백 등록
+    - 수신 데이터는 디바이스별 IpcFramer 로 재조립하여 on_packet(name, packet) 호출
+      (packet 은 memoryview 이므로 콜백 밖에서 보관하려면 bytes(packet) 로 복사)
+    - send() 는 디바이스별 송신 큐에 넣기만 하고 실제 write 는 루프 스레드가 EPOLLOUT 시점에 수행
+      (다른 스레드에서 send() 해도 안전)
+
+    Example:
+        with IPCReactor() as reactor:
+            reactor.add_device('cm1', on_packet=lambda name, packet: print(name, packet.hex()))
+            reactor.send('cm1', packet)
+            reactor.run(duration=1.0)
+    """
+
+    def __init__(self, max_queue: int = 1024, read_size: int = IPC_MAX_PACKET_SIZE):
+        """
+        초기화
+
+        Args:
+            max_queue: 디바이스별 송신 큐 최대 패킷 수 (가득 차면 send() 실패)
+            read_size: read 한 번에 읽는 최대 바이트 수
+        """
+        self.max_queue = max_queue
+        self.read_size = read_size
+        self._epoll = select.epoll()
+        self._channels = {}
+        self._by_fd = {}
+        self._lock = threading.Lock()
+        self._running = False
+
+    def add_device(self, name: str, device_path: Optional[str] = None,
+                   on_packet: Optional[Callable] = None) -> bool:
+        """
+        디바이스를 열고 epoll 에 등록
+
+        Args:
+            name: 디바이스 이름 ('cm0', 'cm1', 'cm2', 'cmn')
+            device_path: 디바이스 경로 (None 이면 AXON_IPC_DEVICE_FILES[name])
+            on_packet: 패킷 수신 콜백 on_packet(name, packet)
+
+        Returns:
+            bool: 성공 여부
+        """
+        if name in self._channels:
+            print(f"이미 등록된 디바이스입니다: {name}")
+            return False
+
+        if device_path is None:
+            device_path = AXON_IPC_DEVICE_FILES.get(name)
+            if device_path is None:
+                print(f"알 수 없는 디바이스 이름: {name} (사용 가능: {', '.join(AXON_IPC_DEVICE_FILES)})")
+                return False
+
+        driver = AxonIPCDriver(device_path)
+        if not driver.open_device():
+            return False
+
+        channel = IPCChannel(name, driver, on_packet, self.max_queue)
+        with self._lock:
+            self._channels[name] = channel
+            self._by_fd[channel.fd] = channel
+            self._epoll.register(channel.fd, select.EPOLLIN)
+        return True
+
+    def add_devices(self, names, on_packet: Optional[Callable] = None) -> list:
+        """
+        여러 디바이스를 한 번에 등록 (같은 콜백 사용)
+
+        Args:
+            names: 디바이스 이름 목록
+            on_packet: 패킷 수신 콜백 on_packet(name, packet)
+
+        Returns:
+            list: 등록에 성공한 디바이스 이름
+        """
+        return [name for name in names if self.add_device(name, on_packet=on_packet)]
+
+    def remove_device(self, name: str) -> bool:
+        """
+        디바이스를 epoll 에서 제거하고 닫기
+
+        Args:
+            name: 디바이스 이름
+
+        Returns:
+            bool: 성공 여부
+        """
+        with self._lock:
+            channel = self._channels.pop(name, None)
+            if channel is None:
+                return False
+            self._by_fd.pop(channel.fd, None)
+            try:
+                self._epoll.unregister(channel.fd)
+            except OSError:
+                pass
+        return channel.driver.close_device()
+
+    @property
+    def devices(self) -> list:
+        """등록된 디바이스 이름 목록"""
+        return list(self._channels)
+
+    def send(self, name: str, data: bytes) -> bool:
+        """
+        디바이스 송신 큐에 패킷 추가 (write 는 루프 스레드에서 수행)
+
+        Args:
+            name: 디바이스 이름
+            data: 송신할 패킷
+
+        Returns:
+            bool: 큐 추가 성공 여부 (미등록 디바이스이거나 큐가 가득 차면 False)
+        """
+        channel = self._channels.get(name)
+        if channel is None:
+            print(f"등록되지 않은 디바이스입니다: {name}")
+            return False
+
+        with self._lock:
+            if len(channel.write_queue) >= channel.max_queue:
+                channel.tx_dropped += 1
+                return False
+            channel.write_queue.append(data)
+            if not channel.want_write:
+                channel.want_write = True
+                self._epoll.modify(channel.fd, select.EPOLLIN | select.EPOLLOUT)
+        return True
+
+    def _handle_read(self, channel: IPCChannel) -> None:
+        """읽을 수 있는 만큼 읽어서 프레이머에 넣고 완성된 패킷마다 콜백 호출"""
+        for _ in range(MAX_READS_PER_EVENT):
+            try:
+                data = channel.driver.read_nonblocking(self.read_size)
+            except BlockingIOError:
+                return
+            if not data:
+                # EOF: EPOLLIN 이 계속 올라오므로 (level-triggered) 등록 해제하지 않으면 루프가 계속 깨어남
+                print(f"[{channel.name}] 디바이스 EOF - 등록 해제합니다")
+                self.remove_device(channel.name)
+                return
+
+            channel.rx_bytes += len(data)
+            for packet in channel.framer.feed(data):
+                channel.rx_packets += 1
+                if channel.on_packet is not None:
+                    try:
+                        channel.on_packet(channel.name, packet)
+                    except Exception as e:
+                        print(f"[{channel.name}] 수신 콜백 오류: {e}")
+
+    def _handle_write(self, channel: IPCChannel) -> None:
+        """송신 큐를 쓸 수 있는 만큼 write (EAGAIN 이면 다음 EPOLLOUT 까지 대기)"""
+        queue = channel.write_queue
+        while queue:
+            data = queue[0]
+            try:
+                written = channel.driver.write_nonblocking(data)
+            except BlockingIOError:
+                return
+
+            channel.tx_bytes += written
+            if written < len(data):
+                # 일부만 써진 경우 나머지를 다음 write 로
+                queue[0] = memoryview(data)[written:]
+                continue
+            queue.popleft()
+            channel.tx_packets += 1
+
+        with self._lock:
+            if not queue and channel.want_write:
+                channel.want_write = False
+                self._epoll.modify(channel.fd, select.EPOLLIN)
+
+    def run_once(self, timeout: Optional[float] = None) -> int:
+        """
+        epoll 이벤트를 한 번 기다렸다가 처리
+
+        Args:
+            timeout: 최대 대기 시간 (초, None 이면 이벤트가 올 때까지)
+
+        Returns:
+            int: 처리한 이벤트 수
+        """
+        events = self._epoll.poll(-1 if timeout is None else timeout)
+        for fd, event in events:
+            channel = self._by_fd.get(fd)
+            if channel is None:
+                continue
+
+            try:
+                if event & (select.EPOLLIN | select.EPOLLPRI):
+                    self._handle_read(channel)
+                    if channel.name not in self._channels:
+                        continue
+                if event & select.EPOLLOUT:
+                    self._handle_write(channel)
+                if event & (select.EPOLLERR | select.EPOLLHUP) and not event & select.EPOLLIN:
+                    print(f"[{channel.name}] 디바이스 오류 이벤트(0x{event:x}) - 등록 해제합니다")
+                    self.remove_device(channel.name)
+            except OSError as e:
+                print(f"[{channel.name}] 입출력 오류: {e} - 등록 해제합니다")
+                self.remove_device(channel.name)
+        return len(events)
+
+    def run(self, duration: Optional[float] = None, poll_interval: float = 0.1) -> None:
+        """
+        stop() 이 호출되거나 duration 이 지날 때까지 이벤트 루프 실행
+
+        Args:
+            duration: 실행 시간 (초, None 이면 stop() 까지)
+            poll_interval: stop()/duration 확인 주기 (초)
+        """
+        self._running = True
+        deadline = None if duration is None else time.monotonic() + duration
+        while self._running and self._channels:
+            timeout = poll_interval
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                timeout = min(timeout, remaining)
+            self.run_once(timeout)
+        self._running = False
+
+    def stop(self) -> None:
+        """run() 루프 종료 요청 (다른 스레드나 콜백에서 호출 가능)"""
+        self._running = False
+
+    def stats(self) -> dict:
+        """디바이스별 카운터"""
+        return {name: channel.stats() for name, channel in self._channels.items()}
+
+    def close(self) -> None:
+        """모든 디바이스를 닫고 epoll 해제"""
+        for name in list(self._channels):
+            self.remove_device(name)
+        self._epoll.close()
+
+    def __enter__(self):
+        """Context manager 진입"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager 종료"""
+        self.close()
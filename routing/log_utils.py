@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+비동기 로그 (큐 + 백그라운드 writer 스레드)
+
+송수신 스레드가 print 로 터미널에 직접 쓰면 터미널 I/O 가 끝날 때까지 타이밍이 중요한 루프가 멈춘다.
+AsyncLogger.log 는 레벨 확인 후 (메시지, 인자) 를 큐에 넣기만 하고, 문자열 포맷과 출력은
+writer 스레드가 flush_interval 마다 모아서 한 번에 한다 (레벨이 꺼져 있으면 포맷하지 않음).
+"""
+
+import sys
+import threading
+from collections import deque
+
+# 로그 레벨 (값이 클수록 자세함)
+LOG_SUMMARY = 0  # 시작/종료 요약만
+LOG_FAILURE = 1  # + 검증 실패, 드롭, 오류
+LOG_FRAME = 2    # + 송수신 프레임마다
+
+LOG_LEVELS = {
+    'summary': LOG_SUMMARY,
+    'failure': LOG_FAILURE,
+    'frame': LOG_FRAME,
+}
+
+
+class AsyncLogger:
+    """
+    레벨별 비동기 로그
+
+    message 는 '%' 포맷 문자열 또는 문자열을 리턴하는 함수이며, args 와 함께 큐에 들어갔다가
+    writer 스레드에서 message % args 또는 message(*args) 로 포맷된다.
+    args 는 출력될 때까지 바뀌지 않아야 한다 (IpcRxRing 의 memoryview 처럼 다음 수신에서 덮어쓰는 값은
+    bytes 로 복사해서 넘긴다).
+    start() 전이나 close() 후에는 호출한 스레드에서 바로 출력한다.
+    """
+
+    def __init__(self, level: int = LOG_FAILURE, stream=None, max_queue: int = 100000,
+                 flush_interval: float = 0.05, batch: int = 64):
+        """
+        초기화
+
+        Args:
+            level: 출력할 최대 레벨 (LOG_SUMMARY / LOG_FAILURE / LOG_FRAME)
+            stream: 출력 스트림 (None 이면 출력 시점의 sys.stdout)
+            max_queue: 큐에 보관하는 최대 레코드 수 (넘으면 새 레코드를 버리고 dropped 로 집계)
+            flush_interval: writer 스레드가 큐를 비우는 간격 (초)
+            batch: 한 번에 포맷해서 쓰는 최대 레코드 수
+        """
+        self.level = level
+        self.stream = stream
+        self.max_queue = max_queue
+        self.flush_interval = flush_interval
+        self.batch = batch
+        self._queue = deque()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.emitted = 0
+        self.dropped = 0
+        self.format_errors = 0
+        self.writes = 0
+        self.max_queued = 0
+
+    def start(self) -> 'AsyncLogger':
+        """writer 스레드 시작"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='AsyncLogger', daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """writer 스레드 종료 (큐에 남은 레코드를 모두 출력한 뒤 리턴)"""
+        thread = self._thread
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+            self._thread = None
+        self.flush()
+
+    def enabled(self, level: int) -> bool:
+        """level 이 출력되는지 여부 (인자를 만드는 비용이 큰 경우 미리 확인)"""
+        return level <= self.level
+
+    def log(self, level: int, message, *args) -> bool:
+        """
+        레코드 추가 (포맷/출력은 writer 스레드에서)
+
+        Args:
+            level: 레코드 레벨
+            message: '%' 포맷 문자열 또는 문자열을 리턴하는 함수
+            *args: 포맷 인자
+
+        Returns:
+            bool: 큐에 들어갔거나 출력했으면 True (레벨이 꺼져 있거나 큐가 가득 차서 버렸으면 False)
+        """
+        if level > self.level:
+            return False
+        if self._thread is None:
+            self._write(((message, args),))
+            return True
+
+        queue = self._queue
+        queued = len(queue)
+        if queued >= self.max_queue:
+            self.dropped += 1
+            return False
+        queue.append((message, args))
+        if queued >= self.max_queued:
+            self.max_queued = queued + 1
+        return True
+
+    def summary(self, message, *args) -> bool:
+        return self.log(LOG_SUMMARY, message, *args)
+
+    def failure(self, message, *args) -> bool:
+        return self.log(LOG_FAILURE, message, *args)
+
+    def frame(self, message, *args) -> bool:
+        return self.log(LOG_FRAME, message, *args)
+
+    def flush(self) -> None:
+        """큐에 있는 레코드를 지금 출력"""
+        queue = self._queue
+        with self._write_lock:
+            pending = len(queue)
+            while pending:
+                # 한 번에 모두 포맷하면 그동안 GIL 을 놓지 않으므로 batch 개씩 포맷하고 write (I/O 중 GIL 해제)
+                count = min(pending, self.batch)
+                self._write_locked([queue.popleft() for _ in range(count)])
+                pending -= count
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def _write(self, records) -> None:
+        with self._write_lock:
+            self._write_locked(records)
+
+    def _write_locked(self, records) -> None:
+        lines = []
+        for message, args in records:
+            try:
+                if callable(message):
+                    lines.append(message(*args))
+                else:
+                    lines.append(message % args if args else message)
+            except Exception as e:
+                self.format_errors += 1
+                lines.append(f"로그 포맷 실패: {e} ({message!r})")
+        lines.append('')
+
+        stream = self.stream or sys.stdout
+        stream.write('\n'.join(lines))
+        stream.flush()
+        self.emitted += len(records)
+        self.writes += 1
+
+    def stats(self) -> dict:
+        """로그 카운터 (dropped 가 0 이 아니면 큐가 가득 차서 버린 레코드)"""
+        return {
+            'level': self.level,
+            'queued': len(self._queue),
+            'max_queued': self.max_queued,
+            'emitted': self.emitted,
+            'dropped': self.dropped,
+            'format_errors': self.format_errors,
+            'writes': self.writes,
+        }
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -4,48 +4,105 @@
 패킷 생성 및 파싱 유틸리티 (C 코드와 동일한 패킷 구조)
 """
 
-from crc_utils import calc_crc16
+import os
+import struct
+from binascii import crc_hqx  # make_lpa_packet_with_can_header_into 에서 calc_crc16 호출 단계를 줄이기 위해 직접 사용
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from functools import lru_cache
+from constants import IPC_MAX_PACKET_SIZE
+from crc_utils import calc_crc16, calc_crc16_batch, Crc16
 from typing import ByteString
 
+try:
+    import numpy as np
+except ImportError:  # 배치 API(make_lpa_packets_with_can_header_batch)에서만 필요
+    np = None
 
-def make_packet(add_num: int, ipc_cmd1: int, ipc_cmd2: int, data_length: int) -> bytes:
+
+# IPC 패킷 레이아웃 (C 코드의 ipc_make_packet 과 동일, 빅엔디언)
+# 헤더(FF 55 AA) + 명령어1(2) + 명령어2(2) + 데이터 길이(2) ... CRC(2)
+IPC_HEADER_STRUCT = struct.Struct('>3sHHH')
+IPC_CRC_STRUCT = struct.Struct('>H')
+IPC_SYNC = b'\xff\x55\xaa'
+IPC_HEADER_SIZE = IPC_HEADER_STRUCT.size                       # 9
+IPC_OVERHEAD = IPC_HEADER_SIZE + IPC_CRC_STRUCT.size           # 11
+
+# 데이터 영역 0 채움용 (슬라이스만 사용하므로 프레임마다 할당 없음)
+_ZERO_FILL = memoryview(bytes(IPC_MAX_PACKET_SIZE))
+
+# make_packet_into 데이터 영역 채움용 (값별 IPC_MAX_PACKET_SIZE 바이트 행, 256 x 512 = 128KB)
+_FILL_ROWS = tuple(memoryview(bytes((value,)) * IPC_MAX_PACKET_SIZE) for value in range(256))
+
+# True 로 설정하면 make_lpa_packet_with_can_header 가 프레임마다 CAN 헤더를 출력
+DEBUG_PRINT_CAN_HEADER = False
+
+
+def _check_room(buf, offset: int, packet_size: int) -> None:
+    """buf[offset:] 에 packet_size 바이트를 쓸 공간이 있는지 확인"""
+    if offset < 0 or offset + packet_size > len(buf):
+        raise ValueError(f"버퍼 공간 부족: offset={offset}, 필요={packet_size}, 버퍼={len(buf)}")
+
+
+def _pack_crc_into(view: memoryview, offset: int, end: int) -> None:
+    """view[offset:end] 의 CRC 를 view[end:end+2] 에 기록"""
+    IPC_CRC_STRUCT.pack_into(view, end, calc_crc16(view[offset:end], 0))
+
+
+def make_packet_into(buf, offset: int, add_num: int, ipc_cmd1: int, ipc_cmd2: int,
+                     data_length: int) -> int:
     """
-    IPC 패킷 생성 (C 코드의 ipc_make_packet 함수와 동일)
+    IPC 패킷을 호출자 버퍼에 직접 기록 (C 코드의 ipc_make_packet 함수와 동일)
     
     Args:
+        buf: 기록할 bytearray 또는 쓰기 가능한 memoryview
+        offset: 기록 시작 위치
         add_num: 추가 번호
         ipc_cmd1: 명령어 1
         ipc_cmd2: 명령어 2
         data_length: 데이터 길이
         
     Returns:
-        bytes: 생성된 패킷
+        int: 기록한 바이트 수
     """
-    packet_size = data_length + 11
-    packet = bytearray(packet_size)
-    
-    # 헤더 설정 (C 코드와 동일)
-    packet[0] = 0xFF
-    packet[1] = 0x55
-    packet[2] = 0xAA
+    packet_size = data_length + IPC_OVERHEAD
+    _check_room(buf, offset, packet_size)
     
-    # 명령어 설정 (C 코드와 동일)
-    packet[3] = (ipc_cmd1 >> 8) & 0xFF
-    packet[4] = ipc_cmd1 & 0xFF
-    packet[5] = (ipc_cmd2 >> 8) & 0xFF
-    packet[6] = ipc_cmd2 & 0xFF
-    packet[7] = (data_length >> 8) & 0xFF
-    packet[8] = data_length & 0xFF
+    # 헤더 + 명령어 설정 (C 코드와 동일)
+    IPC_HEADER_STRUCT.pack_into(buf, offset, IPC_SYNC, ipc_cmd1 & 0xFFFF,
+                                ipc_cmd2 & 0xFFFF, data_length & 0xFFFF)
     
     # 데이터 영역 설정 (C 코드와 동일)
-    for i in range(9, packet_size - 2):
-        packet[i] = add_num + 1
+    # bytearray 슬라이스에 다른 타입을 대입하면 임시 bytearray 로 복사되므로 memoryview 로 기록
+    view = memoryview(buf)
+    start = offset + IPC_HEADER_SIZE
+    end = start + data_length
+    if data_length <= IPC_MAX_PACKET_SIZE:
+        view[start:end] = _FILL_ROWS[(add_num + 1) & 0xFF][:data_length]
+    else:
+        view[start:end] = bytes(((add_num + 1) & 0xFF,)) * data_length
     
     # CRC 계산 (C 코드와 동일)
-    crc = calc_crc16(packet[:packet_size-2], 0)
-    packet[packet_size-2] = (crc >> 8) & 0xFF
-    packet[packet_size-1] = crc & 0xFF
+    _pack_crc_into(view, offset, end)
     
+    return packet_size
+
+
+def make_packet(add_num: int, ipc_cmd1: int, ipc_cmd2: int, data_length: int) -> bytes:
+    """
+    IPC 패킷 생성 (C 코드의 ipc_make_packet 함수와 동일)
+    
+    Args:
+        add_num: 추가 번호
+        ipc_cmd1: 명령어 1
+        ipc_cmd2: 명령어 2
+        data_length: 데이터 길이
+        
+    Returns:
+        bytes: 생성된 패킷
+    """
+    packet = bytearray(data_length + IPC_OVERHEAD)
+    make_packet_into(packet, 0, add_num, ipc_cmd1, ipc_cmd2, data_length)
     return bytes(packet)
 
 
@@ -59,10 +116,12 @@ def RTR(x: int) -> int:         return ((x & 0x1) << 37)
 def IDE(x: int) -> int:         return ((x & 0x1) << 38)
 def BRS(x: int) -> int:         return ((x & 0x1) << 39)
 
-def build_CANHeader_py(timestamp_onoff: int,uCAN_ID: int, uFDF: int, uIDE: int, uBRS: int,) -> bytes:
+def build_CANHeader_py_bitwise(timestamp_onoff: int,uCAN_ID: int, uFDF: int, uIDE: int, uBRS: int,) -> bytes:
     """
     C의 build_CANHeader와 동일한 규칙으로 5바이트 CAN 헤더를 생성하여 리턴.
     반환 바이트 순서는 리틀엔디언(LSB first)로 C 코드와 동일.
+
+    C 매크로를 그대로 옮긴 참조 구현. 헤더 테이블 생성 및 결과 검증용.
     """
     can_header_frame = 0
 
@@ -88,6 +147,65 @@ def build_CANHeader_py(timestamp_onoff: int,uCAN_ID: int, uFDF: int, uIDE: int,
     return can_header_frame.to_bytes(5, byteorder="little", signed=False)
 
 
+# build_CANHeader_py 용 Standard ID 헤더 테이블 (조합별로 처음 사용할 때 생성)
+# 인덱스: TIMESTAMP | FDF << 1 | BRS << 2, 각 항목은 ID 0~0x7FF 의 헤더 tuple
+_std_can_header_tables = [None] * 8
+
+
+def _get_std_can_header_table(variant: int) -> tuple:
+    """(TIMESTAMP, FDF, BRS) 조합의 Standard ID 헤더 2048개 리턴"""
+    table = _std_can_header_tables[variant]
+    if table is None:
+        table = tuple(build_CANHeader_py_bitwise(variant & 0x1, can_id, (variant >> 1) & 0x1, 0, variant >> 2)
+                      for can_id in range(0x800))
+        _std_can_header_tables[variant] = table
+    return table
+
+
+@lru_cache(maxsize=4096)
+def _build_ext_can_header(timestamp_onoff: int, uCAN_ID: int, uFDF: int, uBRS: int) -> bytes:
+    """Extended ID(및 테이블 범위 밖 ID) 헤더 메모이즈"""
+    return build_CANHeader_py_bitwise(timestamp_onoff, uCAN_ID, uFDF, 0, uBRS)
+
+
+def build_CANHeader_py(timestamp_onoff: int,uCAN_ID: int, uFDF: int, uIDE: int, uBRS: int,) -> bytes:
+    """
+    C의 build_CANHeader와 동일한 규칙으로 5바이트 CAN 헤더를 생성하여 리턴.
+    반환 바이트 순서는 리틀엔디언(LSB first)로 C 코드와 동일.
+
+    Standard ID 는 미리 계산된 테이블에서, Extended ID 는 메모이즈된 결과에서 찾는다.
+    모든 입력에 대해 build_CANHeader_py_bitwise 와 같은 값을 리턴한다.
+    (uIDE 는 C 코드와 마찬가지로 ID 범위로 다시 결정되므로 사용하지 않음)
+    """
+    fdf = 1 if uFDF == 1 else 0
+    brs = uBRS & 0x1 if fdf else 0
+    timestamp = timestamp_onoff & 0x1
+
+    if 0 <= uCAN_ID <= 0x7FF:
+        variant = timestamp | fdf << 1 | brs << 2
+        table = _std_can_header_tables[variant] or _get_std_can_header_table(variant)
+        return table[uCAN_ID]
+    return _build_ext_can_header(timestamp, uCAN_ID, fdf, brs)
+
+
+def parse_CANHeader_py(can_header) -> tuple:
+    """
+    build_CANHeader_py 로 만든 5바이트 CAN 헤더(송신 패킷)를 다시 필드로 분리
+
+    Args:
+        can_header: 5바이트 CAN 헤더 (리틀엔디언)
+
+    Returns:
+        tuple: (timestamp_onoff, can_id, fdf, ide, brs)
+    """
+    value = int.from_bytes(bytes(can_header[:LPA_TX_HDR_SIZE]), byteorder="little", signed=False)
+    ide = (value >> 38) & 0x1
+    fdf = (value >> 36) & 0x1
+    # Standard ID 라도 CAN FD 이면 C 코드가 CANEXTID 매크로로 기록하므로 ide 로만 마스크를 고른다
+    can_id = (value >> 7) & (0x1FFFFFFF if ide else 0x7FF)
+    return value & 0x1, can_id, fdf, ide, (value >> 39) & 0x1
+
+
 def build_can_header(can_id: int, is_extended: bool = False, is_fd: bool = False, brs: bool = False) -> bytes:
     """
     C 코드의 build_CANHeader 함수를 Python으로 구현
@@ -159,10 +277,138 @@ def build_can_header(can_id: int, is_extended: bool = False, is_fd: bool = False
     return bytes(header)
 
 
+# LPA_TX_HDR_SIZE = 5 (CAN 헤더 크기)
+LPA_TX_HDR_SIZE = 5
+
+
+class LpaPacketTemplate:
+    """
+    경로(cmd, port, can_id, payload 길이)별로 고정되는 LPA 패킷 앞부분
+
+    prefix: IPC 헤더(9) + CAN 헤더(5) 바이트
+    crc: prefix 까지 누적된 Crc16 상태 (프레임마다 copy() 하여 payload 만 추가)
+    packer: prefix + payload + CRC 를 한 번에 쓰는 Struct (*_into 에서 pack_into 1회로 기록)
+    """
+
+    __slots__ = ('prefix', 'can_header', 'crc', 'packer')
+
+    def __init__(self, cmd: int, port: int, can_id: int, data_length: int):
+        # CAN 헤더 생성 (5바이트)
+        # can_header = build_can_header(can_id, is_extended)
+        can_header = build_CANHeader_py(0, can_id, 0, 0, 0)
+
+        # 전체 데이터 길이 계산
+        total_data_length = LPA_TX_HDR_SIZE + data_length
+
+        # IPC 헤더 + 명령어 설정 후 CAN 헤더 복사 (C 코드의 memcpy와 동일)
+        self.prefix = IPC_HEADER_STRUCT.pack(IPC_SYNC, cmd & 0xFFFF, port & 0xFFFF,
+                                             total_data_length & 0xFFFF) + can_header
+        self.can_header = can_header
+        self.crc = Crc16(self.prefix)
+        self.packer = struct.Struct(f'>{len(self.prefix)}s{data_length}sH')
+
+
+class LpaTemplateCache:
+    """
+    LpaPacketTemplate 의 크기 제한 LRU 캐시
+
+    CSV 의 모든 메시지는 주기마다 같은 경로로 재전송되므로
+    경로별 헤더와 헤더까지의 CRC 상태를 재사용한다.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        초기화
+
+        Args:
+            maxsize: 최대 보관 템플릿 수 (초과 시 가장 오래 안 쓴 항목 제거)
+        """
+        self.maxsize = maxsize
+        self._templates = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, cmd: int, port: int, can_id: int, data_length: int) -> LpaPacketTemplate:
+        """경로에 해당하는 템플릿 리턴 (없으면 생성 후 등록)"""
+        key = (cmd, port, can_id, data_length)
+        template = self._templates.get(key)
+        if template is not None:
+            self.hits += 1
+            self._templates.move_to_end(key)
+            return template
+
+        self.misses += 1
+        template = LpaPacketTemplate(cmd, port, can_id, data_length)
+        self._templates[key] = template
+        if len(self._templates) > self.maxsize:
+            self._templates.popitem(last=False)
+            self.evictions += 1
+        return template
+
+    def clear(self) -> None:
+        """템플릿과 카운터 초기화"""
+        self._templates.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> dict:
+        """캐시 효율 확인용 카운터"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._templates),
+            'maxsize': self.maxsize,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+        }
+
+
+# make_lpa_packet_with_can_header 가 사용하는 기본 템플릿 캐시
+lpa_template_cache = LpaTemplateCache()
+
+
+def make_lpa_packet_with_can_header_into(buf, offset: int, data: bytes, can_id: int,
+                                        is_extended: bool = False, cmd: int = 0x0101,
+                                        port: int = 6) -> int:
+    """
+    make_lpa_packet_with_can_header 와 동일한 패킷을 호출자 버퍼에 직접 기록
+
+    경로별 템플릿(lpa_template_cache)의 Struct 로 헤더, payload, CRC 를 pack_into 한 번에 기록하므로
+    프레임마다 새 버퍼를 만들지 않는다 (bytearray 슬라이스 대입의 임시 복사도 없음).
+    
+    Args:
+        buf: 기록할 bytearray 또는 쓰기 가능한 memoryview
+        offset: 기록 시작 위치
+        data: CAN 데이터
+        can_id: CAN ID
+        is_extended: Extended ID 여부
+        cmd: IPC 명령어
+        port: 포트 번호
+        
+    Returns:
+        int: 기록한 바이트 수
+    """
+    template = lpa_template_cache.get(cmd, port, can_id, len(data))
+    packer = template.packer
+    packet_size = packer.size
+    _check_room(buf, offset, packet_size)
+    
+    # 헤더까지 계산된 CRC 에 payload 만 추가하여 헤더/payload/CRC 를 한 번에 기록
+    packer.pack_into(buf, offset, template.prefix, data, crc_hqx(data, template.crc.crcvalue))
+    
+    return packet_size
+
+
 def make_lpa_packet_with_can_header(data: bytes, can_id: int, is_extended: bool = False, 
                                    cmd: int = 0x0101, port: int = 6) -> bytes:
     """
     C 코드의 LPA_msg 함수와 동일한 방식으로 CAN 헤더를 포함한 LPA 패킷 생성
+
+    IPC 헤더와 CAN 헤더는 lpa_template_cache 에서 경로별로 재사용하고
+    payload 와 CRC 만 프레임마다 계산한다.
     
     Args:
         data: CAN 데이터 (최대 8바이트)
@@ -177,50 +423,113 @@ def make_lpa_packet_with_can_header(data: bytes, can_id: int, is_extended: bool
 #    if len(data) > 8:
 #        raise ValueError("CAN 데이터는 최대 8바이트여야 합니다")
     
-    # CAN 헤더 생성 (5바이트)
-    # can_header = build_can_header(can_id, is_extended)
-    can_header = build_CANHeader_py(0, can_id, 0, 0, 0)
-    print(f"CAN 헤더: {can_header.hex()}")
-    
-    # LPA_TX_HDR_SIZE = 5 (CAN 헤더 크기)
-    lpa_tx_hdr_size = 5
-    
-    # 전체 데이터 길이 계산
-    total_data_length = lpa_tx_hdr_size + len(data)
-    
-    # IPC 패킷 생성
-    packet_size = total_data_length + 11  # 헤더(3) + 명령어(6) + 데이터 + CRC(2)
-    packet = bytearray(packet_size)
+    template = lpa_template_cache.get(cmd, port, can_id, len(data))
+    if DEBUG_PRINT_CAN_HEADER:
+        print(f"CAN 헤더: {template.can_header.hex()}")
     
-    # IPC 헤더 설정
-    packet[0] = 0xFF
-    packet[1] = 0x55
-    packet[2] = 0xAA
+    # 헤더까지 계산된 CRC 상태에 payload 만 추가
+    crc = template.crc.copy()
+    crc.update(data)
     
-    # 명령어 설정
-    packet[3] = (cmd >> 8) & 0xFF
-    packet[4] = cmd & 0xFF
-    packet[5] = (port >> 8) & 0xFF
-    packet[6] = port & 0xFF
-    packet[7] = (total_data_length >> 8) & 0xFF
-    packet[8] = total_data_length & 0xFF
+    return b''.join((template.prefix, data, crc.digest()))
+
+
+def make_lpa_packet_into(buf, offset: int, ipc_buff: bytes, ipc_cmd1: int, ipc_cmd2: int,
+                         data_length: int) -> int:
+    """
+    LPA 패킷을 호출자 버퍼에 직접 기록 (C 코드의 ipc_Lpa_packet 함수와 동일)
     
-    # CAN 헤더 복사 (C 코드의 memcpy와 동일)
-    packet[9:9+lpa_tx_hdr_size] = can_header
+    Args:
+        buf: 기록할 bytearray 또는 쓰기 가능한 memoryview
+        offset: 기록 시작 위치
+        ipc_buff: IPC 버퍼 데이터
+        ipc_cmd1: 명령어 1
+        ipc_cmd2: 명령어 2
+        data_length: 데이터 길이
+        
+    Returns:
+        int: 기록한 바이트 수
+    """
+    packet_size = data_length + IPC_OVERHEAD
+    _check_room(buf, offset, packet_size)
     
-    # CAN 데이터 복사 (C 코드의 memcpy와 동일)
-    packet[9+lpa_tx_hdr_size:9+lpa_tx_hdr_size+len(data)] = data
+    # 헤더 + 명령어 설정 (C 코드와 동일)
+    IPC_HEADER_STRUCT.pack_into(buf, offset, IPC_SYNC, ipc_cmd1 & 0xFFFF,
+                                ipc_cmd2 & 0xFFFF, data_length & 0xFFFF)
     
-    # 나머지 영역을 0으로 채움
-    for i in range(9+lpa_tx_hdr_size+len(data), packet_size-2):
-        packet[i] = 0
+    # 데이터 영역 설정 (C 코드와 동일, 버퍼가 부족한 경우 0으로 채움, make_packet_into 와 같이 memoryview 로 기록)
+    view = memoryview(buf)
+    start = offset + IPC_HEADER_SIZE
+    end = start + data_length
+    copy_length = min(len(ipc_buff), data_length)
+    view[start:start+copy_length] = memoryview(ipc_buff)[:copy_length]
+    pad_start = start + copy_length
+    while pad_start < end:
+        pad_length = min(end - pad_start, len(_ZERO_FILL))
+        view[pad_start:pad_start+pad_length] = _ZERO_FILL[:pad_length]
+        pad_start += pad_length
     
-    # CRC 계산
-    crc = calc_crc16(packet[:packet_size-2], 0)
-    packet[packet_size-2] = (crc >> 8) & 0xFF
-    packet[packet_size-1] = crc & 0xFF
+    # CRC 계산 (C 코드와 동일)
+    _pack_crc_into(view, offset, end)
     
-    return bytes(packet)
+    return packet_size
+
+
+def make_lpa_packets_with_can_header_batch(payloads, can_ids, ports, cmd: int = 0x0101):
+    """
+    같은 payload 길이의 LPA 패킷 N 개를 한 번에 생성 (NumPy 필요)
+
+    make_lpa_packet_with_can_header 를 행마다 호출한 것과 동일한 바이트를 만든다.
+    (build_CANHeader_py(0, can_id, 0, 0, 0) 규칙: 0x7FF 초과 ID 는 Extended)
+
+    Args:
+        payloads: (N, L) uint8 payload 배열
+        can_ids: (N,) CAN ID 배열
+        ports: (N,) 포트 번호 배열 (또는 스칼라)
+        cmd: IPC 명령어
+
+    Returns:
+        numpy.ndarray: (N, L + 16) uint8 패킷 배열
+    """
+    if np is None:
+        raise ImportError("make_lpa_packets_with_can_header_batch 는 numpy 가 필요합니다")
+
+    payloads = np.asarray(payloads, dtype=np.uint8)
+    if payloads.ndim != 2:
+        raise ValueError(f"(N, L) payload 배열이 필요합니다: shape={payloads.shape}")
+    n_frames, data_length = payloads.shape
+    can_ids = np.broadcast_to(np.asarray(can_ids, dtype=np.uint64), (n_frames,))
+    ports = np.broadcast_to(np.asarray(ports, dtype=np.uint64), (n_frames,))
+
+    total_data_length = LPA_TX_HDR_SIZE + data_length
+    packets = np.empty((n_frames, data_length + IPC_OVERHEAD + LPA_TX_HDR_SIZE), dtype=np.uint8)
+
+    # IPC 헤더 (빅엔디언)
+    packets[:, 0:3] = np.frombuffer(IPC_SYNC, dtype=np.uint8)
+    packets[:, 3] = (cmd >> 8) & 0xFF
+    packets[:, 4] = cmd & 0xFF
+    packets[:, 5] = (ports >> np.uint64(8)) & np.uint64(0xFF)
+    packets[:, 6] = ports & np.uint64(0xFF)
+    packets[:, 7] = (total_data_length >> 8) & 0xFF
+    packets[:, 8] = total_data_length & 0xFF
+
+    # CAN 헤더 (build_CANHeader_py 와 동일한 비트 배치, 리틀엔디언 5바이트)
+    extended = can_ids > np.uint64(0x7FF)
+    header = np.where(extended,
+                      ((can_ids & np.uint64(0x1FFFFFFF)) << np.uint64(7)) | np.uint64(IDE(1)),
+                      (can_ids & np.uint64(0x7FF)) << np.uint64(7))
+    for i in range(LPA_TX_HDR_SIZE):
+        packets[:, 9 + i] = (header >> np.uint64(8 * i)) & np.uint64(0xFF)
+
+    # payload
+    packets[:, 9 + LPA_TX_HDR_SIZE:-2] = payloads
+
+    # CRC (빅엔디언)
+    crc = calc_crc16_batch(packets[:, :-2], 0)
+    packets[:, -2] = crc >> 8
+    packets[:, -1] = crc & 0xFF
+
+    return packets
 
 
 def make_lpa_packet(ipc_buff: bytes, ipc_cmd1: int, ipc_cmd2: int, data_length: int) -> bytes:
@@ -236,38 +545,236 @@ def make_lpa_packet(ipc_buff: bytes, ipc_cmd1: int, ipc_cmd2: int, data_length:
     Returns:
         bytes: 생성된 패킷
     """
-    packet_size = data_length + 11
-    packet = bytearray(packet_size)
-    
-    # 헤더 설정 (C 코드와 동일)
-    packet[0] = 0xFF
-    packet[1] = 0x55
-    packet[2] = 0xAA
-    
-    # 명령어 설정 (C 코드와 동일)
-    packet[3] = (ipc_cmd1 >> 8) & 0xFF
-    packet[4] = ipc_cmd1 & 0xFF
-    packet[5] = (ipc_cmd2 >> 8) & 0xFF
-    packet[6] = ipc_cmd2 & 0xFF
-    packet[7] = (data_length >> 8) & 0xFF
-    packet[8] = data_length & 0xFF
-    
-    # 데이터 영역 설정 (C 코드와 동일)
-    for i in range(9, packet_size - 2):
-        if i - 9 < len(ipc_buff):
-            packet[i] = ipc_buff[i-9]
-        else:
-            packet[i] = 0  # 버퍼가 부족한 경우 0으로 채움
-    
-    # CRC 계산 (C 코드와 동일)
-    crc = calc_crc16(packet[:packet_size-2], 0)
-    packet[packet_size-2] = (crc >> 8) & 0xFF
-    packet[packet_size-1] = crc & 0xFF
-    
+    packet = bytearray(data_length + IPC_OVERHEAD)
+    make_lpa_packet_into(packet, 0, ipc_buff, ipc_cmd1, ipc_cmd2, data_length)
     return bytes(packet)
 
 
-def parse_lpa_packet_with_can_header(packet_data: bytes):
+class PacketBufferPool:
+    """
+    재사용 가능한 송신 버퍼 풀
+
+    *_into 빌더와 함께 사용하여 송신 루프에서 프레임마다 버퍼를 만들지 않도록 한다.
+    can_sender_app 의 CSV 송신 루프는 이 풀 대신 compile_test_plan 으로 미리 인코딩한 프레임을 보내므로,
+    이 풀은 프레임을 그때그때 만들어야 하는 경로(대화형 송신, 도구)용이다.
+    acquire/release 는 deque 의 원자적 연산만 사용하므로 스레드 간 공유 가능.
+
+    Example:
+        with tx_buffer_pool.borrow() as buf:
+            n = make_lpa_packet_with_can_header_into(buf, 0, data, can_id)
+            ipc.write_data(memoryview(buf)[:n])
+    """
+
+    def __init__(self, count: int = 4, buffer_size: int = IPC_MAX_PACKET_SIZE):
+        """
+        초기화
+
+        Args:
+            count: 미리 만들어 둘 버퍼 수
+            buffer_size: 버퍼 하나의 크기 (C 코드의 writeBuf 와 동일한 512)
+        """
+        self.buffer_size = buffer_size
+        self._free = deque(bytearray(buffer_size) for _ in range(count))
+        self.allocated = count
+
+    def acquire(self) -> bytearray:
+        """버퍼 하나를 꺼냄 (비어 있으면 새로 할당)"""
+        try:
+            return self._free.pop()
+        except IndexError:
+            self.allocated += 1
+            return bytearray(self.buffer_size)
+
+    def release(self, buf: bytearray) -> None:
+        """사용이 끝난 버퍼 반환"""
+        if len(buf) == self.buffer_size:
+            self._free.append(buf)
+
+    @contextmanager
+    def borrow(self):
+        """with 문으로 버퍼를 빌렸다가 자동 반환"""
+        buf = self.acquire()
+        try:
+            yield buf
+        finally:
+            self.release(buf)
+
+
+# 송신 루프 공용 버퍼 풀
+tx_buffer_pool = PacketBufferPool()
+
+
+# 수신 프레임 헤더(15바이트) 레이아웃 (리틀엔디언)
+# 0~7: 비트 패킹된 frame_type/port/timestamp, 8~9: timestamp_us_h 중간, 10: us_h 최상위 + protocol,
+# 11~14: CAN/LIN/Ext ID + FDF/RTR/IDE
+RX_HEADER_STRUCT = struct.Struct('<QHBI')
+RX_HEADER_SIZE = RX_HEADER_STRUCT.size                         # 15
+
+
+class RxFrame:
+    """
+    수신 프레임 헤더(15바이트) 파싱 결과 (C 코드의 parse_data_frame 과 동일한 필드)
+
+    dict 대신 __slots__ 객체로 만들어 프레임마다 생성 비용을 줄인다.
+    기존 dict 방식 접근(frame['can_id'])도 그대로 지원한다.
+    """
+
+    __slots__ = ('frame_type', 'source_port', 'timestamp_ns', 'timestamp_us_l', 'timestamp_us_h',
+                 'protocol_type', 'can_id', 'lin_id', 'ext_can_id', 'fdf', 'rtr', 'ide')
+
+    def __init__(self, frame_type: int = 0, source_port: int = 0, timestamp_ns: int = 0,
+                 timestamp_us_l: int = 0, timestamp_us_h: int = 0, protocol_type: int = 0,
+                 can_id: int = 0, lin_id: int = 0, ext_can_id: int = 0,
+                 fdf: int = 0, rtr: int = 0, ide: int = 0):
+        self.frame_type = frame_type
+        self.source_port = source_port
+        self.timestamp_ns = timestamp_ns
+        self.timestamp_us_l = timestamp_us_l
+        self.timestamp_us_h = timestamp_us_h
+        self.protocol_type = protocol_type
+        self.can_id = can_id
+        self.lin_id = lin_id
+        self.ext_can_id = ext_can_id
+        self.fdf = fdf
+        self.rtr = rtr
+        self.ide = ide
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> 'RxFrame':
+        """
+        buffer[offset:offset+15] 를 C 코드와 동일한 비트 연산으로 파싱
+
+        Args:
+            buffer: bytes-like 버퍼
+            offset: 헤더 시작 위치
+
+        Returns:
+            RxFrame: 파싱 결과
+        """
+        low, mid, top, ident = RX_HEADER_STRUCT.unpack_from(buffer, offset)
+        frame = cls.__new__(cls)
+        frame.frame_type = low & 0x01
+        frame.source_port = (low >> 1) & 0xFF
+        frame.timestamp_ns = ((low >> 9) & 0xFF) * 10
+        frame.timestamp_us_l = (low >> 17) & 0xFFFFFFFF
+        frame.timestamp_us_h = (low >> 49) | (mid << 15) | ((top & 0x01) << 31)
+        frame.protocol_type = top >> 7
+        frame.can_id = ident & 0x7FF
+        frame.lin_id = ident & 0x3F
+        frame.ext_can_id = ident & 0x1FFFFFFF
+        frame.fdf = (ident >> 29) & 0x01
+        frame.rtr = (ident >> 30) & 0x01
+        frame.ide = ident >> 31
+        return frame
+
+    def pack_into(self, buffer, offset: int = 0) -> None:
+        """
+        unpack_from 의 역변환: 15바이트 수신 프레임 헤더를 buffer[offset:] 에 기록
+
+        ID 필드는 ide 이면 ext_can_id, LIN(protocol_type=1) 이면 lin_id, 아니면 can_id 를 쓴다.
+
+        Args:
+            buffer: 쓰기 가능한 bytes-like 버퍼
+            offset: 헤더 시작 위치
+        """
+        us_h = self.timestamp_us_h & 0xFFFFFFFF
+        low = ((self.frame_type & 0x01)
+               | (self.source_port & 0xFF) << 1
+               | ((self.timestamp_ns // 10) & 0xFF) << 9
+               | (self.timestamp_us_l & 0xFFFFFFFF) << 17
+               | (us_h & 0x7FFF) << 49)
+        top = (us_h >> 31) | (self.protocol_type & 0x01) << 7
+        if self.ide:
+            ident = self.ext_can_id & 0x1FFFFFFF
+        elif self.protocol_type:
+            ident = self.lin_id & 0x3F
+        else:
+            ident = self.can_id & 0x7FF
+        ident |= (self.fdf & 0x01) << 29 | (self.rtr & 0x01) << 30 | (self.ide & 0x01) << 31
+        RX_HEADER_STRUCT.pack_into(buffer, offset, low, (us_h >> 15) & 0xFFFF, top, ident)
+
+    def pack(self) -> bytes:
+        """15바이트 수신 프레임 헤더 (라우터 시뮬레이터 등에서 수신 패킷 생성용)"""
+        buffer = bytearray(RX_HEADER_SIZE)
+        self.pack_into(buffer)
+        return bytes(buffer)
+
+    @property
+    def is_extended(self) -> bool:
+        """Extended ID 여부"""
+        return self.ide == 1
+
+    @property
+    def is_fd(self) -> bool:
+        """CAN FD 여부"""
+        return self.fdf == 1
+
+    @property
+    def is_remote(self) -> bool:
+        """RTR 여부"""
+        return self.rtr == 1
+
+    def __getitem__(self, key: str):
+        """기존 dict 방식 접근 호환 (frame['can_id'])"""
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def to_dict(self) -> dict:
+        """기존 parse_can_header 와 동일한 15개 키의 dict 로 변환"""
+        result = {name: getattr(self, name) for name in self.__slots__}
+        result['is_extended'] = self.is_extended
+        result['is_fd'] = self.is_fd
+        result['is_remote'] = self.is_remote
+        return result
+
+    def __repr__(self) -> str:
+        return (f"RxFrame(port={self.source_port}, can_id=0x{self.can_id:X}, "
+                f"ext_can_id=0x{self.ext_can_id:X}, fdf={self.fdf}, rtr={self.rtr}, ide={self.ide})")
+
+
+class LpaPacket:
+    """
+    parse_lpa_packet_with_can_header 파싱 결과
+
+    기존 dict 방식 접근(packet['payload'])도 그대로 지원한다.
+    """
+
+    __slots__ = ('valid', 'cmd', 'port', 'can_header', 'payload', 'crc', 'crc_valid')
+
+    def __init__(self, valid: bool = False, cmd: int = 0, port: int = 0, can_header: bytes = b'',
+                 payload: bytes = b'', crc: int = 0, crc_valid: bool = False):
+        self.valid = valid
+        self.cmd = cmd
+        self.port = port
+        self.can_header = can_header
+        self.payload = payload
+        self.crc = crc
+        self.crc_valid = crc_valid
+
+    @property
+    def rx_frame(self) -> RxFrame:
+        """수신 프레임 헤더 파싱 결과 (접근할 때만 파싱)"""
+        return parse_can_header(self.can_header)
+
+    def __getitem__(self, key: str):
+        """기존 dict 방식 접근 호환 (packet['payload'])"""
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def to_dict(self) -> dict:
+        """기존 parse_lpa_packet_with_can_header 와 동일한 7개 키의 dict 로 변환"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return (f"LpaPacket(valid={self.valid}, cmd=0x{self.cmd:04x}, port={self.port}, "
+                f"payload={bytes(self.payload).hex()}, crc=0x{self.crc:04x}, crc_valid={self.crc_valid})")
+
+
+def parse_lpa_packet_with_can_header(packet_data: bytes) -> LpaPacket:
     """
     make_lpa_packet_with_can_header로 생성된 패킷을 파싱하여 실제 payload 추출
     
@@ -275,200 +782,434 @@ def parse_lpa_packet_with_can_header(packet_data: bytes):
         packet_data: 수신된 패킷 데이터
         
     Returns:
-        dict: 파싱된 정보
-        {
-            'valid': bool,           # 패킷 유효성
-            'cmd': int,              # IPC 명령어
-            'port': int,             # 포트 번호
-            'can_header': bytes,     # CAN 헤더 (5바이트)
-            'payload': bytes,        # 실제 CAN 데이터 (payload)
-            'crc': int,              # CRC 값
-            'crc_valid': bool        # CRC 검증 결과
-        }
+        LpaPacket: 파싱된 정보
+            valid: 패킷 유효성
+            cmd: IPC 명령어
+            port: 포트 번호
+            can_header: 수신 프레임 헤더 (15바이트)
+            payload: 실제 CAN 데이터 (payload)
+            crc: CRC 값
+            crc_valid: CRC 검증 결과
     """
-    result = {
-        'valid': False,
-        'cmd': 0,
-        'port': 0,
-        'can_header': b'',
-        'payload': b'',
-        'crc': 0,
-        'crc_valid': False
-    }
-    
     # 최소 패킷 크기 확인 (IPC 헤더 3 + 명령어 4 + 데이터길이 2 + CAN헤더 5 + CRC 2 = 16바이트)
-    # 최소 패킷 크기 확인 (IPC 헤더 3 + 명령어 4 + 데이터길이 2 + Timestamp 15 바이트 + CAN헤더 5 + CRC 2 = 16바이트)
-
-
     if len(packet_data) < 16:
-        return result
+        return LpaPacket()
     
-    # IPC 헤더 확인 (0xFF 0x55 0xAA)
-    if packet_data[0:3] != b'\xff\x55\xaa':
-        return result
-    
-    # 명령어와 포트 추출
-    cmd = (packet_data[3] << 8) | packet_data[4]
-    port = (packet_data[5] << 8) | packet_data[6]
-    data_length = (packet_data[7] << 8) | packet_data[8]
+    # IPC 헤더 확인 (0xFF 0x55 0xAA) 및 명령어/포트/데이터 길이 추출
+    sync, cmd, port, data_length = IPC_HEADER_STRUCT.unpack_from(packet_data, 0)
+    if sync != IPC_SYNC:
+        return LpaPacket()
     
     # 전체 패킷 크기 확인
-    expected_packet_size = 11 + data_length  # 헤더(3) + 명령어(4) + 데이터길이(2) + 데이터(data_length) + CRC(2)
+    expected_packet_size = IPC_OVERHEAD + data_length  # 헤더(3) + 명령어(4) + 데이터길이(2) + 데이터(data_length) + CRC(2)
     if len(packet_data) < expected_packet_size:
-        return result
+        return LpaPacket()
     
-    # CAN 헤더 추출 (5바이트)
-    can_header = packet_data[9:24]
-
+    # 수신 프레임 헤더 추출 (15바이트)
+    can_header = packet_data[IPC_HEADER_SIZE:IPC_HEADER_SIZE + RX_HEADER_SIZE]
     
-    # 실제 payload 추출 (CAN 헤더 이후부터 CRC 이전까지)
-    payload_length = data_length - 15   # 전체 데이터 길이에서 CAN 헤더(5바이트) 제외
+    # 실제 payload 추출 (수신 프레임 헤더 이후부터)
+    payload_start = IPC_HEADER_SIZE + RX_HEADER_SIZE
+    payload_length = data_length - RX_HEADER_SIZE
     if payload_length > 0:
-        payload = packet_data[24:24 + payload_length]
+        payload = packet_data[payload_start:payload_start + payload_length]
     else:
         payload = b''
     
-    # CRC 추출 및 검증
+    # CRC 추출 및 검증 (슬라이스 복사 없이 IPC 헤더 / 수신 프레임 순서로 누적)
+    view = memoryview(packet_data)
     received_crc = (packet_data[-2] << 8) | packet_data[-1]
-    calculated_crc = calc_crc16(packet_data[:-2], 0)
-    crc_valid = (received_crc == calculated_crc)
-    
-    result.update({
-        'valid': True,
-        'cmd': cmd,
-        'port': port,
-        'can_header': can_header,
-        'payload': payload,
-        'crc': received_crc,
-        'crc_valid': crc_valid
-    })
+    crc = Crc16(view[:IPC_HEADER_SIZE])
+    crc.update(view[IPC_HEADER_SIZE:-2])
     
-    return result
+    return LpaPacket(True, cmd, port, can_header, payload, received_crc, received_crc == crc.crcvalue)
 
 
-def parse_can_header(buffer: bytes):
+def parse_can_header(buffer: bytes) -> RxFrame:
     """
     수신 프레임 헤더(15바이트)를 파싱하여 수신 정보 추출
+
+    C 코드의 parse_data_frame 과 동일한 비트 연산을 RX_HEADER_STRUCT 언팩 결과에 적용한다.
     
     Args:
         buffer: 15바이트 수신 프레임 헤더
         
     Returns:
-        dict: 수신 프레임 정보
-        {
-            'frame_type': int,           # 프레임 타입 (0 또는 1)
-            'source_port': int,          # 소스 포트 번호
-            'timestamp_ns': int,         # 나노초 타임스탬프
-            'timestamp_us_l': int,       # 마이크로초 타임스탬프 (하위 32비트)
-            'timestamp_us_h': int,       # 마이크로초 타임스탬프 (상위 32비트)
-            'protocol_type': int,        # 프로토콜 타입 (0 또는 1)
-            'can_id': int,              # CAN ID (Standard)
-            'lin_id': int,              # LIN ID
-            'ext_can_id': int,          # Extended CAN ID
-            'fdf': int,                 # FDF 비트 (0 또는 1)
-            'rtr': int,                 # RTR 비트 (0 또는 1)
-            'ide': int,                 # IDE 비트 (0 또는 1)
-            'is_extended': bool,        # Extended ID 여부
-            'is_fd': bool,             # CAN FD 여부
-            'is_remote': bool           # RTR 여부
-        }
+        RxFrame: 수신 프레임 정보
+            frame_type: 프레임 타입 (0 또는 1)
+            source_port: 소스 포트 번호
+            timestamp_ns: 나노초 타임스탬프
+            timestamp_us_l: 마이크로초 타임스탬프 (하위 32비트)
+            timestamp_us_h: 마이크로초 타임스탬프 (상위 32비트)
+            protocol_type: 프로토콜 타입 (0 또는 1)
+            can_id: CAN ID (Standard)
+            lin_id: LIN ID
+            ext_can_id: Extended CAN ID
+            fdf / rtr / ide: FDF, RTR, IDE 비트 (0 또는 1)
+            is_extended / is_fd / is_remote: 편의용 boolean (접근 시 계산)
     """
-    result = {
-        'frame_type': 0,
-        'source_port': 0,
-        'timestamp_ns': 0,
-        'timestamp_us_l': 0,
-        'timestamp_us_h': 0,
-        'protocol_type': 0,
-        'can_id': 0,
-        'lin_id': 0,
-        'ext_can_id': 0,
-        'fdf': 0,
-        'rtr': 0,
-        'ide': 0,
-        'is_extended': False,
-        'is_fd': False,
-        'is_remote': False
-    }
-    
-    if len(buffer) < 15:
-        return result
+    if len(buffer) < RX_HEADER_SIZE:
+        return RxFrame()
     
-    # C 코드와 동일한 비트 연산으로 파싱
-    # rx_frame_type = buffer[0] & 0x01U;
-    result['frame_type'] = buffer[0] & 0x01
-    
-    # rx_sourcePort = ((buffer[0] & 0xFEU) >> 1U) + ((buffer[1] & 0x01U) << 7U);
-    result['source_port'] = ((buffer[0] & 0xFE) >> 1) + ((buffer[1] & 0x01) << 7)
-    
-    # rx_timeStamp_ns = (((uint16)buffer[1] & 0xFEU) >> 1U);
-    # rx_timeStamp_ns |= (((uint16)buffer[2] & 0x01U) << 7U);
-    # rx_timeStamp_ns *= 10U;
-    result['timestamp_ns'] = (((buffer[1] & 0xFE) >> 1) | ((buffer[2] & 0x01) << 7)) * 10
-    
-    # rx_timeStamp_us_L = ((uint32)buffer[2] >> 1U);
-    # rx_timeStamp_us_L |= ((uint32)buffer[3] << 7U);
-    # rx_timeStamp_us_L |= ((uint32)buffer[4] << 15U);
-    # rx_timeStamp_us_L |= ((uint32)buffer[5] << 23U);
-    # rx_timeStamp_us_L |= (((uint32)buffer[6] & 0x01U) << 31U);
-    result['timestamp_us_l'] = ((buffer[2] >> 1) | 
-                               (buffer[3] << 7) | 
-                               (buffer[4] << 15) | 
-                               (buffer[5] << 23) | 
-                               ((buffer[6] & 0x01) << 31))
-    
-    # rx_timeStamp_us_H = ((uint32)buffer[6] >> 1U);
-    # rx_timeStamp_us_H |= ((uint32)buffer[7] << 7U);
-    # rx_timeStamp_us_H |= ((uint32)buffer[8] << 15U);
-    # rx_timeStamp_us_H |= ((uint32)buffer[9] << 23U);
-    # rx_timeStamp_us_H |= (((uint32)buffer[10] & 0x01U) << 31U);
-    result['timestamp_us_h'] = ((buffer[6] >> 1) | 
-                               (buffer[7] << 7) | 
-                               (buffer[8] << 15) | 
-                               (buffer[9] << 23) | 
-                               ((buffer[10] & 0x01) << 31))
-    
-    # rx_protocol_type = ((buffer[10] & 0x80U) == 0x80U)?1U:0U;
-    result['protocol_type'] = 1 if (buffer[10] & 0x80) == 0x80 else 0
-    
-    # rx_can_id = lpa_u16add((uint16)buffer[11], ((uint16)buffer[12] & 0x07U) << 8U);
-    result['can_id'] = buffer[11] + ((buffer[12] & 0x07) << 8)
-    
-    # rx_lin_id = (uint16)buffer[11] & 0x3FU;
-    result['lin_id'] = buffer[11] & 0x3F
-    
-    # rx_extCan_id = (uint32)buffer[11];
-    # rx_extCan_id |= ((uint32)buffer[12] << 8U);
-    # rx_extCan_id |= ((uint32)buffer[13] << 16U);
-    # rx_extCan_id |= (((uint32)buffer[14] & 0x1FU) << 24U);
-    result['ext_can_id'] = (buffer[11] | 
-                           (buffer[12] << 8) | 
-                           (buffer[13] << 16) | 
-                           ((buffer[14] & 0x1F) << 24))
-    
-    # rx_fdf = ((buffer[14] & 0x20U) == 0x20U)?1U:0U;
-    result['fdf'] = 1 if (buffer[14] & 0x20) == 0x20 else 0
-    
-    # rx_rtr = ((buffer[14] & 0x40U) == 0x40U)?1U:0U;
-    result['rtr'] = 1 if (buffer[14] & 0x40) == 0x40 else 0
-    
-    # rx_ide = ((buffer[14] & 0x80U) == 0x80U)?1U:0U;
-    result['ide'] = 1 if (buffer[14] & 0x80) == 0x80 else 0
-    
-    # 편의를 위한 boolean 값들
-    result['is_extended'] = bool(result['ide'])
-    result['is_fd'] = bool(result['fdf'])
-    result['is_remote'] = bool(result['rtr'])
-    
-    return result
-
-
-def parse_multiple_packets(data: bytes):
-    """여러 IPC 패킷을 분리하여 개별 처리"""
+    return RxFrame.unpack_from(buffer)
+
+
+# parse_can_headers 결과 structured array 의 필드 (RxFrame 과 동일한 이름)
+RX_FRAME_DTYPE = None if np is None else np.dtype([
+    ('frame_type', np.uint8),
+    ('source_port', np.uint8),
+    ('timestamp_ns', np.uint16),
+    ('timestamp_us_l', np.uint32),
+    ('timestamp_us_h', np.uint32),
+    ('protocol_type', np.uint8),
+    ('can_id', np.uint16),
+    ('lin_id', np.uint8),
+    ('ext_can_id', np.uint32),
+    ('fdf', np.uint8),
+    ('rtr', np.uint8),
+    ('ide', np.uint8),
+])
+
+
+def parse_can_headers(headers):
+    """
+    수신 프레임 헤더 N 개를 한 번에 파싱 (NumPy 필요)
+
+    장시간 수신 캡처 오프라인 분석용. C 코드의 parse_data_frame 과 동일한 비트 연산을
+    열(바이트 위치) 단위로 적용하며 결과는 parse_can_header 와 필드별로 같다.
+
+    Args:
+        headers: (N, 15) uint8 배열 또는 15바이트 헤더를 이어붙인 bytes-like
+
+    Returns:
+        numpy.ndarray: (N,) RX_FRAME_DTYPE structured array
+    """
+    if np is None:
+        raise ImportError("parse_can_headers 는 numpy 가 필요합니다")
+
+    if isinstance(headers, np.ndarray):
+        headers = headers.astype(np.uint8, copy=False)
+    else:
+        headers = np.frombuffer(headers, dtype=np.uint8)
+    if headers.ndim == 1:
+        if headers.size % RX_HEADER_SIZE:
+            raise ValueError(f"헤더 바이트 수가 {RX_HEADER_SIZE}의 배수가 아닙니다: {headers.size}")
+        headers = headers.reshape(-1, RX_HEADER_SIZE)
+    if headers.ndim != 2 or headers.shape[1] < RX_HEADER_SIZE:
+        raise ValueError(f"(N, {RX_HEADER_SIZE}) 배열이 필요합니다: shape={headers.shape}")
+
+    b = [headers[:, i].astype(np.uint32) for i in range(RX_HEADER_SIZE)]
+    frames = np.empty(headers.shape[0], dtype=RX_FRAME_DTYPE)
+
+    frames['frame_type'] = b[0] & 0x01
+    frames['source_port'] = ((b[0] & 0xFE) >> 1) + ((b[1] & 0x01) << 7)
+    frames['timestamp_ns'] = (((b[1] & 0xFE) >> 1) | ((b[2] & 0x01) << 7)) * 10
+    frames['timestamp_us_l'] = (b[2] >> 1) | (b[3] << 7) | (b[4] << 15) | (b[5] << 23) | ((b[6] & 0x01) << 31)
+    frames['timestamp_us_h'] = (b[6] >> 1) | (b[7] << 7) | (b[8] << 15) | (b[9] << 23) | ((b[10] & 0x01) << 31)
+    frames['protocol_type'] = (b[10] & 0x80) >> 7
+    frames['can_id'] = b[11] + ((b[12] & 0x07) << 8)
+    frames['lin_id'] = b[11] & 0x3F
+    frames['ext_can_id'] = b[11] | (b[12] << 8) | (b[13] << 16) | ((b[14] & 0x1F) << 24)
+    frames['fdf'] = (b[14] & 0x20) >> 5
+    frames['rtr'] = (b[14] & 0x40) >> 6
+    frames['ide'] = (b[14] & 0x80) >> 7
+
+    return frames
+
+
+class IpcFramer:
+    """
+    read 단위로 잘려 들어오는 바이트 스트림에서 IPC 패킷을 재조립하는 스트리밍 프레이머
+
+    - 임의 크기의 chunk 를 feed() 로 넣으면 완성된 패킷만 리턴하고 나머지는 다음 호출까지 보관
+    - 헤더(FF 55 AA) 이전의 쓰레기 바이트, 길이 초과 헤더, CRC 오류 시 다음 헤더 위치로 재동기화
+      (resyncs 는 동기를 잃은 뒤 다시 정상 패킷을 찾은 횟수)
+    - CRC 검증이 끝난 패킷을 복사 없는 memoryview 로 리턴
+    - 출력(print) 없이 카운터(packets, resyncs, crc_errors, discarded_bytes)만 갱신
+
+    리턴된 memoryview 는 feed 에 넣은 chunk(또는 내부 보관 버퍼)를 참조하므로
+    chunk 로 쓴 버퍼를 재사용하기 전에 소비해야 한다.
+    """
+
+    def __init__(self, max_packet_size: int = IPC_MAX_PACKET_SIZE, verify_crc: bool = True):
+        """
+        초기화
+
+        Args:
+            max_packet_size: 허용하는 최대 패킷 크기 (초과하는 길이 필드는 잘못된 헤더로 간주)
+            verify_crc: CRC 검증 여부
+        """
+        self.max_packet_size = max_packet_size
+        self.verify_crc = verify_crc
+        self._pending = None
+        self._sync_lost = False
+        self.packets = 0
+        self.resyncs = 0
+        self.crc_errors = 0
+        self.discarded_bytes = 0
+
+    @property
+    def pending(self) -> int:
+        """다음 feed 를 기다리는 미완성 바이트 수"""
+        return len(self._pending) if self._pending else 0
+
+    def reset(self) -> None:
+        """보관 중인 미완성 데이터와 카운터 초기화"""
+        self._pending = None
+        self._sync_lost = False
+        self.packets = 0
+        self.resyncs = 0
+        self.crc_errors = 0
+        self.discarded_bytes = 0
+
+    def stats(self) -> dict:
+        """프레이머 카운터"""
+        return {
+            'packets': self.packets,
+            'resyncs': self.resyncs,
+            'crc_errors': self.crc_errors,
+            'discarded_bytes': self.discarded_bytes,
+            'pending': self.pending,
+        }
+
+    def _scan(self, data, view, pos: int, size: int, emit) -> int:
+        """
+        data[pos:size] 에서 완성된 패킷을 찾아 memoryview 로 emit(packet) 호출
+
+        Args:
+            data: 수신 버퍼 (bytes / bytearray)
+            view: data 의 memoryview
+            pos: 검색 시작 위치
+            size: 유효 데이터 끝 위치
+            emit: 찾은 패킷을 받는 함수 (예: list.append)
+
+        Returns:
+            int: 다음 데이터를 기다려야 하는 미완성 부분의 시작 위치 (없으면 size)
+        """
+        max_packet_size = self.max_packet_size
+        keep_from = size
+
+        while pos < size:
+            header_pos = data.find(IPC_SYNC, pos, size)
+            if header_pos < 0:
+                # 헤더 일부(FF / FF 55)가 끝에 걸쳐 있을 수 있으므로 최대 2바이트 보관
+                keep_from = max(pos, size - (len(IPC_SYNC) - 1))
+                while keep_from < size and data[keep_from] != IPC_SYNC[0]:
+                    keep_from += 1
+                if keep_from > pos:
+                    self.discarded_bytes += keep_from - pos
+                    self._sync_lost = True
+                break
+            if header_pos > pos:
+                self.discarded_bytes += header_pos - pos
+                self._sync_lost = True
+
+            if size - header_pos < IPC_HEADER_SIZE:
+                keep_from = header_pos
+                break
+
+            packet_size = ((data[header_pos + 7] << 8) | data[header_pos + 8]) + IPC_OVERHEAD
+            if packet_size > max_packet_size:
+                # 잘못된 길이 필드: 다음 헤더 후보로 재동기화
+                self._sync_lost = True
+                self.discarded_bytes += 1
+                pos = header_pos + 1
+                continue
+
+            end = header_pos + packet_size
+            if end > size:
+                keep_from = header_pos
+                break
+
+            if self.verify_crc:
+                received_crc = (data[end - 2] << 8) | data[end - 1]
+                if calc_crc16(view[header_pos:end - 2], 0) != received_crc:
+                    # CRC 오류: 다음 헤더 후보로 재동기화
+                    self.crc_errors += 1
+                    self._sync_lost = True
+                    self.discarded_bytes += 1
+                    pos = header_pos + 1
+                    continue
+
+            if self._sync_lost:
+                self.resyncs += 1
+                self._sync_lost = False
+            self.packets += 1
+            emit(view[header_pos:end])
+            pos = end
+        else:
+            keep_from = size
+
+        return keep_from
+
+    def feed(self, chunk) -> list:
+        """
+        read 로 받은 chunk 를 추가하고 완성된 패킷 리스트 리턴
+
+        Args:
+            chunk: bytes-like 수신 데이터
+
+        Returns:
+            list: 검증된 패킷들의 memoryview (순서대로)
+        """
+        if self._pending:
+            data = self._pending
+            data += chunk
+        elif isinstance(chunk, (bytes, bytearray)):
+            data = chunk
+        else:
+            data = bytes(chunk)
+
+        view = memoryview(data)
+        size = len(data)
+        packets = []
+        keep_from = self._scan(data, view, 0, size, packets.append)
+
+        # 미완성 꼬리만 새 버퍼로 복사 (리턴한 memoryview 가 참조하는 버퍼는 건드리지 않음)
+        self._pending = bytearray(view[keep_from:]) if keep_from < size else None
+        return packets
+
+
+class IpcRxRing:
+    """
+    미리 할당한 수신 버퍼에 readinto(os.readv)로 직접 읽고 제자리에서 패킷을 분리하는 수신 링
+
+    - read 마다 bytes 를 새로 만들지 않고, 미완성 꼬리 복사도 버퍼 앞쪽으로의 이동(compaction)만 사용
+    - drain() 한 번에 EAGAIN 이 날 때까지(또는 버퍼가 찰 때까지) 읽고 완성된 패킷을 memoryview 로 리턴
+    - 프레이밍/재동기화/CRC 검증은 IpcFramer 와 동일 (카운터는 self.framer 에 누적)
+    - 출력(print) 없음
+
+    리턴된 memoryview 는 다음 drain() 호출 전까지만 유효하다 (다음 호출에서 버퍼를 재사용).
+    """
+
+    def __init__(self, capacity: int = 65536, max_packet_size: int = IPC_MAX_PACKET_SIZE,
+                 verify_crc: bool = True):
+        """
+        초기화
+
+        Args:
+            capacity: 수신 버퍼 크기 (max_packet_size 의 2배 이상)
+            max_packet_size: 허용하는 최대 패킷 크기
+            verify_crc: CRC 검증 여부
+        """
+        if capacity < 2 * max_packet_size:
+            raise ValueError(f"버퍼가 너무 작습니다: capacity={capacity}, 최소={2 * max_packet_size}")
+        self._buf = bytearray(capacity)
+        self._view = memoryview(self._buf)
+        self._head = 0
+        self._tail = 0
+        self.framer = IpcFramer(max_packet_size, verify_crc)
+        self.reads = 0
+        self.rx_bytes = 0
+        self.compactions = 0
+        self.full = 0
+
+    @property
+    def pending(self) -> int:
+        """다음 drain 을 기다리는 미완성 바이트 수"""
+        return self._tail - self._head
+
+    def _compact(self) -> None:
+        """미완성 데이터를 버퍼 앞으로 이동 (버퍼 크기는 그대로이므로 재할당 없음)"""
+        head, tail = self._head, self._tail
+        if head:
+            if tail > head:
+                self._buf[0:tail - head] = self._view[head:tail]
+                self.compactions += 1
+            self._head = 0
+            self._tail = tail - head
+
+    def drain(self, fd: int) -> list:
+        """
+        fd 에서 EAGAIN 이 날 때까지 읽고 완성된 패킷 리스트 리턴
+
+        Args:
+            fd: non-blocking 파일 디스크립터
+
+        Returns:
+            list: 검증된 패킷들의 memoryview (다음 drain 전까지 유효)
+        """
+        packets = []
+        self.drain_to(fd, packets.append)
+        return packets
+
+    def drain_to(self, fd: int, handler) -> int:
+        """
+        drain 과 동일하지만 패킷 리스트를 만들지 않고 패킷마다 바로 handler(packet) 호출
+
+        handler 가 패킷을 보관하지 않으면 memoryview 가 바로 해제되므로 한 번에 많이 읽어도
+        메모리 사용량이 늘지 않는다.
+
+        Args:
+            fd: non-blocking 파일 디스크립터
+            handler: 패킷 memoryview 를 받는 함수
+
+        Returns:
+            int: 처리한 패킷 수
+        """
+        self._compact()
+
+        framer = self.framer
+        buf = self._buf
+        view = self._view
+        capacity = len(buf)
+        packets_before = framer.packets
+
+        while True:
+            if self._tail == capacity:
+                # 이번 호출에서 넘긴 패킷이 버퍼를 참조할 수 있으므로 여기서는 이동하지 않고 다음 호출로 넘김
+                self.full += 1
+                break
+            try:
+                n = os.readv(fd, (view[self._tail:],))
+            except BlockingIOError:
+                break
+            if n <= 0:
+                break
+            self.reads += 1
+            self.rx_bytes += n
+            self._tail += n
+            self._head = framer._scan(buf, view, self._head, self._tail, handler)
+
+        return framer.packets - packets_before
+
+    def reset(self) -> None:
+        """보관 중인 데이터와 카운터 초기화"""
+        self._head = 0
+        self._tail = 0
+        self.framer.reset()
+        self.reads = 0
+        self.rx_bytes = 0
+        self.compactions = 0
+        self.full = 0
+
+    def stats(self) -> dict:
+        """수신 링 카운터 (프레이머 카운터 포함)"""
+        stats = self.framer.stats()
+        stats.update({
+            'pending': self.pending,
+            'reads': self.reads,
+            'rx_bytes': self.rx_bytes,
+            'compactions': self.compactions,
+            'full': self.full,
+        })
+        return stats
+
+
+def parse_multiple_packets(data: bytes) -> list:
+    """
+    여러 IPC 패킷을 분리하여 개별 처리 (디버그 출력용)
+
+    한 버퍼 안의 완성된 패킷만 처리한다. read 경계를 넘는 스트림은 IpcFramer 사용.
+
+    Returns:
+        list: 분리된 패킷 bytes 리스트
+    """
     print(f"\n  === 여러 패킷 분석 ===")
     
     offset = 0
     packet_num = 0
+    packets = []
     
     while offset < len(data):
         # IPC 헤더 찾기 (0xFF 0x55 0xAA)
@@ -503,21 +1244,23 @@ def parse_multiple_packets(data: bytes):
         
         # 패킷 데이터 추출
         packet_data = data[offset:offset + packet_size]
+        packets.append(packet_data)
         print(f"    전체 패킷: {packet_data.hex()}")
         
         # LPA 패킷 파싱 시도
         parsed = parse_lpa_packet_with_can_header(packet_data)
-        if parsed['valid']:
+        if parsed.valid:
             print(f"    ✓ LPA 패킷 파싱 성공!")
-            print(f"    CMD: 0x{parsed['cmd']:04x}, Port: {parsed['port']}")
-            print(f"    CAN 헤더: {parsed['can_header'].hex()}")
-            print(f"    Payload: {parsed['payload'].hex()}")
-            print(f"    CRC: 0x{parsed['crc']:04x} ({'유효' if parsed['crc_valid'] else '무효'})")
+            print(f"    CMD: 0x{parsed.cmd:04x}, Port: {parsed.port}")
+            print(f"    CAN 헤더: {parsed.can_header.hex()}")
+            print(f"    Payload: {parsed.payload.hex()}")
+            print(f"    CRC: 0x{parsed.crc:04x} ({'유효' if parsed.crc_valid else '무효'})")
             
             # CAN 헤더 상세 파싱
-            can_info = parse_can_header(parsed['can_header'])
-            print(f"    CAN ID: 0x{can_info['can_id']:X} ({'Extended' if can_info['is_extended'] else 'Standard'})")
-            print(f"    CAN FD: {can_info['is_fd']}, RTR: {can_info['rtr']}, BRS: {can_info['brs']}")
+            can_info = parse_can_header(parsed.can_header)
+            can_id = can_info.ext_can_id if can_info.is_extended else can_info.can_id
+            print(f"    CAN ID: 0x{can_id:X} ({'Extended' if can_info.is_extended else 'Standard'})")
+            print(f"    CAN FD: {can_info.is_fd}, RTR: {can_info.rtr}")
         else:
             # 기존 방식으로 파싱
             if data_len > 0:
@@ -544,3 +1287,5 @@ def parse_multiple_packets(data: bytes):
         print(f"  유효한 IPC 패킷을 찾을 수 없습니다.")
     else:
         print(f"  총 {packet_num}개의 IPC 패킷을 발견했습니다.")
+    
+    return packets
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+캡처 재생 (기록된 송신 프레임을 원래 상대 시각에 맞춰 AxonIPCDriver 로 다시 송신)
+
+각 프레임의 송신 시각은 시작 시각 + (타임스탬프 - 첫 타임스탬프) / speed 로 계산하는 절대 시각이므로
+앞 프레임이 늦어져도 오차가 누적되지 않는다. 같은 타임스탬프의 프레임(한 번의 writev 로 나간 묶음)은
+write_many 로 다시 묶어서 보내고, 프레임마다 예정 시각 대비 늦은 시간(lateness)을 기록한다.
+"""
+
+import sys
+import json
+import time
+import argparse
+from array import array
+from typing import Optional
+from axon_ipc_driver import AxonIPCDriver
+from capture import CaptureReader, CAPTURE_TX
+from timing import CLOCK_NAME, LatencyHistogram, now_ns, calibration
+
+
+class IpcReplayer:
+    """
+    (타임스탬프 ns, 프레임) 스트림 재생기
+
+    예정 시각 spin_us 전까지는 time.sleep 으로 기다리고 남은 시간은 시계를 읽으며 대기한다
+    (spin 중에는 GIL 을 놓지 않으므로 같은 프로세스의 수신 스레드가 있으면 spin_us 를 줄인다).
+    """
+
+    def __init__(self, driver: AxonIPCDriver, speed: float = 1.0, spin_us: int = 200,
+                 start_delay: float = 0.01):
+        """
+        초기화
+
+        Args:
+            driver: 열려 있는 AxonIPCDriver
+            speed: 재생 속도 배율 (2.0 이면 두 배 빠르게, 상대 시간 간격을 speed 로 나눔)
+            spin_us: 예정 시각 전에 sleep 대신 시계를 읽으며 기다리는 시간 (us)
+            start_delay: 첫 프레임 송신 전 여유 시간 (초)
+        """
+        if speed <= 0:
+            raise ValueError(f"재생 속도는 0 보다 커야 합니다: {speed}")
+        self.driver = driver
+        self.speed = speed
+        self.spin_ns = spin_us * 1000
+        self.start_delay = start_delay
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """재생 결과 초기화"""
+        self.lateness_ns = array('q')   # 프레임별 (송신 시작 시각 - 예정 시각)
+        self.histogram = LatencyHistogram()
+        self.frames = 0
+        self.bursts = 0
+        self.failed = 0
+        self.out_of_order = 0
+        self.duration_ns = 0
+
+    def run(self, frames) -> dict:
+        """
+        스트림 재생
+
+        Args:
+            frames: (timestamp_ns, 프레임) 순회 가능 객체 (타임스탬프 오름차순,
+                    CaptureReader.frames() 또는 임의의 생성기)
+
+        Returns:
+            dict: 재생 결과 (report())
+        """
+        self.reset_stats()
+        calibration()
+
+        driver = self.driver
+        speed = self.speed
+        spin_ns = self.spin_ns
+        lateness = self.lateness_ns
+        record = self.histogram.record
+
+        base_ns = None
+        start_ns = 0
+        burst_ts = None
+        burst = []
+
+        def send_burst() -> None:
+            deadline_ns = start_ns + int((burst_ts - base_ns) / speed)
+            remaining_ns = deadline_ns - now_ns()
+            if remaining_ns > spin_ns:
+                time.sleep((remaining_ns - spin_ns) / 1e9)
+            while now_ns() < deadline_ns:
+                pass
+            late_ns = now_ns() - deadline_ns
+            results = driver.write_many(burst)
+            self.failed += sum(1 for frame, written in zip(burst, results) if written != len(frame))
+            for _ in burst:
+                lateness.append(late_ns)
+                record(late_ns)
+            self.frames += len(burst)
+            self.bursts += 1
+
+        for timestamp_ns, frame in frames:
+            if base_ns is None:
+                base_ns = timestamp_ns
+                start_ns = now_ns() + int(self.start_delay * 1e9)
+            elif timestamp_ns < burst_ts:
+                # 순서가 뒤바뀐 입력: 앞 묶음과 같은 시각으로 보냄 (out_of_order 로 집계)
+                self.out_of_order += 1
+                timestamp_ns = burst_ts
+            if timestamp_ns != burst_ts and burst:
+                send_burst()
+                burst = []
+            burst_ts = timestamp_ns
+            burst.append(frame)
+        if burst:
+            send_burst()
+
+        if base_ns is not None:
+            self.duration_ns = now_ns() - start_ns
+        return self.report()
+
+    def report(self, per_frame: bool = False) -> dict:
+        """
+        재생 결과
+
+        Args:
+            per_frame: True 면 프레임별 lateness(ns) 목록 포함 ('lateness_ns')
+
+        Returns:
+            dict: 프레임/송신 횟수, 실패 수, lateness 분포 (LatencyHistogram.to_dict)
+        """
+        report = {
+            'device_path': self.driver.device_path,
+            'clock': CLOCK_NAME,
+            'speed': self.speed,
+            'frames': self.frames,
+            'bursts': self.bursts,
+            'failed': self.failed,
+            'out_of_order': self.out_of_order,
+            'duration_ms': self.duration_ns / 1e6,
+            'lateness': self.histogram.to_dict(),
+        }
+        if per_frame:
+            report['lateness_ns'] = self.lateness_ns.tolist()
+        return report
+
+
+def replay_capture(capture_path: str, driver: AxonIPCDriver, speed: float = 1.0,
+                   device_id: Optional[int] = None, spin_us: int = 200, per_frame: bool = False) -> dict:
+    """
+    캡처 파일의 송신(TX) 레코드를 재생
+
+    Args:
+        capture_path: CaptureWriter 로 기록한 파일
+        driver: 열려 있는 AxonIPCDriver
+        speed: 재생 속도 배율
+        device_id: 해당 디바이스의 레코드만 (None 이면 모두)
+        spin_us: IpcReplayer 의 spin 시간 (us)
+        per_frame: True 면 프레임별 lateness 목록 포함
+
+    Returns:
+        dict: 재생 결과 (IpcReplayer.report())
+    """
+    replayer = IpcReplayer(driver, speed=speed, spin_us=spin_us)
+    with CaptureReader(capture_path) as reader:
+        frames = reader.frames(CAPTURE_TX, device_id)
+        replayer.run(frames)
+        del frames
+    report = replayer.report(per_frame)
+    report['capture_path'] = capture_path
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AXON IPC 캡처 재생")
+    parser.add_argument('capture', help="캡처 파일 경로")
+    parser.add_argument('--device', required=True, help="송신할 IPC 디바이스 경로 (router_sim 의 pty 경로도 가능)")
+    parser.add_argument('--speed', type=float, default=1.0, help="재생 속도 배율")
+    parser.add_argument('--device-id', type=int, default=None, help="이 디바이스 ID 의 레코드만 재생")
+    parser.add_argument('--spin-us', type=int, default=200, help="예정 시각 전 spin 대기 시간 (us)")
+    parser.add_argument('--output', default=None, help="프레임별 lateness 를 포함한 JSON 저장 경로")
+    args = parser.parse_args()
+
+    driver = AxonIPCDriver(args.device)
+    if not driver.open_device():
+        sys.exit(1)
+    try:
+        report = replay_capture(args.capture, driver, args.speed, args.device_id, args.spin_us,
+                                per_frame=args.output is not None)
+    except (OSError, ValueError) as e:
+        print(f"재생 실패: {e}")
+        sys.exit(1)
+    finally:
+        driver.close_device()
+
+    lateness = report['lateness']
+    print(f"재생 완료: {report['frames']}개 프레임 ({report['bursts']}회 송신), 실패 {report['failed']}개, "
+          f"{report['duration_ms']:.3f}ms (x{report['speed']})")
+    print(f"lateness ({report['clock']}): 평균 {lateness['mean_ns'] / 1000:.1f}us, "
+          f"p50 {lateness['p50_ns'] / 1000:.1f}us, p99 {lateness['p99_ns'] / 1000:.1f}us, "
+          f"최대 {lateness['max_ns'] / 1000:.1f}us")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
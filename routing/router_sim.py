@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+하드웨어 없이 사용하는 AXON 라우터 시뮬레이터 (pty 기반 가상 IPC 디바이스)
+
+pty 의 slave 경로를 AxonIPCDriver 로 그대로 열 수 있다. 시뮬레이터는 master 쪽에서
+송신 LPA 패킷을 파싱하고 CSV 라우팅 테이블(SrcMessage -> DstMessage)에 따라
+C 코드의 parse_data_frame 레이아웃(15바이트 수신 프레임 헤더)으로 수신 패킷을 돌려준다.
+지연(latency), 지터(jitter), 손실률(loss)은 생성 시 설정한다.
+수신 프레임의 MCU 타임스탬프에는 호스트 timing.now_ns() 기준 송신 예정 시각을 넣는다.
+
+같은 프로세스에서 쓰면 GIL 전환 간격(기본 5ms)만큼 송신이 늦어질 수 있으므로
+지연 분포를 측정할 때는 CLI 로 별도 프로세스에서 실행한다 (max_lateness_us 로 확인).
+"""
+
+import os
+import sys
+import tty
+import glob
+import heapq
+import time
+import random
+import select
+import argparse
+import threading
+from collections import deque
+from typing import Optional
+from constants import TCC_IPC_CMD_AP_TEST
+from packet_utils import (IpcFramer, RxFrame, IPC_HEADER_STRUCT, IPC_HEADER_SIZE, LPA_TX_HDR_SIZE,
+                          make_lpa_packet, parse_CANHeader_py)
+from test_plan import load_csv_test_plan, build_routing_table
+from timing import now_ns, split_mcu_timestamp
+from log_utils import LOG_LEVELS
+
+# master fd 에서 이벤트 한 번에 연속으로 읽는 최대 횟수
+MAX_READS_PER_EVENT = 64
+
+
+class AxonRouterSimulator:
+    """
+    pty 로 AXON IPC 디바이스를 흉내 내는 라우터
+
+    Example:
+        with AxonRouterSimulator.from_csv(csv_path, latency=0.001, jitter=0.0002) as sim:
+            with AxonIPCDriver(sim.device_path) as ipc:
+                ipc.write_data(packet)
+                data = ipc.recv(timeout=0.1)
+    """
+
+    def __init__(self, routes: dict, latency: float = 0.0005, jitter: float = 0.0, loss: float = 0.0,
+                 seed: Optional[int] = None, cmd: int = TCC_IPC_CMD_AP_TEST):
+        """
+        초기화
+
+        Args:
+            routes: {(송신 포트, 송신 CAN ID): [(목적지 포트, 목적지 CAN ID), ...]} (build_routing_table 결과)
+            latency: 수신 패킷을 돌려주기까지의 고정 지연 (초)
+            jitter: 지연에 더하는 균등 분포 지터의 최대값 (초)
+            loss: 목적지 프레임별 손실 확률 (0.0 ~ 1.0)
+            seed: 지터/손실 난수 시드 (재현용)
+            cmd: 수신 패킷의 IPC 명령어
+        """
+        self.routes = routes
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.cmd = cmd
+        self._random = random.Random(seed)
+        self._framer = IpcFramer()
+        self._schedule = []      # (송신 예정 시각(ns), 순번, 패킷)
+        self._sequence = 0
+        self._out = deque()
+        self._master = None
+        self._slave = None
+        self._poller = None
+        self._want_write = False
+        self._thread = None
+        self._running = False
+        self.device_path = None
+
+        self.rx_packets = 0
+        self.rx_bytes = 0
+        self.unrouted = 0
+        self.dropped = 0
+        self.scheduled = 0
+        self.tx_packets = 0
+        self.tx_bytes = 0
+        self.tx_eagain = 0
+        self.max_lateness_ns = 0
+
+    @classmethod
+    def from_csv(cls, csv_path: str, **kwargs) -> 'AxonRouterSimulator':
+        """
+        CSV 테스트 계획의 SrcMessage -> DstMessage 컬럼으로 라우팅 테이블을 만들어 생성
+
+        Args:
+            csv_path: CSV 파일 경로
+            **kwargs: __init__ 의 latency/jitter/loss/seed/cmd
+
+        Returns:
+            AxonRouterSimulator: 시작 전 상태의 시뮬레이터
+        """
+        return cls(build_routing_table(load_csv_test_plan(csv_path)), **kwargs)
+
+    def start(self) -> str:
+        """
+        pty 를 만들고 시뮬레이터 스레드 시작
+
+        Returns:
+            str: AxonIPCDriver 로 열 디바이스 경로 (pty slave)
+        """
+        self._master, self._slave = os.openpty()
+        # 바이너리 패킷이 줄 단위 처리/에코/개행 변환을 거치지 않도록 raw 모드
+        tty.setraw(self._slave)
+        os.set_blocking(self._master, False)
+        self.device_path = os.ttyname(self._slave)
+
+        self._poller = select.poll()
+        self._poller.register(self._master, select.POLLIN)
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='axon-router-sim', daemon=True)
+        self._thread.start()
+        return self.device_path
+
+    def stop(self) -> None:
+        """시뮬레이터 스레드를 멈추고 pty 닫기"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+    def _run(self) -> None:
+        """수신 -> 라우팅 -> 예약된 시각에 송신 루프"""
+        while self._running:
+            timeout_ms = 100
+            if self._schedule:
+                remaining_ns = self._schedule[0][0] - now_ns()
+                timeout_ms = max(0, remaining_ns // 1_000_000)
+
+            for _, event in self._poller.poll(timeout_ms):
+                if event & select.POLLIN:
+                    self._handle_read()
+                if event & select.POLLOUT:
+                    self._handle_write()
+
+            if self._schedule:
+                # poll 은 ms 단위이므로 1ms 미만으로 남은 지연은 sleep 으로 맞춤
+                remaining_ns = self._schedule[0][0] - now_ns()
+                if 0 < remaining_ns < 1_000_000:
+                    time.sleep(remaining_ns / 1e9)
+                self._release_due()
+            if self._out and not self._want_write:
+                self._handle_write()
+
+    def _handle_read(self) -> None:
+        for _ in range(MAX_READS_PER_EVENT):
+            try:
+                data = os.read(self._master, 4096)
+            except BlockingIOError:
+                return
+            except OSError:
+                # 열어 둔 slave fd 가 없으면 EIO: 다음 open 까지 대기
+                return
+            if not data:
+                return
+
+            self.rx_bytes += len(data)
+            read_ns = now_ns()
+            for packet in self._framer.feed(data):
+                self._route(packet, read_ns)
+
+    def _route(self, packet, read_ns: int) -> None:
+        """송신 LPA 패킷 하나를 라우팅 테이블에 따라 수신 패킷으로 변환해 예약"""
+        self.rx_packets += 1
+        _, _, port, data_length = IPC_HEADER_STRUCT.unpack_from(packet, 0)
+        if data_length < LPA_TX_HDR_SIZE:
+            self.unrouted += 1
+            return
+
+        _, can_id, fdf, _, _ = parse_CANHeader_py(packet[IPC_HEADER_SIZE:IPC_HEADER_SIZE + LPA_TX_HDR_SIZE])
+        payload = bytes(packet[IPC_HEADER_SIZE + LPA_TX_HDR_SIZE:IPC_HEADER_SIZE + data_length])
+
+        destinations = self.routes.get((port, can_id))
+        if not destinations:
+            self.unrouted += 1
+            return
+
+        for dst_port, dst_can_id in destinations:
+            if self.loss and self._random.random() < self.loss:
+                self.dropped += 1
+                continue
+
+            deliver_ns = read_ns + int((self.latency + self._random.uniform(0.0, self.jitter)) * 1e9)
+            timestamp_us_h, timestamp_us_l, timestamp_ns = split_mcu_timestamp(deliver_ns)
+            is_extended = dst_can_id > 0x7FF
+            frame = RxFrame(frame_type=0, source_port=dst_port, timestamp_ns=timestamp_ns,
+                            timestamp_us_l=timestamp_us_l, timestamp_us_h=timestamp_us_h,
+                            can_id=dst_can_id & 0x7FF, ext_can_id=dst_can_id, fdf=fdf,
+                            ide=1 if is_extended else 0)
+            body = frame.pack() + payload
+            rx_packet = make_lpa_packet(body, self.cmd, dst_port, len(body))
+
+            self._sequence += 1
+            heapq.heappush(self._schedule, (deliver_ns, self._sequence, rx_packet))
+            self.scheduled += 1
+
+    def _release_due(self) -> None:
+        """송신 시각이 된 패킷을 송신 대기열로 이동"""
+        current_ns = now_ns()
+        schedule = self._schedule
+        while schedule and schedule[0][0] <= current_ns:
+            deliver_ns, _, rx_packet = heapq.heappop(schedule)
+            lateness_ns = current_ns - deliver_ns
+            if lateness_ns > self.max_lateness_ns:
+                self.max_lateness_ns = lateness_ns
+            self._out.append(rx_packet)
+
+    def _handle_write(self) -> None:
+        out = self._out
+        while out:
+            data = out[0]
+            try:
+                written = os.write(self._master, data)
+            except BlockingIOError:
+                # 호스트가 읽지 않아 pty 버퍼가 가득 참: POLLOUT 까지 대기
+                self.tx_eagain += 1
+                if not self._want_write:
+                    self._want_write = True
+                    self._poller.modify(self._master, select.POLLIN | select.POLLOUT)
+                return
+            self.tx_bytes += written
+            if written < len(data):
+                out[0] = data[written:]
+                continue
+            out.popleft()
+            self.tx_packets += 1
+
+        if self._want_write:
+            self._want_write = False
+            self._poller.modify(self._master, select.POLLIN)
+
+    def stats(self) -> dict:
+        """시뮬레이터 카운터"""
+        stats = {
+            'device_path': self.device_path,
+            'routes': len(self.routes),
+            'rx_packets': self.rx_packets,
+            'rx_bytes': self.rx_bytes,
+            'unrouted': self.unrouted,
+            'dropped': self.dropped,
+            'scheduled': self.scheduled,
+            'pending': len(self._schedule) + len(self._out),
+            'tx_packets': self.tx_packets,
+            'tx_bytes': self.tx_bytes,
+            'tx_eagain': self.tx_eagain,
+            'max_lateness_us': self.max_lateness_ns / 1000,
+        }
+        stats.update({f'framer_{key}': value for key, value in self._framer.stats().items()})
+        return stats
+
+    def __enter__(self):
+        """Context manager 진입 (시뮬레이터 시작)"""
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager 종료"""
+        self.stop()
+
+
+def _default_csv_path() -> Optional[str]:
+    """can_sender_app 과 같은 기본 CSV (csv-file 디렉터리의 첫 번째 파일)"""
+    csv_files = sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'csv-file', '*.csv')))
+    return csv_files[0] if csv_files else None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AXON 라우터 시뮬레이터 (pty 가상 IPC 디바이스)")
+    parser.add_argument('--csv', default=_default_csv_path(), help="라우팅 테이블을 만들 CSV 테스트 계획")
+    parser.add_argument('--latency-ms', type=float, default=0.5, help="고정 지연 (ms)")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="추가 지터 최대값 (ms, 균등 분포)")
+    parser.add_argument('--loss', type=float, default=0.0, help="목적지 프레임별 손실 확률 (0.0 ~ 1.0)")
+    parser.add_argument('--seed', type=int, default=None, help="지터/손실 난수 시드")
+    parser.add_argument('--run-app', action='store_true',
+                        help="시뮬레이터 디바이스로 can_sender_app 실행 (Ctrl+C 로 종료)")
+    parser.add_argument('--log-level', choices=list(LOG_LEVELS), default='failure',
+                        help="--run-app 송수신 로그 레벨 (summary / failure / frame)")
+    parser.add_argument('--capture', default=None, help="--run-app 송수신을 기록할 캡처 파일 경로")
+    args = parser.parse_args()
+
+    if not args.csv:
+        print("CSV 파일이 없습니다")
+        sys.exit(1)
+
+    sim = AxonRouterSimulator.from_csv(args.csv, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+                                       loss=args.loss, seed=args.seed)
+    with sim:
+        print(f"라우터 시뮬레이터 시작: {sim.device_path} (라우팅 {len(sim.routes)}개, "
+              f"지연 {args.latency_ms}ms, 지터 {args.jitter_ms}ms, 손실 {args.loss * 100:.1f}%)")
+        if args.run_app:
+            from can_sender_app import can_sender_app
+            can_sender_app(device_path=sim.device_path, csv_path=args.csv, log_level=LOG_LEVELS[args.log_level],
+                           capture_path=args.capture)
+        else:
+            print("Ctrl+C 로 종료합니다")
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                pass
+
+        print("\n=== 라우터 시뮬레이터 통계 ===")
+        for key, value in sim.stats().items():
+            print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
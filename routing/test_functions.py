@@ -5,8 +5,6 @@
 """
 
 import time
-import ctypes
-import ctypes.util
 import multiprocessing as mp
 import threading
 import os
@@ -14,6 +12,7 @@ import glob
 import csv
 from axon_ipc_driver import AxonIPCDriver
 from constants import AXON_IPC_CM0_FILE, AXON_IPC_CM1_FILE, TCC_IPC_CMD_AP_TEST
+from timing import now_ns, elapsed_ns, format_ns
 
 def test_can_multithreading():
     """멀티스레딩 CAN 송신/수신 테스트"""
@@ -42,17 +41,6 @@ def test_can_multithreading():
         
         print(f"[송신 스레드] 시작 - Thread ID: {threading.current_thread().ident}")
         
-        # 리눅스 시스템 콜을 위한 라이브러리 로드
-        libc = ctypes.CDLL(ctypes.util.find_library('c'))
-        CLOCK_MONOTONIC_RAW = 4
-        
-        class timespec(ctypes.Structure):
-            _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
-        
-        clock_gettime = libc.clock_gettime
-        clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
-        clock_gettime.restype = ctypes.c_int
-        
         data_len = 8
         ipc_len = data_len + 5
         port_n = 11
@@ -66,8 +54,7 @@ def test_can_multithreading():
                     break
                 
                 # 송신 시작 시간 측정
-                send_start_ts = timespec()
-                clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(send_start_ts))
+                send_start_ns = now_ns()
                 
                 # 데이터 생성 (카운터 포함)
                 data = bytearray(data_len)
@@ -82,13 +69,10 @@ def test_can_multithreading():
                 bytes_written = ipc.write_data(packet)
                 
                 # 송신 종료 시간 측정
-                send_end_ts = timespec()
-                clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(send_end_ts))
+                send_end_ns = now_ns()
                 
-                # 송신 시간 계산
-                send_start_ns = send_start_ts.tv_sec * 1_000_000_000 + send_start_ts.tv_nsec
-                send_end_ns = send_end_ts.tv_sec * 1_000_000_000 + send_end_ts.tv_nsec
-                send_time_ns = send_end_ns - send_start_ns
+                # 송신 시간 계산 (시계 읽기 비용 제외)
+                send_time_ns = elapsed_ns(send_start_ns, send_end_ns)
                 send_time_ms = send_time_ns / 1_000_000
                 
                 # 송신 시간 기록
@@ -104,7 +88,7 @@ def test_can_multithreading():
                 
                 print(f"[송신 스레드] 패킷 {i+1:3d}/{send_count}: {bytes_written}바이트 | "
                       f"송신시간: {send_time_ms:.3f}ms | "
-                      f"송신타임스탬프: {send_end_ts.tv_sec:10d}.{send_end_ts.tv_nsec:09d} | "
+                      f"송신타임스탬프: {format_ns(send_end_ns)} | "
                       f"데이터: {data.hex()} | "
                       f"전체패킷: {packet.hex()}")
                 
@@ -123,51 +107,33 @@ def test_can_multithreading():
         
         print(f"[수신 스레드] 시작 - Thread ID: {threading.current_thread().ident}")
         
-        # 리눅스 시스템 콜을 위한 라이브러리 로드
-        libc = ctypes.CDLL(ctypes.util.find_library('c'))
-        CLOCK_MONOTONIC_RAW = 4
-        
-        class timespec(ctypes.Structure):
-            _fields_ = [("tv_sec", ctypes.c_long), ("tv_nsec", ctypes.c_long)]
-        
-        clock_gettime = libc.clock_gettime
-        clock_gettime.argtypes = [ctypes.c_int, ctypes.POINTER(timespec)]
-        clock_gettime.restype = ctypes.c_int
-        
         try:
             print(f"[수신 스레드] 수신 대기 시작 (무한 루프)")
             
             # 시작 시간 측정
-            start_ts = timespec()
-            clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(start_ts))
-            start_ns = start_ts.tv_sec * 1_000_000_000 + start_ts.tv_nsec
+            start_ns = now_ns()
             
             while not stop_event.is_set():
                 # 수신 시작 시간 측정
-                recv_start_ts = timespec()
-                clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(recv_start_ts))
+                recv_start_ns = now_ns()
                 
                 # 데이터 수신
                 data = ipc.read_data()
                 
                 # 수신 종료 시간 측정
-                recv_end_ts = timespec()
-                clock_gettime(CLOCK_MONOTONIC_RAW, ctypes.byref(recv_end_ts))
+                recv_end_ns = now_ns()
                 
                 if data:
                     with received_lock:
                         received_count += 1
                         current_count = received_count
                     
-                    # 수신 시간 계산
-                    recv_start_ns = recv_start_ts.tv_sec * 1_000_000_000 + recv_start_ts.tv_nsec
-                    recv_end_ns = recv_end_ts.tv_sec * 1_000_000_000 + recv_end_ts.tv_nsec
-                    recv_time_ns = recv_end_ns - recv_start_ns
+                    # 수신 시간 계산 (시계 읽기 비용 제외)
+                    recv_time_ns = elapsed_ns(recv_start_ns, recv_end_ns)
                     recv_time_ms = recv_time_ns / 1_000_000
                     
                     # 전체 경과 시간
-                    current_ns = recv_end_ts.tv_sec * 1_000_000_000 + recv_end_ts.tv_nsec
-                    total_elapsed_ns = current_ns - start_ns
+                    total_elapsed_ns = recv_end_ns - start_ns
                     total_elapsed_ms = total_elapsed_ns / 1_000_000
                     
                     # 가장 가까운 송신 시간 찾기
@@ -192,12 +158,12 @@ def test_can_multithreading():
                     print(f"[수신 스레드] 패킷 {current_count:3d}: {len(data)}바이트 | "
                           f"수신시간: {recv_time_ms:.3f}ms | "
                           f"총경과: {total_elapsed_ms:.3f}ms | "
-                          f"수신타임스탬프: {recv_end_ts.tv_sec:10d}.{recv_end_ts.tv_nsec:09d} | "
+                          f"수신타임스탬프: {format_ns(recv_end_ns)} | "
                           f"{send_info_str} | "
                           f"데이터: {data.hex()}")
                 else:
-                    # 데이터가 없으면 잠시 대기
-                    time.sleep(0.001)
+                    # 데이터가 들어올 때까지 커널에서 대기 (stop_event 확인을 위해 최대 100ms)
+                    ipc.wait_readable(0.1)
             
             print(f"[수신 스레드] 수신 완료 - 총 {received_count}개 패킷 수신")
             
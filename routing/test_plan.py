@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CSV 테스트 계획 로드 및 사전 인코딩(컴파일)
+"""
+
+import csv
+import time
+from array import array
+from constants import TCC_IPC_CMD_AP_TEST
+from packet_utils import make_lpa_packet_with_can_header_into, LPA_TX_HDR_SIZE, IPC_OVERHEAD
+
+
+def load_csv_test_plan(csv_path: str) -> list:
+    """
+    CSV 테스트 계획 파일을 읽어 송신 항목 리스트로 변환
+
+    Args:
+        csv_path: CSV 파일 경로
+
+    Returns:
+        list: 송신 항목 dict 리스트 (port_n, can_id, data, cycle_time, dst_port_n, row_data)
+    """
+    # CSV 데이터 읽기 및 파싱
+    csv_data = []
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        
+        # 1행: 헤더(사용 안함)
+        _header = next(reader, None)
+        if _header is None:
+            print("빈 CSV 파일입니다.")
+            return []
+
+        # 2행: 컬럼명 위치 파악
+        second_row = next(reader, None)
+        if second_row is None:
+            print("2번째 행(데이터)이 존재하지 않습니다.")
+            return []
+
+        # 2번째 줄에서 컬럼명 위치 자동 감지 (중복 등장까지 수집)
+        normalized_cells = [(c or '').strip() for c in second_row]
+
+        targets = {
+            'Channel': ['Channel'],
+            'MsgID': ['MsgID', 'Msg ID', 'MessageID', 'Message ID'],
+            'MsgValue': ['MsgValue', 'MessageValue', 'Value'],
+            'CycleTime (ms)': ['CycleTime (ms)', 'CycleTime(ms)', 'Cycle Time (ms)']
+        }
+
+        def find_indices(candidates):
+            candidate_set = set(candidates)
+            return [i for i, val in enumerate(normalized_cells) if val in candidate_set]
+
+        channel_idxs = find_indices(targets['Channel'])
+        msgid_idxs = find_indices(targets['MsgID'])
+        msgvalue_idxs = find_indices(targets['MsgValue'])
+        cycle_idxs = find_indices(targets['CycleTime (ms)'])
+
+        # 최소 2개까지 확보 (부족하면 경고)
+        if len(channel_idxs) < 2 or len(msgid_idxs) < 2 or len(msgvalue_idxs) < 2 or len(cycle_idxs) < 2:
+            print("필수 컬럼명이 2개 이상 존재하지 않습니다.")
+            print(f"Channel idxs: {channel_idxs}")
+            print(f"MsgID idxs: {msgid_idxs}")
+            print(f"MsgValue idxs: {msgvalue_idxs}")
+            print(f"CycleTime(ms) idxs: {cycle_idxs}")
+            return []
+
+        idx_channel_1, idx_channel_2 = channel_idxs[0], channel_idxs[1]
+        idx_msgid_1, idx_msgid_2 = msgid_idxs[0], msgid_idxs[1]
+        idx_msgvalue_1, idx_msgvalue_2 = msgvalue_idxs[0], msgvalue_idxs[1]
+        idx_cycle_1, idx_cycle_2 = cycle_idxs[0], cycle_idxs[1]
+
+        print(f"컬럼 위치 확인:")
+        print(f"첫 번째 세트 - Channel: {idx_channel_1}, MsgID: {idx_msgid_1}, MsgValue: {idx_msgvalue_1}, CycleTime: {idx_cycle_1}")
+        print(f"두 번째 세트 - Channel: {idx_channel_2}, MsgID: {idx_msgid_2}, MsgValue: {idx_msgvalue_2}, CycleTime: {idx_cycle_2}")
+
+        # 3행부터 데이터 읽기
+        for row in reader:
+            def safe_get(row, index):
+                return row[index] if 0 <= index < len(row) else ''
+
+            # 첫 번째 세트 (송신용)
+            src_ch = safe_get(row, idx_channel_1)
+            snt_msg = safe_get(row, idx_msgvalue_1)
+            snt_msg_id = safe_get(row, idx_msgid_1)
+            snt_cycle_time = safe_get(row, idx_cycle_1)
+
+            # 두 번째 세트 (수신용 - 참고용)
+            dst_ch = safe_get(row, idx_channel_2)
+            rsv_msg = safe_get(row, idx_msgvalue_2)
+            rsv_msg_id = safe_get(row, idx_msgid_2)
+            rsv_cycle_time = safe_get(row, idx_cycle_2)
+
+            # 데이터 유효성 검사
+            if src_ch and snt_msg and snt_msg_id and snt_cycle_time:
+                try:
+                    # src_ch 문자열을 파싱해서 포트 번호로 변환
+                    if src_ch.startswith('CANHS'):
+                        port_n = int(src_ch[5:])  # CANHS1 -> 1, CANHS8 -> 8
+                    elif src_ch.startswith('CANFD'):
+                        port_n = int(src_ch[5:]) + 8  # CANFD1 -> 9, CANFD8 -> 16
+                    elif src_ch.startswith('LIN'):
+                        port_n = int(src_ch[3:])  # CANFD1 -> 9, CANFD8 -> 16
+                    else:
+                        print(f"알 수 없는 채널 형식: {src_ch}")
+                        continue
+                    
+                    # dst_ch 문자열을 파싱해서 포트 번호로 변환
+                    if dst_ch.startswith('CANHS'):
+                        dst_port_n = int(dst_ch[5:])  # CANHS1 -> 1, CANHS8 -> 8
+                    elif dst_ch.startswith('CANFD'):
+                        dst_port_n = int(dst_ch[5:]) + 8  # CANFD1 -> 9, CANFD8 -> 16
+                    elif dst_ch.startswith('LIN'):
+                        dst_port_n = int(dst_ch[3:])  # CANFD1 -> 9, CANFD8 -> 16
+                    else:
+                        dst_port_n = 0  # 기본값
+                    
+                    can_id = int(snt_msg_id, 16) if snt_msg_id.startswith('0x') else int(snt_msg_id)
+                    cycle_time = float(snt_cycle_time) / 1000.0  # ms를 초로 변환
+                    
+                    # MsgValue를 바이트 데이터로 변환
+                    if snt_msg.startswith('0x'):
+                        # 16진수 문자열인 경우
+                        data = bytes.fromhex(snt_msg[2:])
+                    else:
+                        # 일반 문자열인 경우
+                        data = snt_msg.encode('utf-8')
+                    
+                    csv_data.append({
+                        'port_n': port_n,
+                        'can_id': can_id,
+                        'data': data,
+                        'cycle_time': cycle_time,
+                        'dst_port_n': dst_port_n,
+                        'row_data': {
+                            'src_ch': src_ch,
+                            'snt_msg': snt_msg,
+                            'snt_msg_id': snt_msg_id,
+                            'snt_cycle_time': snt_cycle_time,
+                            'dst_ch': dst_ch,
+                            'rsv_msg': rsv_msg,
+                            'rsv_msg_id': rsv_msg_id,
+                            'rsv_cycle_time': rsv_cycle_time
+                        }
+                    })
+                except (ValueError, TypeError) as e:
+                    print(f"데이터 변환 오류 (행 {len(csv_data) + 3}): {e}")
+                    continue
+
+    return csv_data
+
+
+def build_routing_table(csv_data: list) -> dict:
+    """
+    load_csv_test_plan 결과의 SrcMessage -> DstMessage 컬럼으로 라우팅 테이블 생성
+
+    같은 송신 메시지가 여러 행에 다른 목적지로 나오면 모두 목적지로 등록한다 (fan-out).
+
+    Args:
+        csv_data: load_csv_test_plan 이 리턴한 송신 항목 리스트
+
+    Returns:
+        dict: {(송신 포트, 송신 CAN ID): [(목적지 포트, 목적지 CAN ID), ...]}
+    """
+    routes = {}
+    for item in csv_data:
+        if not item['dst_port_n']:
+            continue
+
+        dst_msg_id = item['row_data']['rsv_msg_id']
+        try:
+            dst_can_id = int(dst_msg_id, 16) if dst_msg_id.startswith('0x') else int(dst_msg_id)
+        except ValueError:
+            dst_can_id = item['can_id']
+
+        destinations = routes.setdefault((item['port_n'], item['can_id']), [])
+        destination = (item['dst_port_n'], dst_can_id)
+        if destination not in destinations:
+            destinations.append(destination)
+    return routes
+
+
+class CompiledTestPlan:
+    """
+    테스트 계획 전체를 미리 인코딩한 LPA 프레임 버퍼
+
+    모든 프레임을 하나의 연속된 bytearray 에 이어서 기록하고
+    프레임별 위치(offsets)와 길이(lengths)를 array 로 보관한다.
+    송신 루프는 frame(i) 로 memoryview 슬라이스만 얻어 그대로 write 한다.
+    """
+
+    def __init__(self, buffer: bytearray, offsets: array, lengths: array, compile_ns: int):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.lengths = lengths
+        self.compile_ns = compile_ns
+        self._view = memoryview(buffer)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def frame(self, index: int) -> memoryview:
+        """index 번째 프레임 (복사 없는 memoryview)"""
+        offset = self.offsets[index]
+        return self._view[offset:offset + self.lengths[index]]
+
+    def frames(self):
+        """모든 프레임을 순서대로 memoryview 로 리턴"""
+        view = self._view
+        for offset, length in zip(self.offsets, self.lengths):
+            yield view[offset:offset + length]
+
+    @property
+    def nbytes(self) -> int:
+        """프레임 버퍼 + 인덱스 배열이 차지하는 메모리 (바이트)"""
+        return (len(self.buffer)
+                + self.offsets.itemsize * len(self.offsets)
+                + self.lengths.itemsize * len(self.lengths))
+
+    def stats(self) -> dict:
+        """컴파일 시간 및 메모리 사용량"""
+        return {
+            'frames': len(self),
+            'frame_bytes': len(self.buffer),
+            'nbytes': self.nbytes,
+            'compile_ms': self.compile_ns / 1_000_000,
+        }
+
+
+def compile_test_plan(csv_data: list, cmd: int = TCC_IPC_CMD_AP_TEST) -> CompiledTestPlan:
+    """
+    load_csv_test_plan 결과의 모든 행을 LPA 패킷으로 미리 인코딩
+
+    Args:
+        csv_data: load_csv_test_plan 이 리턴한 송신 항목 리스트
+        cmd: IPC 명령어
+
+    Returns:
+        CompiledTestPlan: 연속 프레임 버퍼 + offset/length 인덱스
+    """
+    start_ns = time.perf_counter_ns()
+
+    lengths = array('H', (IPC_OVERHEAD + LPA_TX_HDR_SIZE + len(item['data']) for item in csv_data))
+    offsets = array('I', [0]) * len(lengths)
+    buffer = bytearray(sum(lengths))
+
+    offset = 0
+    for index, item in enumerate(csv_data):
+        offsets[index] = offset
+        offset += make_lpa_packet_with_can_header_into(
+            buffer, offset, item['data'], item['can_id'], False, cmd, item['port_n'])
+
+    return CompiledTestPlan(buffer, offsets, lengths, time.perf_counter_ns() - start_ns)
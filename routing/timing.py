@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공용 고해상도 시계 (CLOCK_MONOTONIC_RAW, time.clock_gettime_ns)
+
+ctypes 로 libc 의 clock_gettime 을 부르고 timespec 객체를 만드는 대신
+time.clock_gettime_ns 로 정수 ns 를 바로 읽는다 (호출마다 객체 할당 없음).
+처음 사용할 때 시계 읽기 자체의 비용을 측정하여 elapsed_ns() 에서 빼고,
+MCU 수신 프레임 타임스탬프(timestamp_us_h/l + timestamp_ns) 변환 함수와
+시스템 콜 소요 시간 로그 버킷 히스토그램(LatencyHistogram)을 제공한다.
+"""
+
+import time
+from typing import Optional
+
+# NTP 보정의 영향을 받지 않는 CLOCK_MONOTONIC_RAW (없는 플랫폼은 CLOCK_MONOTONIC)
+CLOCK_ID = getattr(time, 'CLOCK_MONOTONIC_RAW', time.CLOCK_MONOTONIC)
+CLOCK_NAME = 'CLOCK_MONOTONIC_RAW' if hasattr(time, 'CLOCK_MONOTONIC_RAW') else 'CLOCK_MONOTONIC'
+
+_clock_gettime_ns = time.clock_gettime_ns
+
+
+def now_ns() -> int:
+    """현재 시각 (ns, CLOCK_ID 기준)"""
+    return _clock_gettime_ns(CLOCK_ID)
+
+
+class ClockCalibration:
+    """calibrate() 결과 (시계 읽기 비용과 해상도)"""
+
+    __slots__ = ('overhead_ns', 'min_ns', 'max_ns', 'resolution_ns', 'samples')
+
+    def __init__(self, overhead_ns: int, min_ns: int, max_ns: int, resolution_ns: int, samples: int):
+        self.overhead_ns = overhead_ns
+        self.min_ns = min_ns
+        self.max_ns = max_ns
+        self.resolution_ns = resolution_ns
+        self.samples = samples
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return (f"ClockCalibration(overhead={self.overhead_ns}ns, min={self.min_ns}ns, "
+                f"max={self.max_ns}ns, resolution={self.resolution_ns}ns)")
+
+
+_calibration = None
+
+
+def calibrate(samples: int = 10000) -> ClockCalibration:
+    """
+    now_ns() 를 연속으로 두 번 읽은 차이로 시계 읽기 비용 측정
+
+    중앙값을 overhead_ns 로 쓴다 (인터럽트/스케줄링으로 튄 값의 영향 제외).
+
+    Args:
+        samples: 측정 횟수
+
+    Returns:
+        ClockCalibration: 측정 결과 (이후 elapsed_ns 가 사용)
+    """
+    global _calibration
+    read = now_ns
+    deltas = [0] * samples
+    for i in range(samples):
+        start = read()
+        deltas[i] = read() - start
+    deltas.sort()
+    _calibration = ClockCalibration(deltas[samples // 2], deltas[0], deltas[-1],
+                                    int(time.clock_getres(CLOCK_ID) * 1e9) or 1, samples)
+    return _calibration
+
+
+def calibration() -> ClockCalibration:
+    """현재 보정값 (아직 측정하지 않았으면 측정)"""
+    return _calibration or calibrate()
+
+
+def elapsed_ns(start_ns: int, end_ns: Optional[int] = None) -> int:
+    """
+    두 now_ns() 사이의 경과 시간에서 시계 읽기 비용을 뺀 값
+
+    Args:
+        start_ns: 시작 시각 (now_ns)
+        end_ns: 종료 시각 (None 이면 지금)
+
+    Returns:
+        int: 경과 시간 (ns, 0 미만이면 0)
+    """
+    if end_ns is None:
+        end_ns = now_ns()
+    overhead = (_calibration or calibrate()).overhead_ns
+    return max(0, end_ns - start_ns - overhead)
+
+
+def format_ns(timestamp_ns: int) -> str:
+    """now_ns() 값을 '초.나노초' 형식 문자열로 (기존 timespec 출력과 같은 형식)"""
+    seconds, nanoseconds = divmod(timestamp_ns, 1_000_000_000)
+    return f"{seconds:10d}.{nanoseconds:09d}"
+
+
+# ---------------------------------------------------------------------------
+# MCU 수신 프레임 타임스탬프 (RxFrame 의 timestamp_us_h/l, timestamp_ns)
+# ---------------------------------------------------------------------------
+def mcu_timestamp_us(timestamp_us_h: int, timestamp_us_l: int) -> int:
+    """상위/하위 32비트 마이크로초 필드를 64비트 us 로 합침"""
+    return (timestamp_us_h << 32) | timestamp_us_l
+
+
+def mcu_timestamp_ns(frame) -> int:
+    """
+    수신 프레임 헤더의 MCU 타임스탬프를 ns 로 변환
+
+    Args:
+        frame: RxFrame (또는 같은 이름의 필드를 가진 객체)
+
+    Returns:
+        int: MCU 타임스탬프 (ns)
+    """
+    return mcu_timestamp_us(frame.timestamp_us_h, frame.timestamp_us_l) * 1000 + frame.timestamp_ns
+
+
+def split_mcu_timestamp(timestamp_ns: int) -> tuple:
+    """
+    ns 타임스탬프를 수신 프레임 헤더 필드로 분리 (mcu_timestamp_ns 의 역변환)
+
+    timestamp_ns 필드는 10ns 단위로 기록되므로 10ns 미만은 버린다.
+
+    Args:
+        timestamp_ns: 타임스탬프 (ns)
+
+    Returns:
+        tuple: (timestamp_us_h, timestamp_us_l, timestamp_ns)
+    """
+    timestamp_us, remainder_ns = divmod(timestamp_ns, 1000)
+    return (timestamp_us >> 32) & 0xFFFFFFFF, timestamp_us & 0xFFFFFFFF, remainder_ns - remainder_ns % 10
+
+
+class LatencyHistogram:
+    """
+    소요 시간(ns) 로그 버킷 히스토그램 (항상 켜 두는 드라이버 카운터용)
+
+    버킷 k 는 2^(k-1) <= ns < 2^k 구간 (record 는 int.bit_length 한 번과 덧셈만 수행).
+    """
+
+    __slots__ = ('counts', 'count', 'total_ns', 'min_ns', 'max_ns')
+
+    BUCKETS = 64
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def record(self, duration_ns: int) -> None:
+        """소요 시간 하나 기록"""
+        if duration_ns < 0:
+            duration_ns = 0
+        self.counts[min(duration_ns.bit_length(), self.BUCKETS - 1)] += 1
+        if not self.count or duration_ns < self.min_ns:
+            self.min_ns = duration_ns
+        if duration_ns > self.max_ns:
+            self.max_ns = duration_ns
+        self.count += 1
+        self.total_ns += duration_ns
+
+    def percentile_ns(self, fraction: float) -> int:
+        """fraction 분위수가 속한 버킷의 상한 (ns, 추정치)"""
+        if not self.count:
+            return 0
+        target = fraction * self.count
+        seen = 0
+        for bucket, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if bucket_count and seen >= target:
+                return min(1 << bucket, self.max_ns)
+        return self.max_ns
+
+    def to_dict(self) -> dict:
+        """요약 + 값이 있는 버킷 목록 ([{'lt_ns': 상한(미만), 'count': 개수}, ...])"""
+        return {
+            'count': self.count,
+            'min_ns': self.min_ns,
+            'mean_ns': self.total_ns / self.count if self.count else 0.0,
+            'p50_ns': self.percentile_ns(0.50),
+            'p99_ns': self.percentile_ns(0.99),
+            'max_ns': self.max_ns,
+            'buckets': [{'lt_ns': 1 << bucket, 'count': bucket_count}
+                        for bucket, bucket_count in enumerate(self.counts) if bucket_count],
+        }